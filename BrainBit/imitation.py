@@ -62,8 +62,13 @@ class FakeBrainBitSensor:
             time.sleep(0.1)
 
 class FakeScanner:
-    def __init__(self, filters=None):
+    def __init__(self, filters=None, count=1):
         self.filters = filters or []
+        # Несколько устройств для нагрузочных тестов, у каждого свое имя
+        if count == 1:
+            self._sensors = [FakeBrainBitSensor()]
+        else:
+            self._sensors = [FakeBrainBitSensor(name=f"FakeBrainBit-{i + 1}") for i in range(count)]
 
     def start(self):
         print("Сканирование устройств...")
@@ -73,4 +78,4 @@ class FakeScanner:
         print("Сканирование завершено.")
 
     def sensors(self):
-        return [FakeBrainBitSensor()]
+        return list(self._sensors)
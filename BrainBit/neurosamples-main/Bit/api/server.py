@@ -1,27 +1,40 @@
 import asyncio
 import websockets
 import json
+import signal
 import threading
 import time
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Добавляем путь к родительской директории для импорта модулей
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from typing import Dict, Any
-from neuro_impl.sensor_emulator import create_sensor_emulator
+from neuro_impl.emulator_core import create_emulator_core
 from neuro_impl.emotions_bipolar_controller import EmotionBipolar
+from neuro_impl.trace import DEBUG, Sampler, configure, dump_trace, get_logger
 from neurosdk.cmn_types import SensorState, SensorCommand
 
+log = get_logger("api")
+
 
 class SensorAPIServer:
     def __init__(self, host="localhost", port=8766):
         self.host = host
         self.port = port
-        self.emulator = create_sensor_emulator()
+        # Эмулятор без Qt: серверу не нужны PyQt6 и цикл событий Qt
+        self.emulator = create_emulator_core()
         self.emotion_controller = EmotionBipolar()
         self.clients = set()
+        self.__trace_sample = Sampler()
+        # EmotionalMath считает блок в нативной библиотеке, вне цикла asyncio;
+        # один поток сохраняет порядок блоков
+        self.__processing = ThreadPoolExecutor(max_workers=1, thread_name_prefix="emotion")
+        # Блоки, выброшенные из переполненной очереди сигнала
+        self.dropped_blocks = 0
+        self.__drop_sample = Sampler()
         self.setup_connections()
         self.setup_emotion_callbacks()
         
@@ -36,8 +49,8 @@ class SensorAPIServer:
     def setup_connections(self):
         """Настройка соединений для получения данных от эмулятора"""
         self.emulator.sensorStateChanged.connect(self.on_sensor_state_changed)
-        self.emulator.signalDataReceived.connect(self.on_signal_received)
         self.emulator.resistDataReceived.connect(self.on_resist_received)
+        # Сигнал обрабатывается в цикле asyncio, см. consume_signal
         
     def setup_emotion_callbacks(self):
         """Настройка обратных вызовов для контроллера эмоций"""
@@ -53,49 +66,51 @@ class SensorAPIServer:
         
     def on_sensor_state_changed(self, sensor, state):
         """Обработчик изменения состояния сенсора"""
-        print(f"Состояние сенсора изменено: {state}")
+        log.info("Состояние сенсора изменено: %s", state)
         
-    def on_signal_received(self, sensor, data):
-        """Обработчик получения сигнальных данных"""
-        if len(data) > 0:
-            sample = data[0]
+    def on_signal_block(self, sensor, block):
+        """Обработчик блока сигнала: numpy-массив (N, 4) в порядке O1, O2, T3, T4"""
+        if len(block) > 0:
+            o1, o2, t3, t4 = block[-1, :4].tolist()
             # Сохраняем последние данные сенсора
             self.current_data["sensor_data"] = {
-                "O1": float(sample.O1),
-                "O2": float(sample.O2),
-                "T3": float(sample.T3),
-                "T4": float(sample.T4),
+                "O1": o1,
+                "O2": o2,
+                "T3": t3,
+                "T4": t4,
                 "timestamp": time.time()
             }
             
             # Получаем текущую эмоцию из эмулятора
             self.current_data["emotion"] = self.emulator.get_current_emotion()
             
-            # Передаем данные в контроллер эмоций для обработки
-            self.emotion_controller.process_data(data)
+            # Отведения для всего блока сразу, без объектов SensorData на семпл
+            self.emotion_controller.process_block(block)
             
-            # Выводим отладочную информацию
-            print(f"Получены данные сенсора: O1={sample.O1:.2f}, O2={sample.O2:.2f}, T3={sample.T3:.2f}, T4={sample.T4:.2f}")
+            # Отладочная информация только при DEBUG и с прореживанием
+            if log.isEnabledFor(DEBUG) and self.__trace_sample():
+                log.debug("Получены данные сенсора: O1=%.2f, O2=%.2f, T3=%.2f, T4=%.2f",
+                          o1, o2, t3, t4)
                 
     def on_resist_received(self, sensor, data):
         """Обработчик получения данных о сопротивлении"""
-        print(f"Сопротивление - O1: {data.O1}, O2: {data.O2}, T3: {data.T3}, T4: {data.T4}")
+        log.debug("Сопротивление - O1: %s, O2: %s, T3: %s, T4: %s", data.O1, data.O2, data.T3, data.T4)
         
     def on_calibration_progress(self, progress):
         """Обработчик прогресса калибровки"""
-        print(f"Прогресс калибровки: {progress}%")
+        log.debug("Прогресс калибровки: %s%%", progress)
         
     def on_artifacted_sequence(self, artifacted):
         """Обработчик артефактов последовательности"""
-        print(f"Артефакты последовательности: {artifacted}")
+        log.debug("Артефакты последовательности: %s", artifacted)
         
     def on_both_sides_artifacted(self, artifacted):
         """Обработчик артефактов с обеих сторон"""
-        print(f"Артефакты с обеих сторон: {artifacted}")
+        log.debug("Артефакты с обеих сторон: %s", artifacted)
         
     def on_mind_data(self, data):
         """Обработчик ментальных данных"""
-        print(f"Получены ментальные данные: {data}")
+        log.debug("Получены ментальные данные: %s", data)
         try:
             # Определяем эмоцию на основе ментальных данных
             attention = float(getattr(data, 'rel_attention', 0))
@@ -120,9 +135,9 @@ class SensorAPIServer:
                 "detected_emotion": detected_emotion,
                 "emulated_emotion": self.emulator.get_current_emotion()
             }
-            print(f"Обновлены ментальные данные: {self.current_data['mental_data']}")
+            log.debug("Обновлены ментальные данные: %s", self.current_data["mental_data"])
         except Exception as e:
-            print(f"Ошибка обработки ментальных данных: {e}")
+            log.error("Ошибка обработки ментальных данных: %s", e)
             # Даже в случае ошибки пытаемся сохранить базовые данные
             try:
                 self.current_data["mental_data"] = {
@@ -136,7 +151,7 @@ class SensorAPIServer:
         
     def on_spectral_data(self, spectral_data):
         """Обработчик спектральных данных"""
-        print(f"Получены спектральные данные: {spectral_data}")
+        log.debug("Получены спектральные данные: %s", spectral_data)
         try:
             # Сохраняем спектральные данные
             self.current_data["spectral_data"] = {
@@ -146,9 +161,9 @@ class SensorAPIServer:
                 "beta": float(getattr(spectral_data, 'beta', 0) * 100),
                 "gamma": float(getattr(spectral_data, 'gamma', 0) * 100)
             }
-            print(f"Обновлены спектральные данные: {self.current_data['spectral_data']}")
+            log.debug("Обновлены спектральные данные: %s", self.current_data["spectral_data"])
         except Exception as e:
-            print(f"Ошибка обработки спектральных данных: {e}")
+            log.error("Ошибка обработки спектральных данных: %s", e)
             # Даже в случае ошибки пытаемся сохранить базовые данные
             try:
                 self.current_data["spectral_data"] = {
@@ -163,30 +178,30 @@ class SensorAPIServer:
         
     def on_raw_spectral_data(self, spect_vals):
         """Обработчик сырых спектральных данных"""
-        print(f"Сырые спектральные данные - Альфа: {getattr(spect_vals, 'alpha', 0):.2f}, Бета: {getattr(spect_vals, 'beta', 0):.2f}")
+        if log.isEnabledFor(DEBUG):
+            log.debug("Сырые спектральные данные - Альфа: %.2f, Бета: %.2f",
+                      getattr(spect_vals, 'alpha', 0), getattr(spect_vals, 'beta', 0))
         
     async def register_client(self, websocket):
         """Регистрация нового клиента"""
         self.clients.add(websocket)
-        print(f"Новый клиент подключен. Всего клиентов: {len(self.clients)}")
+        log.info("Новый клиент подключен. Всего клиентов: %d", len(self.clients))
         
         # Отправляем начальные данные клиенту
         try:
             serialized_data = self._serialize_data(self.current_data)
-            print(f"Сериализованные данные: {serialized_data}")
+            log.debug("Сериализованные данные: %s", serialized_data)
             message = {
                 "type": "initial_data",
                 "data": serialized_data
             }
-            print(f"Отправляемое сообщение: {message}")
+            log.debug("Отправляемое сообщение: %s", message)
             await websocket.send(json.dumps(message, ensure_ascii=False))
-            print("Сообщение успешно отправлено")
+            log.debug("Сообщение успешно отправлено")
         except websockets.exceptions.ConnectionClosed:
-            print("Соединение закрыто при отправке данных")
-        except Exception as e:
-            print(f"Ошибка отправки данных клиенту: {e}")
-            import traceback
-            traceback.print_exc()
+            log.info("Соединение закрыто при отправке данных")
+        except Exception:
+            log.exception("Ошибка отправки данных клиенту")
         
     def _serialize_data(self, data):
         """Сериализация данных для отправки по WebSocket"""
@@ -205,7 +220,7 @@ class SensorAPIServer:
     async def unregister_client(self, websocket):
         """Удаление клиента"""
         self.clients.discard(websocket)
-        print(f"Клиент отключен. Всего клиентов: {len(self.clients)}")
+        log.info("Клиент отключен. Всего клиентов: %d", len(self.clients))
         
     async def send_data_to_clients(self):
         """Отправка данных всем подключенным клиентам"""
@@ -217,7 +232,7 @@ class SensorAPIServer:
         if self.__data_check_counter % 50 == 0:  # Проверяем каждые 50 циклов
             # Если данные отсутствуют, пытаемся получить их принудительно
             if not self.current_data["mental_data"] or not self.current_data["spectral_data"]:
-                print("Принудительная проверка данных от контроллера")
+                log.debug("Принудительная проверка данных от контроллера")
                 # Здесь можно добавить дополнительную логику, если необходимо
                 
         # Формируем сообщение с текущими данными
@@ -234,7 +249,7 @@ class SensorAPIServer:
             except websockets.exceptions.ConnectionClosed:
                 disconnected_clients.add(client)
             except Exception as e:
-                print(f"Ошибка отправки данных клиенту: {e}")
+                log.error("Ошибка отправки данных клиенту: %s", e)
                 disconnected_clients.add(client)
                 
         # Удаляем отключенных клиентов
@@ -249,47 +264,78 @@ class SensorAPIServer:
                 # Обработка входящих сообщений от клиента (если нужно)
                 try:
                     data = json.loads(message)
-                    print(f"Получено сообщение от клиента: {data}")
+                    log.debug("Получено сообщение от клиента: %s", data)
                 except json.JSONDecodeError:
-                    print("Ошибка декодирования JSON от клиента")
+                    log.warning("Ошибка декодирования JSON от клиента")
         except websockets.exceptions.ConnectionClosed:
             pass
         except Exception as e:
-            print(f"Ошибка обработки клиента: {e}")
+            log.error("Ошибка обработки клиента: %s", e)
         finally:
             await self.unregister_client(websocket)
             
+    def on_signal_dropped(self, sensor, block):
+        """Блок выброшен из очереди: обработка не успевает за сигналом"""
+        self.dropped_blocks += 1
+        if self.__drop_sample():
+            log.warning("Очередь сигнала переполнена, выброшено блоков: %d", self.dropped_blocks)
+
+    async def consume_signal(self):
+        """
+        Блоки сигнала из очереди asyncio обрабатываются по одному в потоке
+        обработки, поток эмулятора и цикл событий не ждут расчета.
+        """
+        loop = asyncio.get_running_loop()
+        # Блоки numpy: без подписчиков signalDataReceived ядро не создает
+        # SensorData на каждый семпл
+        queue = self.emulator.signalBlockReceived.queue(maxsize=100, on_drop=self.on_signal_dropped)
+        while True:
+            sensor, block = await queue.get()
+            await loop.run_in_executor(self.__processing, self.on_signal_block, sensor, block)
+
+    def dump_trace(self):
+        """Сохранение кольцевого буфера трассы в файл"""
+        path = dump_trace()
+        if path is None:
+            log.warning("Буфер трассы отключен (BIT_TRACE_SIZE=0)")
+        else:
+            log.info("Трасса сохранена: %s", path)
+
     async def start_sensor(self):
         """Запуск сенсора"""
         # Подключаемся к эмулятору
-        print("Подключение к эмулятору...")
+        log.info("Подключение к эмулятору...")
         self.emulator.connect()
         await asyncio.sleep(1)
         
         # Запускаем измерение сопротивления
-        print("Запуск измерения сопротивления...")
+        log.info("Запуск измерения сопротивления...")
         self.emulator.start_resist()
         await asyncio.sleep(3)
         self.emulator.stop_resist()
         
         # Начинаем калибровку через контроллер эмоций
-        print("Начало калибровки через контроллер эмоций...")
+        log.info("Начало калибровки через контроллер эмоций...")
         self.emotion_controller.start_calibration()
         
         # Запускаем сигнал
-        print("Запуск сигнала...")
+        log.info("Запуск сигнала...")
         self.emulator.start_signal()
         
     async def stop_sensor(self):
         """Остановка сенсора"""
         self.emulator.stop_signal()
-        print("Сенсор остановлен")
+        log.info("Сенсор остановлен")
         
     async def run_server(self):
         """Запуск WebSocket сервера"""
-        print(f"Запуск WebSocket сервера на {self.host}:{self.port}")
+        log.info("Запуск WebSocket сервера на %s:%s", self.host, self.port)
+        # SIGUSR1 сохраняет кольцевой буфер трассы в logs/ (только POSIX)
+        if hasattr(signal, "SIGUSR1"):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, self.dump_trace)
         
-        # Запускаем сенсор в отдельной задаче
+        # Запускаем обработку сигнала и сенсор в отдельных задачах
+        asyncio.create_task(self.consume_signal())
         asyncio.create_task(self.start_sensor())
         
         # Создаем WebSocket сервер
@@ -302,13 +348,14 @@ class SensorAPIServer:
 
 def main():
     """Основная функция для запуска сервера"""
+    configure()
     server = SensorAPIServer()
     
     # Запускаем сервер
     try:
         asyncio.run(server.run_server())
     except KeyboardInterrupt:
-        print("Сервер остановлен")
+        log.info("Сервер остановлен")
 
 
 if __name__ == "__main__":
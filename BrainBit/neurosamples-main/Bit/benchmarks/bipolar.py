@@ -0,0 +1,99 @@
+"""
+Подготовка биполярных отведений EmotionBipolar, семплов в секунду.
+
+Запуск из папки Bit:
+
+    python benchmarks/bipolar.py --blocks 2000 --block-sizes 25 250 --full
+
+Сравнивает process_data (цикл по SensorData, T3-O1 и T4-O2 на каждый
+семпл) и process_block (numpy-блок (N, 4), отведения для блока сразу).
+По умолчанию мерится только перевод в RawChannels, с --full - весь
+вызов, включая push_bipolars и расчеты EmotionalMath после
+start_calibration. Сигнал берется из SignalGenerator.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from em_st_artifacts.utils.support_classes import RawChannels
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_impl.emulator_core import SensorData  # noqa: E402
+from neuro_impl.signal_generator import SignalGenerator  # noqa: E402
+
+PATTERN = {"alpha": 50, "beta": 30, "theta": 20, "delta": 10}
+
+
+def loop_convert(data):
+    """Цикл из EmotionBipolar.process_data"""
+    bipolar_samples = []
+    for sample in data:
+        left_bipolar = sample.T3 - sample.O1
+        right_bipolar = sample.T4 - sample.O2
+        bipolar_samples.append(RawChannels(left_bipolar, right_bipolar))
+    return bipolar_samples
+
+
+def block_convert(block):
+    """Перевод из EmotionBipolar.process_block"""
+    left = (block[:, 2] - block[:, 0]).tolist()
+    right = (block[:, 3] - block[:, 1]).tolist()
+    return list(map(RawChannels, left, right))
+
+
+def make_blocks(count: int, block_size: int, sample_rate: float):
+    generator = SignalGenerator(sample_rate=sample_rate, block_size=block_size, seed=1)
+    blocks = [generator.generate(PATTERN) for _ in range(count)]
+    objects = [[SensorData(*row) for row in block.tolist()] for block in blocks]
+    return blocks, objects
+
+
+def measure(handler, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        handler(item)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[25, 250, 2500])
+    parser.add_argument("--sample-rate", type=float, default=250.0)
+    parser.add_argument("--full", action="store_true", help="мерить весь вызов EmotionBipolar")
+    parser.add_argument("--output", help="дописать отчет одной json-строкой")
+    args = parser.parse_args()
+
+    if args.full:
+        from neuro_impl.emotions_bipolar_controller import EmotionBipolar
+
+    rows = []
+    for block_size in args.block_sizes:
+        blocks, objects = make_blocks(args.blocks, block_size, args.sample_rate)
+        samples = args.blocks * block_size
+        if args.full:
+            # Отдельный экземпляр на каждый путь, чтобы состояние калибровки совпадало
+            loop_emotions, block_emotions = EmotionBipolar(), EmotionBipolar()
+            loop_emotions.start_calibration()
+            block_emotions.start_calibration()
+            paths = [("process_data", loop_emotions.process_data, objects),
+                     ("process_block", block_emotions.process_block, blocks)]
+        else:
+            paths = [("loop", loop_convert, objects), ("numpy", block_convert, blocks)]
+        for name, handler, items in paths:
+            rows.append({"path": name, "block_size": block_size, "rate": samples / measure(handler, items)})
+
+    print(f"{'path':14s} {'block':>6s} {'samples/s':>14s}")
+    for row in rows:
+        print(f"{row['path']:14s} {row['block_size']:6d} {row['rate']:14,.0f}")
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), "results": rows}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
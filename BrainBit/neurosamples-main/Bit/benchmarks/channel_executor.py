@@ -0,0 +1,84 @@
+"""
+Расчет каналов SpectrumController и EmotionMonopolar на пуле потоков.
+
+Запуск из папки Bit:
+
+    python benchmarks/channel_executor.py --devices 1 4 --workers 0 4 8 --seconds 60
+
+Для каждого числа устройств создается по контроллеру на устройство,
+все они делят один ChannelExecutor (workers 0 - без пула, как по
+умолчанию в приложении). Контроллерам по очереди отдаются блоки по 25
+семплов из SignalGenerator, результат - секунды сигнала всех устройств
+за секунду работы. Нужны spectrum_lib и em_st_artifacts.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_impl.channel_executor import ChannelExecutor  # noqa: E402
+from neuro_impl.emotions_monopolar_controller import EmotionMonopolar  # noqa: E402
+from neuro_impl.sample_block import SampleBlock  # noqa: E402
+from neuro_impl.signal_generator import SignalGenerator  # noqa: E402
+from neuro_impl.spectrum_controller import SpectrumController  # noqa: E402
+
+PATTERN = {"alpha": 50, "beta": 30, "theta": 20, "delta": 10}
+SAMPLE_RATE = 250
+BLOCK_SIZE = 25
+
+
+def make_controller(kind, executor):
+    if kind == "spectrum":
+        return SpectrumController(executor=executor)
+    controller = EmotionMonopolar(executor=executor)
+    controller.start_calibration()
+    return controller
+
+
+def run(kind: str, devices: int, workers: int, seconds: float) -> float:
+    executor = ChannelExecutor(workers) if workers else None
+    controllers = [make_controller(kind, executor) for _ in range(devices)]
+    generator = SignalGenerator(sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE, seed=1)
+    blocks = [SampleBlock.from_array(generator.generate(PATTERN)) for _ in range(int(seconds * SAMPLE_RATE / BLOCK_SIZE))]
+    started = time.perf_counter()
+    for block in blocks:
+        for controller in controllers:
+            controller.process_data(block)
+    elapsed = time.perf_counter() - started
+    if executor is not None:
+        executor.shutdown()
+    return devices * seconds / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--controllers", nargs="+", default=["spectrum", "monopolar"], choices=["spectrum", "monopolar"])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4, os.cpu_count() or 1])
+    parser.add_argument("--seconds", type=float, default=60.0, help="секунд сигнала на устройство")
+    parser.add_argument("--output", help="дописать отчет одной json-строкой")
+    args = parser.parse_args()
+
+    rows = []
+    for kind in args.controllers:
+        for devices in args.devices:
+            for workers in args.workers:
+                rows.append({
+                    "controller": kind, "devices": devices, "workers": workers,
+                    "realtime_factor": run(kind, devices, workers, args.seconds),
+                })
+
+    print(f"{'controller':10s} {'devices':>7s} {'workers':>7s} {'x real time':>12s}")
+    for row in rows:
+        print(f"{row['controller']:10s} {row['devices']:7d} {row['workers']:7d} {row['realtime_factor']:12,.1f}")
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), "results": rows}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Сколько устройств EmulatorFarm держит в реальном времени.
+
+Запуск из папки Bit:
+
+    python benchmarks/emulator_farm.py --devices 100 300 --workers 1 2 --seconds 5
+
+Для каждого сочетания числа устройств и потоков запускает сигнал на всех
+устройствах фермы с подписчиком на блоки (с --sensor-data - и на
+SensorData, как у GUI) и считает полученные семплы. Показывает частоту
+относительно номинальной (устройства * sample_rate * speed), загрузку
+потоков и опоздание тиков.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from threading import Lock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_impl.emulator_farm import EmulatorFarm  # noqa: E402
+
+
+def run(devices: int, workers: int, args) -> dict:
+    farm = EmulatorFarm(
+        devices, sample_rate=args.sample_rate, block_size=args.block_size,
+        speed=args.speed, seed=1, workers=workers,
+    )
+    received = [0]
+    lock = Lock()
+
+    def on_block(sensor, block):
+        with lock:
+            received[0] += len(block)
+
+    for device in farm.devices:
+        device.signalBlockReceived.connect(on_block)
+        if args.sensor_data:
+            device.signalDataReceived.connect(lambda sensor, data: None)
+        device.connect()
+        device.start_signal()
+
+    with farm:
+        time.sleep(args.seconds)
+        stats = farm.stats()
+    nominal = devices * args.sample_rate * args.speed
+    return {
+        "devices": devices,
+        "workers": workers,
+        "rate": received[0] / args.seconds,
+        "nominal": nominal,
+        "load": max(worker["load"] for worker in stats["workers"]),
+        "p99_ms": max(worker["p99_ms"] for worker in stats["workers"]),
+        "resyncs": sum(worker["resyncs"] for worker in stats["workers"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[10, 100, 300])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--sample-rate", type=float, default=250.0)
+    parser.add_argument("--block-size", type=int, default=25)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--sensor-data", action="store_true", help="подписаться и на SensorData")
+    parser.add_argument("--output", help="дописать отчет одной json-строкой")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'devices':>7s} {'workers':>7s} {'samples/s':>12s} {'nominal':>12s} {'load':>6s} {'p99 ms':>7s} {'resyncs':>7s}")
+    for devices in args.devices:
+        for workers in args.workers:
+            result = run(devices, workers, args)
+            results.append(result)
+            print(
+                f"{devices:7d} {workers:7d} {result['rate']:12,.0f} {result['nominal']:12,.0f} "
+                f"{result['load']:6.1%} {result['p99_ms']:7.2f} {result['resyncs']:7d}"
+            )
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), "results": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
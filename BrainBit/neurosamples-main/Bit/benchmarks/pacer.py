@@ -0,0 +1,89 @@
+"""
+Точность темпа эмулятора: дрейф и джиттер блоков.
+
+Запуск из папки Bit:
+
+    python benchmarks/pacer.py --seconds 10 --work-ms 3 --speed 1 4
+
+Выдает блоки по block_size семплов с нагрузкой work-ms на блок (имитация
+генерации и обработки) двумя способами: прежний time.sleep(интервал)
+после блока и Pacer со сроками по монотонным часам. Для каждого способа
+и скорости показаны фактическая частота семплов против номинальной,
+накопленный дрейф и опоздание блоков. Скорость 0 - без пауз, это
+предельная пропускная способность.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_impl.pacer import Pacer  # noqa: E402
+
+
+def busy(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def run_sleep(blocks: int, interval: float, speed: float, work: float) -> dict:
+    period = interval / speed if speed else 0.0
+    started = time.monotonic()
+    for _ in range(blocks):
+        busy(work)
+        if period:
+            time.sleep(period)
+    elapsed = time.monotonic() - started
+    return {"elapsed": elapsed, "drift": elapsed - blocks * period}
+
+
+def run_pacer(blocks: int, interval: float, speed: float, work: float) -> dict:
+    pacer = Pacer(interval, speed=speed)
+    for _ in range(blocks):
+        busy(work)
+        pacer.wait()
+    stats = pacer.stats()
+    return {**stats, "drift": stats["elapsed"] - blocks * pacer.period}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="секунд сигнала")
+    parser.add_argument("--sample-rate", type=float, default=250.0)
+    parser.add_argument("--block-size", type=int, default=25)
+    parser.add_argument("--work-ms", type=float, default=3.0, help="нагрузка на блок")
+    parser.add_argument("--speed", type=float, nargs="+", default=[1.0, 4.0, 0.0])
+    parser.add_argument("--output", help="дописать отчет одной json-строкой")
+    args = parser.parse_args()
+
+    interval = args.block_size / args.sample_rate
+    blocks = max(int(args.seconds / interval), 1)
+    work = args.work_ms / 1000
+    samples = blocks * args.block_size
+
+    results = []
+    print(f"{'mode':6s} {'speed':>5s} {'samples/s':>12s} {'nominal':>10s} {'drift ms':>9s} {'p50 ms':>7s} {'p99 ms':>7s} {'max ms':>7s}")
+    for speed in args.speed:
+        nominal = args.sample_rate * speed if speed else float("inf")
+        for mode, run in (("sleep", run_sleep), ("pacer", run_pacer)):
+            if mode == "sleep" and not speed:
+                continue
+            result = run(blocks, interval, speed, work)
+            rate = samples / result["elapsed"]
+            results.append({"mode": mode, "speed": speed, "rate": rate, **result})
+            drift = f"{result['drift'] * 1000:9.1f}" if speed else f"{'-':>9s}"
+            print(
+                f"{mode:6s} {speed:5g} {rate:12,.0f} {nominal:10,.0f} {drift} "
+                f"{result.get('p50_ms', 0):7.2f} {result.get('p99_ms', 0):7.2f} {result.get('max_ms', 0):7.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), "results": results}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
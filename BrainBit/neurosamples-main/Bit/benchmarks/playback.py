@@ -0,0 +1,89 @@
+"""
+Воспроизведение записи ЭЭГ через PlaybackSource на максимальной скорости.
+
+Запуск из папки Bit:
+
+    python benchmarks/playback.py recording.npy --emotions
+
+Читает запись из файла, отображенного в память, блоками через
+EmulatorCore (tick_signal, как в потоке эмулятора при speed=0) и считает
+семплы в секунду. С --emotions блоки идут в EmotionBipolar, это скорость
+всего конвейера эмоций на реальных данных. Без файла создается запись
+из SignalGenerator длиной --seconds.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_impl.playback import create_playback_sensor, write_recording  # noqa: E402
+from neuro_impl.signal_generator import SignalGenerator  # noqa: E402
+
+PATTERN = {"alpha": 50, "beta": 30, "theta": 20, "delta": 10}
+
+
+def synthetic_recording(seconds: float, sample_rate: float) -> str:
+    generator = SignalGenerator(sample_rate=sample_rate, block_size=int(sample_rate), seed=1)
+    blocks = [generator.generate(PATTERN) for _ in range(max(int(seconds), 1))]
+    path = os.path.join(tempfile.mkdtemp(), "synthetic.npy")
+    write_recording(path, np.concatenate(blocks))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("recording", nargs="?", help=".npy или сырые float32, каналы O1, O2, T3, T4")
+    parser.add_argument("--seconds", type=float, default=600.0, help="длина синтетической записи")
+    parser.add_argument("--sample-rate", type=float, default=250.0)
+    parser.add_argument("--block-size", type=int, default=25)
+    parser.add_argument("--emotions", action="store_true", help="обрабатывать блоки EmotionBipolar")
+    parser.add_argument("--output", help="дописать отчет одной json-строкой")
+    args = parser.parse_args()
+
+    path = args.recording or synthetic_recording(args.seconds, args.sample_rate)
+    sensor = create_playback_sensor(
+        path, sample_rate=args.sample_rate, block_size=args.block_size, speed=0, verbose=False,
+    )
+    if args.emotions:
+        from neuro_impl.emotions_bipolar_controller import EmotionBipolar
+        emotions = EmotionBipolar()
+        emotions.start_calibration()
+        sensor.signalDataReceived.connect(lambda s, data: emotions.process_data(data))
+    else:
+        sensor.signalBlockReceived.connect(lambda s, block: None)
+
+    samples = 0
+    started = time.perf_counter()
+    while True:
+        block = sensor.tick_signal()
+        if block is None:
+            break
+        samples += len(block)
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "recording": path,
+        "samples": samples,
+        "recorded_seconds": samples / args.sample_rate,
+        "elapsed": elapsed,
+        "rate": samples / elapsed,
+        "realtime_factor": samples / args.sample_rate / elapsed,
+        "emotions": args.emotions,
+    }
+    print(
+        f"{samples} samples ({report['recorded_seconds']:.0f}s of signal) in {elapsed:.2f}s: "
+        f"{report['rate']:,.0f} samples/s, x{report['realtime_factor']:,.0f} real time"
+    )
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), **report}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
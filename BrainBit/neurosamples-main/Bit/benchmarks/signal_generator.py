@@ -0,0 +1,104 @@
+"""
+Скорость генерации сигнала эмулятора, семплов в секунду.
+
+Запуск из папки Bit:
+
+    python benchmarks/signal_generator.py --blocks 2000 --block-sizes 25 250 --channels 4 32
+
+Сравнивает прежний цикл на math.sin/random.uniform с объектом
+SensorData на каждый семпл и SignalGenerator (numpy, блок целиком), для
+каждого сочетания размера блока и числа каналов. Отдельно указана
+стоимость перевода блока в SensorData, которую платит SensorEmulator.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from neuro_impl.signal_generator import SignalGenerator  # noqa: E402
+
+PATTERN = {"alpha": 50, "beta": 30, "theta": 20, "delta": 10}
+
+
+class SensorData:
+    # копия neuro_impl.sensor_emulator.SensorData, без импорта PyQt6 и neurosdk
+    def __init__(self, O1=0, O2=0, T3=0, T4=0):
+        self.O1 = O1
+        self.O2 = O2
+        self.T3 = T3
+        self.T4 = T4
+
+
+def legacy(blocks: int, block_size: int, sample_rate: float) -> float:
+    """Прежний SensorEmulator.__generate_signal_data без пауз и Qt."""
+    t = 0.0
+    step = 1 / sample_rate
+    started = time.perf_counter()
+    for _ in range(blocks):
+        signal_data = []
+        for _ in range(block_size):
+            alpha_wave = PATTERN["alpha"] * math.sin(2 * math.pi * 10 * t)
+            beta_wave = PATTERN["beta"] * math.sin(2 * math.pi * 20 * t)
+            theta_wave = PATTERN["theta"] * math.sin(2 * math.pi * 6 * t)
+            delta_wave = PATTERN["delta"] * math.sin(2 * math.pi * 2 * t)
+            noise = random.uniform(-5, 5)
+            signal_data.append(SensorData(
+                O1=alpha_wave + beta_wave * 0.5 + theta_wave * 0.3 + delta_wave * 0.1 + noise,
+                O2=alpha_wave * 0.9 + beta_wave * 0.6 + theta_wave * 0.2 + delta_wave * 0.15 + noise,
+                T3=alpha_wave * 0.8 + beta_wave * 0.7 + theta_wave * 0.25 + delta_wave * 0.12 + noise,
+                T4=alpha_wave * 0.85 + beta_wave * 0.55 + theta_wave * 0.35 + delta_wave * 0.08 + noise,
+            ))
+            t += step
+    return time.perf_counter() - started
+
+
+def vectorized(blocks: int, block_size: int, channels: int, sample_rate: float, to_objects: bool) -> float:
+    generator = SignalGenerator(sample_rate=sample_rate, block_size=block_size, channel_count=channels, seed=1)
+    started = time.perf_counter()
+    for _ in range(blocks):
+        block = generator.generate(PATTERN)
+        if to_objects:
+            [SensorData(*row[:4]) for row in block.tolist()]
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[25, 250, 2500])
+    parser.add_argument("--channels", type=int, nargs="+", default=[4, 32])
+    parser.add_argument("--sample-rate", type=float, default=250.0)
+    parser.add_argument("--output", help="дописать отчет одной json-строкой")
+    args = parser.parse_args()
+
+    rows = []
+    for block_size in args.block_sizes:
+        samples = args.blocks * block_size
+        rows.append({
+            "generator": "legacy", "block_size": block_size, "channels": 4,
+            "rate": samples / legacy(args.blocks, block_size, args.sample_rate),
+        })
+        for channels in args.channels:
+            for to_objects in (False, True):
+                elapsed = vectorized(args.blocks, block_size, channels, args.sample_rate, to_objects)
+                rows.append({
+                    "generator": "numpy+SensorData" if to_objects else "numpy",
+                    "block_size": block_size, "channels": channels, "rate": samples / elapsed,
+                })
+
+    print(f"{'generator':18s} {'block':>6s} {'channels':>8s} {'samples/s':>14s}")
+    for row in rows:
+        print(f"{row['generator']:18s} {row['block_size']:6d} {row['channels']:8d} {row['rate']:14,.0f}")
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), "results": rows}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
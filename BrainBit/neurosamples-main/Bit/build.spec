@@ -77,6 +77,7 @@ a = Analysis(
         'PyQt6.uic',
         'PyQt6.uic.load_ui',
         'pyqtgraph',
+        'numpy',
         'pyqtgraph.PlotWidget',
         'neurosdk',
         'neurosdk.cmn_types',
@@ -88,10 +89,18 @@ a = Analysis(
         'spectrum_lib.spectrum_lib',
         'pyspectrum_lib',
         'neuro_impl.brain_bit_controller',
+        'neuro_impl.channel_executor',
+        'neuro_impl.emotion_snapshot',
         'neuro_impl.emotions_bipolar_controller',
         'neuro_impl.emotions_monopolar_controller',
         'neuro_impl.spectrum_controller',
+        'neuro_impl.trace',
+        'neuro_impl.emulator_core',
+        'neuro_impl.emulator_farm',
+        'neuro_impl.playback',
+        'neuro_impl.sample_block',
         'neuro_impl.sensor_emulator',
+        'neuro_impl.signal_generator',
         'neuro_impl.websocket_client',
         'neuro_impl.utils',
         'ui.plots',
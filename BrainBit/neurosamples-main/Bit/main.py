@@ -4,6 +4,7 @@ import logging
 
 from PyQt6.QtWidgets import QApplication, QMainWindow, QStackedWidget, QWidget
 from PyQt6.QtCore import qInstallMessageHandler, QtMsgType, QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
 from PyQt6.uic import loadUi
 from neurosdk.cmn_types import SensorState
 
@@ -56,15 +57,19 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 from neuro_impl.brain_bit_controller import brain_bit_controller, BrainBitController
+from neuro_impl.channel_executor import shared_channel_executor
 from neuro_impl.emotions_bipolar_controller import EmotionBipolar
 from neuro_impl.emotions_monopolar_controller import EmotionMonopolar
 from neuro_impl.spectrum_controller import SpectrumController
 from neuro_impl.sensor_emulator import create_sensor_emulator, create_emulator_sensor_info
+from neuro_impl.trace import configure as configure_trace, dump_trace, get_logger
 from neuro_impl.websocket_client import WebSocketClient
 from PyQt6.QtWidgets import QPushButton
 from ui.plots import SpectrumPlot, SignalPlot
 import json
 
+log = get_logger("app")
+
 
 class MenuScreen(QMainWindow):
     def __init__(self, *args, **kwargs):
@@ -501,7 +506,7 @@ class EmotionMonopolarScreen(QMainWindow):
         self.calibration_completed = False
         self.calibrated_channels = {'O1': False, 'O2': False, 'T3': False, 'T4': False}
 
-        self.emotionController = EmotionMonopolar()
+        self.emotionController = EmotionMonopolar(executor=shared_channel_executor())
         self.emotionController.progressCalibrationCallback = self.calibration_callback
         self.emotionController.isArtifactedSequenceCallback = self.is_artifacted_sequence_callback
         self.emotionController.isBothSidesArtifactedCallback = self.is_both_sides_artifacted_callback
@@ -755,7 +760,7 @@ class TokenScreen(QMainWindow):
         self.token = None
         self.ws_client = None
         self.calibration_data = {}  # Хранилище данных после калибровки
-        self.eeg_data_buffer = {}  # Буфер для накопления данных всех каналов
+        self.snapshot = None  # EmotionSnapshot контроллера, из которого отправляются данные
         self.send_timer = None  # Таймер для отправки данных раз в секунду
         
         # Инициализируем UI элементы
@@ -789,7 +794,11 @@ class TokenScreen(QMainWindow):
         self.connectButton.setEnabled(False)
         
         # Создаем WebSocket клиент
-        self.ws_client = WebSocketClient("ws://5.129.252.186:3000/ws/device")
+        # BIT_RECORD_SESSION=<файл.jsonl> записывает отправленные данные для воспроизведения
+        self.ws_client = WebSocketClient(
+            "ws://5.129.252.186:3000/ws/device",
+            record_path=os.environ.get("BIT_RECORD_SESSION"),
+        )
         self.ws_client.connected.connect(self.__on_websocket_connected)
         self.ws_client.disconnected.connect(self.__on_websocket_disconnected)
         self.ws_client.error.connect(self.__on_websocket_error)
@@ -878,96 +887,18 @@ class TokenScreen(QMainWindow):
         """Настройка отправки данных в реальном времени"""
         # Определяем, какой контроллер использовать (монополярный или биполярный)
         controller = None
-        is_bipolar = False
         
         if hasattr(emotionBipolarScreen, 'emotionController') and emotionBipolarScreen.is_started:
             controller = emotionBipolarScreen.emotionController
-            is_bipolar = True
         elif hasattr(emotionMonopolarScreen, 'emotionController') and emotionMonopolarScreen.is_started:
             controller = emotionMonopolarScreen.emotionController
-            is_bipolar = False
-        
+            
         if not controller:
             return
             
-        # Сохраняем оригинальные callback'и
-        original_mind_callback = controller.lastMindDataCallback
-        original_spectral_callback = controller.lastSpectralDataCallback
-        
-        # Инициализируем структуру данных для всех каналов
-        self.eeg_data_buffer = {
-            "channels": {
-                "O1": {"mind": None, "spectral": None},
-                "O2": {"mind": None, "spectral": None},
-                "T3": {"mind": None, "spectral": None},
-                "T4": {"mind": None, "spectral": None}
-            }
-        }
-        
-        if is_bipolar:
-            # Для биполярной калибровки callback'и не принимают channel параметр
-            def collect_mind_data_bipolar(data):
-                # Вызываем оригинальный callback
-                if original_mind_callback:
-                    original_mind_callback(data)
-                # Сохраняем данные в буфер для всех каналов (биполярные данные применяются ко всем)
-                for channel in self.eeg_data_buffer["channels"]:
-                    self.eeg_data_buffer["channels"][channel]["mind"] = {
-                        "relative_attention": float(data.rel_attention),
-                        "relative_relaxation": float(data.rel_relaxation),
-                        "instant_attention": float(data.inst_attention),
-                        "instant_relaxation": float(data.inst_relaxation)
-                    }
-            
-            def collect_spectral_data_bipolar(spectral_data):
-                # Вызываем оригинальный callback
-                if original_spectral_callback:
-                    original_spectral_callback(spectral_data)
-                # Сохраняем данные в буфер для всех каналов
-                for channel in self.eeg_data_buffer["channels"]:
-                    self.eeg_data_buffer["channels"][channel]["spectral"] = {
-                        "delta": float(spectral_data.delta),
-                        "theta": float(spectral_data.theta),
-                        "alpha": float(spectral_data.alpha),
-                        "beta": float(spectral_data.beta),
-                        "gamma": float(spectral_data.gamma)
-                    }
-            
-            # Устанавливаем новые callback'и
-            controller.lastMindDataCallback = collect_mind_data_bipolar
-            controller.lastSpectralDataCallback = collect_spectral_data_bipolar
-        else:
-            # Для монополярной калибровки callback'и принимают channel параметр
-            def collect_mind_data(data, channel):
-                # Вызываем оригинальный callback
-                if original_mind_callback:
-                    original_mind_callback(data, channel)
-                # Сохраняем данные в буфер
-                if channel in self.eeg_data_buffer["channels"]:
-                    self.eeg_data_buffer["channels"][channel]["mind"] = {
-                        "relative_attention": float(data.rel_attention),
-                        "relative_relaxation": float(data.rel_relaxation),
-                        "instant_attention": float(data.inst_attention),
-                        "instant_relaxation": float(data.inst_relaxation)
-                    }
-            
-            def collect_spectral_data(spectral_data, channel):
-                # Вызываем оригинальный callback
-                if original_spectral_callback:
-                    original_spectral_callback(spectral_data, channel)
-                # Сохраняем данные в буфер
-                if channel in self.eeg_data_buffer["channels"]:
-                    self.eeg_data_buffer["channels"][channel]["spectral"] = {
-                        "delta": float(spectral_data.delta),
-                        "theta": float(spectral_data.theta),
-                        "alpha": float(spectral_data.alpha),
-                        "beta": float(spectral_data.beta),
-                        "gamma": float(spectral_data.gamma)
-                    }
-            
-            # Устанавливаем новые callback'и
-            controller.lastMindDataCallback = collect_mind_data
-            controller.lastSpectralDataCallback = collect_spectral_data
+        # Контроллер сам обновляет снимок последних данных в process_data,
+        # колбэки экрана калибровки не подменяются
+        self.snapshot = controller.snapshot
         
         # Создаем таймер для отправки данных раз в секунду
         self.send_timer = QTimer()
@@ -976,25 +907,9 @@ class TokenScreen(QMainWindow):
     
     def __send_eeg_data_periodically(self):
         """Периодическая отправка накопленных данных"""
-        if self.ws_client and self.ws_client.is_connected():
-            # Формируем читаемую структуру данных
-            eeg_sample = {
-                "channels": {}
-            }
-            
-            # Копируем данные из буфера, исключая None значения
-            for channel, channel_data in self.eeg_data_buffer["channels"].items():
-                channel_entry = {}
-                
-                if channel_data["mind"] is not None:
-                    channel_entry["mind"] = channel_data["mind"]
-                
-                if channel_data["spectral"] is not None:
-                    channel_entry["spectral"] = channel_data["spectral"]
-                
-                # Добавляем канал только если есть хотя бы одни данные
-                if channel_entry:
-                    eeg_sample["channels"][channel] = channel_entry
+        if self.ws_client and self.ws_client.is_connected() and self.snapshot is not None:
+            # Снимок собирается один раз после каждого обновления данных
+            eeg_sample = self.snapshot.eeg_sample()
             
             # Отправляем только если есть данные
             if eeg_sample["channels"]:
@@ -1299,7 +1214,7 @@ class SpectrumScreen(QMainWindow):
         self.t4_graphLayout.addWidget(self.t4Graph)
         self.__is_started = False
 
-        self.spectrumController = SpectrumController()
+        self.spectrumController = SpectrumController(executor=shared_channel_executor())
         self.spectrumController.processedWaves = self.__processed_waves
         self.spectrumController.processedSpectrum = self.__processed_spectrum
 
@@ -1414,7 +1329,7 @@ class SpectrumScreen(QMainWindow):
                 case 'T4':
                     self.t4Graph.update_data(spectrum)
                 case _:
-                    print('Unknown channel')
+                    log.warning("Unknown channel: %s", channel)
         except RuntimeError as e:
             # Игнорируем ошибки, связанные с уже удалёнными объектами
             if "wrapped C/C++ object" in str(e):
@@ -1436,6 +1351,15 @@ class SpectrumScreen(QMainWindow):
         stackNavigation.setCurrentWidget(menuScreen)
 
 
+def save_trace():
+    """Сохранение кольцевого буфера трассы в logs/ (Ctrl+Shift+L)"""
+    path = dump_trace()
+    if path is None:
+        log.warning("Буфер трассы отключен (BIT_TRACE_SIZE=0)")
+    else:
+        log.info("Трасса сохранена: %s", path)
+
+
 def main():
     """Главная функция приложения"""
     global stackNavigation, menuScreen, searchScreen, resistScreen, signalScreen
@@ -1443,8 +1367,11 @@ def main():
     global calibrationChoiceScreen
     
     try:
+        # BIT_LOG_LEVEL=DEBUG включает вывод на каждый блок сигнала, см. neuro_impl/trace.py
+        configure_trace()
         app = QApplication(sys.argv)
         stackNavigation = QStackedWidget()
+        QShortcut(QKeySequence("Ctrl+Shift+L"), stackNavigation, activated=save_trace)
         
         menuScreen = MenuScreen()
         searchScreen = SearchScreen()
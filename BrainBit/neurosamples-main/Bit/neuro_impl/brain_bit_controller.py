@@ -6,6 +6,10 @@ from neurosdk.scanner import Scanner
 from neurosdk.sensor import Sensor
 from neurosdk.cmn_types import *
 
+from neuro_impl.trace import get_logger
+
+log = get_logger("controller")
+
 
 class Worker(QObject):
     finished = pyqtSignal()
@@ -22,10 +26,11 @@ class Worker(QObject):
 class BrainBitController(QObject):
     sensorConnectionState = pyqtSignal(SensorState)
 
-    def __init__(self):
+    def __init__(self, scanner=None):
         super().__init__()
         self.__sensor = None
-        self.__scanner = Scanner([SensorFamily.LEBrainBit, SensorFamily.LECallibri])
+        # scanner - любой объект с интерфейсом neurosdk Scanner, например FarmScanner
+        self.__scanner = scanner or Scanner([SensorFamily.LEBrainBit, SensorFamily.LECallibri])
         self.sensorsFounded = None
         self.sensorBattery = None
         self.resistReceived = None
@@ -58,7 +63,7 @@ class BrainBitController(QObject):
             try:
                 self.__sensor = self.__scanner.create_sensor(sensor_info)
             except Exception as err:
-                print(err)
+                log.error("Ошибка подключения к сенсору: %s", err)
             if self.__sensor is not None:
                 self.__sensor.sensorStateChanged = self.__connection_state_changed
                 self.__sensor.batteryChanged = self.__battery_changed
@@ -82,7 +87,7 @@ class BrainBitController(QObject):
                 if self.sensorConnectionState is not None:
                     self.sensorConnectionState.emit(SensorState.StateOutOfRange)
             except Exception as e:
-                print(f"Error disconnecting sensor: {e}")
+                log.error("Error disconnecting sensor: %s", e)
             finally:
                 self.__sensor = None
     
@@ -154,7 +159,7 @@ class BrainBitController(QObject):
             try:
                 self.__sensor.exec_command(command)
             except Exception as err:
-                print(err)
+                log.error("Ошибка выполнения команды %s: %s", command, err)
         thread = Thread(target=execute_command)
         thread.start()
 
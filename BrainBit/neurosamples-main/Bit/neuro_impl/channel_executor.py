@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Число потоков общего пула; 0 или пусто - каналы считаются в вызывающем потоке
+WORKERS_ENV = "BIT_CHANNEL_WORKERS"
+
+
+class ChannelExecutor:
+    """
+    Пул потоков для независимых расчетов по каналам.
+
+    EmotionalMath и SpectrumMath вызывают нативные библиотеки через ctypes,
+    а ctypes отпускает GIL на время вызова, поэтому четыре канала одного
+    блока считаются на разных ядрах. Один пул можно отдать контроллерам
+    всех устройств: потоков остается столько же, а каналы разных
+    устройств делят ядра.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.__pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="channel")
+
+    def map(self, fn, items):
+        """
+        fn для каждого элемента, результаты в порядке items. Первый элемент
+        считается в вызывающем потоке, пока пул занят остальными. Исключение
+        поднимается только после завершения всех задач, чтобы следующий блок
+        не начался, пока расчет канала еще идет.
+        """
+        items = list(items)
+        if not items:
+            return []
+        futures = [self.__pool.submit(fn, item) for item in items[1:]]
+        try:
+            first = fn(items[0])
+        finally:
+            wait(futures)
+        return [first] + [future.result() for future in futures]
+
+    def shutdown(self):
+        self.__pool.shutdown(wait=True)
+
+
+def map_channels(executor, fn, channels):
+    """executor.map или обычный цикл, если executor не задан"""
+    if executor is None:
+        return [fn(channel) for channel in channels]
+    return executor.map(fn, channels)
+
+
+_shared = None
+
+
+def shared_channel_executor():
+    """
+    Общий пул приложения по переменной окружения BIT_CHANNEL_WORKERS
+    (число потоков, "auto" - по числу ядер). Без нее возвращает None,
+    и контроллеры считают каналы последовательно, как раньше.
+    """
+    global _shared
+    value = os.environ.get(WORKERS_ENV, "").strip()
+    if not value or value == "0":
+        return None
+    if _shared is None:
+        _shared = ChannelExecutor(None if value == "auto" else int(value))
+    return _shared
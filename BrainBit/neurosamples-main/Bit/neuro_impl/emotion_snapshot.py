@@ -0,0 +1,112 @@
+from threading import Lock
+
+from neuro_impl.utils import BB_channels
+
+
+def _spectral(spectral):
+    return {
+        "delta": float(spectral.delta),
+        "theta": float(spectral.theta),
+        "alpha": float(spectral.alpha),
+        "beta": float(spectral.beta),
+        "gamma": float(spectral.gamma)
+    }
+
+
+def _raw_spectral(raw_spectral):
+    return {
+        "alpha": float(raw_spectral.alpha),
+        "beta": float(raw_spectral.beta)
+    }
+
+
+class EmotionSnapshot:
+    """
+    Последние значения EmotionalMath по каналам: spectral, raw_spectral и
+    mind. Контроллер обновляет их в process_data из тех же чтений, что
+    идут в колбэки, поэтому снимок читается без обращения к библиотеке.
+
+    Словари для отправки собираются при первом чтении после обновления и
+    кешируются до следующего, повторное чтение - O(1). Возвращаемые
+    словари общие для всех читателей, изменять их нельзя.
+    """
+
+    def __init__(self, channels=BB_channels):
+        self.channels = list(channels)
+        self.__lock = Lock()
+        self.clear()
+
+    def clear(self):
+        with self.__lock:
+            self.__values = {channel: {} for channel in self.channels}
+            self.__version = 0
+            self.__cache = {}
+
+    def update(self, channel, spectral=None, raw_spectral=None, mind=None):
+        """Новые значения канала; None оставляет прежнее"""
+        self.update_channels([channel], spectral, raw_spectral, mind)
+
+    def update_channels(self, channels, spectral=None, raw_spectral=None, mind=None):
+        """Одни значения для нескольких каналов (биполярный режим)"""
+        values = {"spectral": spectral, "raw_spectral": raw_spectral, "mind": mind}
+        values = {key: value for key, value in values.items() if value is not None}
+        if not values:
+            return
+        with self.__lock:
+            for channel in channels:
+                self.__values[channel].update(values)
+            self.__version += 1
+
+    def __cached(self, key, build):
+        with self.__lock:
+            version, data = self.__cache.get(key, (None, None))
+            if version != self.__version:
+                data = build()
+                self.__cache[key] = (self.__version, data)
+            return data
+
+    def calibration_data(self, completed) -> dict:
+        """Данные в формате get_calibration_data"""
+        def build():
+            channels = {}
+            for channel, values in self.__values.items():
+                entry = {}
+                if "spectral" in values:
+                    entry["spectral"] = _spectral(values["spectral"])
+                if "raw_spectral" in values:
+                    entry["raw_spectral"] = _raw_spectral(values["raw_spectral"])
+                if "mind" in values:
+                    mind = values["mind"]
+                    entry["mind"] = {
+                        "rel_attention": float(mind.rel_attention),
+                        "rel_relaxation": float(mind.rel_relaxation),
+                        "inst_attention": float(mind.inst_attention),
+                        "inst_relaxation": float(mind.inst_relaxation)
+                    }
+                if entry:
+                    channels[channel] = entry
+            return channels
+
+        return {"calibration_completed": completed, "channels": self.__cached("calibration", build)}
+
+    def eeg_sample(self) -> dict:
+        """Данные в формате send_eeg_sample для отправки в реальном времени"""
+        def build():
+            channels = {}
+            for channel, values in self.__values.items():
+                entry = {}
+                if "mind" in values:
+                    mind = values["mind"]
+                    entry["mind"] = {
+                        "relative_attention": float(mind.rel_attention),
+                        "relative_relaxation": float(mind.rel_relaxation),
+                        "instant_attention": float(mind.inst_attention),
+                        "instant_relaxation": float(mind.inst_relaxation)
+                    }
+                if "spectral" in values:
+                    entry["spectral"] = _spectral(values["spectral"])
+                if entry:
+                    channels[channel] = entry
+            return {"channels": channels}
+
+        return self.__cached("eeg_sample", build)
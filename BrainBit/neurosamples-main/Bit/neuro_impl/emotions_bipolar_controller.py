@@ -3,6 +3,10 @@ from em_st_artifacts.utils.lib_settings import MathLibSetting, ArtifactDetectSet
     MentalAndSpectralSetting
 from em_st_artifacts.utils.support_classes import RawChannels
 
+from neuro_impl.emotion_snapshot import EmotionSnapshot
+from neuro_impl.sample_block import SampleBlock
+from neuro_impl.utils import BB_channels
+
 
 class EmotionBipolar:
     def __init__(self):
@@ -39,6 +43,8 @@ class EmotionBipolar:
 
         self.__is_calibrated = False
         self.__is_running = False  # Флаг для отслеживания состояния работы
+        # Последние значения библиотеки, см. get_calibration_data
+        self.snapshot = EmotionSnapshot()
         self.isArtifactedSequenceCallback = None
         self.isBothSidesArtifactedCallback = None
         self.progressCalibrationCallback = None
@@ -47,67 +53,15 @@ class EmotionBipolar:
         self.lastMindDataCallback = None
         
     def get_calibration_data(self) -> dict:
-        """Получение всех данных после калибровки"""
-        data = {
-            "calibration_completed": self.__is_calibrated,
-            "channels": {}
-        }
-        
+        """Получение всех данных после калибровки, из снимка без обращения к библиотеке"""
         if not self.__is_calibrated:
-            return data
-        
-        # Для биполярной калибровки у нас есть два канала: left (T3-O1) и right (T4-O2)
-        # Преобразуем их в формат каналов O1, O2, T3, T4 для совместимости
-        
-        # Спектральные данные
-        spectral_values = self.__math.read_spectral_data_percents_arr()
-        if len(spectral_values) > 0:
-            spectral = spectral_values[-1]
-            spectral_data = {
-                "delta": float(spectral.delta),
-                "theta": float(spectral.theta),
-                "alpha": float(spectral.alpha),
-                "beta": float(spectral.beta),
-                "gamma": float(spectral.gamma)
-            }
-            # Применяем к каналам, связанным с биполярными измерениями
-            # Left bipolar (T3-O1) влияет на T3 и O1
-            # Right bipolar (T4-O2) влияет на T4 и O2
-            for channel in ['O1', 'O2', 'T3', 'T4']:
-                if channel not in data["channels"]:
-                    data["channels"][channel] = {}
-                data["channels"][channel]["spectral"] = spectral_data
-        
-        # Сырые спектральные данные
-        raw_spectral = self.__math.read_raw_spectral_vals()
-        if raw_spectral:
-            raw_spectral_data = {
-                "alpha": float(raw_spectral.alpha),
-                "beta": float(raw_spectral.beta)
-            }
-            for channel in ['O1', 'O2', 'T3', 'T4']:
-                if channel not in data["channels"]:
-                    data["channels"][channel] = {}
-                data["channels"][channel]["raw_spectral"] = raw_spectral_data
-        
-        # Ментальные данные
-        mental_values = self.__math.read_mental_data_arr()
-        if len(mental_values) > 0:
-            mind = mental_values[-1]
-            mind_data = {
-                "rel_attention": float(mind.rel_attention),
-                "rel_relaxation": float(mind.rel_relaxation),
-                "inst_attention": float(mind.inst_attention),
-                "inst_relaxation": float(mind.inst_relaxation)
-            }
-            for channel in ['O1', 'O2', 'T3', 'T4']:
-                if channel not in data["channels"]:
-                    data["channels"][channel] = {}
-                data["channels"][channel]["mind"] = mind_data
-        
-        return data
+            return {"calibration_completed": False, "channels": {}}
+        # Для биполярной калибровки у нас есть два канала: left (T3-O1) и right (T4-O2),
+        # снимок хранит их результат для всех каналов O1, O2, T3, T4 для совместимости
+        return self.snapshot.calibration_data(True)
 
     def start_calibration(self):
+        self.snapshot.clear()
         self.__math.start_calibration()
         self.__is_running = True
         
@@ -115,6 +69,7 @@ class EmotionBipolar:
         """Остановка калибровки"""
         self.__is_running = False
         self.__is_calibrated = False
+        self.snapshot.clear()
         
     def __process_calibration(self):
         if not self.__is_running:
@@ -132,6 +87,8 @@ class EmotionBipolar:
         
         # Если калибровка завершена библиотекой, устанавливаем прогресс в 100%
         if self.__is_calibrated:
+            # Колбэк 100% забирает get_calibration_data, снимок должен быть заполнен
+            self.__update_snapshot()
             if self.progressCalibrationCallback:
                 self.progressCalibrationCallback(100)
 
@@ -145,6 +102,26 @@ class EmotionBipolar:
             left_bipolar = sample.T3 - sample.O1
             right_bipolar = sample.T4 - sample.O2
             bipolar_samples.append(RawChannels(left_bipolar, right_bipolar))
+        self.__process_bipolars(bipolar_samples)
+
+    def process_block(self, block):
+        """
+        То же, что process_data, для блока numpy (N, 4) с каналами в
+        порядке BB_channels (signalBlockReceived эмулятора, PlaybackSource)
+        или SampleBlock.
+        Отведения T3-O1 и T4-O2 считаются для всего блока сразу, объекты
+        SensorData не создаются.
+        """
+        if not self.__is_running:
+            return
+
+        block = SampleBlock.coerce(block)
+        left = block.bipolar('T3', 'O1').tolist()
+        right = block.bipolar('T4', 'O2').tolist()
+        # push_bipolars принимает только список RawChannels
+        self.__process_bipolars(list(map(RawChannels, left, right)))
+
+    def __process_bipolars(self, bipolar_samples):
         self.__math.push_bipolars(bipolar_samples)
         self.__math.process_data_arr()
 
@@ -158,6 +135,16 @@ class EmotionBipolar:
             self.__resolve_raw_spectral_data()
             self.__resolve_mind_data()
 
+    def __update_snapshot(self):
+        spectral_values = self.__math.read_spectral_data_percents_arr()
+        mental_values = self.__math.read_mental_data_arr()
+        self.snapshot.update_channels(
+            BB_channels,
+            spectral=spectral_values[-1] if len(spectral_values) > 0 else None,
+            raw_spectral=self.__math.read_raw_spectral_vals() or None,
+            mind=mental_values[-1] if len(mental_values) > 0 else None,
+        )
+
     def __resolve_artifacted(self):
         # sequence artifacts
         is_artifacted_sequence = self.__math.is_artifacted_sequence()
@@ -176,6 +163,7 @@ class EmotionBipolar:
         spectral_values = self.__math.read_spectral_data_percents_arr()
         if len(spectral_values) > 0:
             spectral_val = spectral_values[-1]
+            self.snapshot.update_channels(BB_channels, spectral=spectral_val)
             if self.lastSpectralDataCallback:
                 self.lastSpectralDataCallback(spectral_val)
                 
@@ -184,6 +172,8 @@ class EmotionBipolar:
         if not self.__is_calibrated:
             return
         raw_spectral_values = self.__math.read_raw_spectral_vals()
+        if raw_spectral_values:
+            self.snapshot.update_channels(BB_channels, raw_spectral=raw_spectral_values)
         if self.rawSpectralDataCallback:
             self.rawSpectralDataCallback(raw_spectral_values)
             
@@ -195,5 +185,6 @@ class EmotionBipolar:
         mental_values = self.__math.read_mental_data_arr()
         if len(mental_values) > 0:
             mind_data = mental_values[-1]
+            self.snapshot.update_channels(BB_channels, mind=mind_data)
             if self.lastMindDataCallback:
                 self.lastMindDataCallback(mind_data)
\ No newline at end of file
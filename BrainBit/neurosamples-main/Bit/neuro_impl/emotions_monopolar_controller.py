@@ -3,11 +3,14 @@ from em_st_artifacts.utils.lib_settings import MathLibSetting, ArtifactDetectSet
     MentalAndSpectralSetting
 from em_st_artifacts.utils.support_classes import RawChannelsArray
 
-BB_channels = ['O1', 'O2', 'T3', 'T4']
+from neuro_impl.channel_executor import map_channels
+from neuro_impl.emotion_snapshot import EmotionSnapshot
+from neuro_impl.sample_block import SampleBlock
+from neuro_impl.utils import BB_channels
 
 
 class EmotionMonopolar:
-    def __init__(self):
+    def __init__(self, executor=None):
         mls = MathLibSetting(sampling_rate=250,
                              process_win_freq=25,
                              n_first_sec_skipped=4,
@@ -42,6 +45,10 @@ class EmotionMonopolar:
 
         self.__is_calibrated = {'O1': False, 'O2': False, 'T3': False, 'T4': False}
         self.__is_running = False  # Флаг для отслеживания состояния работы
+        # ChannelExecutor для расчета каналов параллельно, None - по очереди
+        self.__executor = executor
+        # Последние значения библиотек по каналам, см. get_calibration_data
+        self.snapshot = EmotionSnapshot()
         self.isArtifactedSequenceCallback = None
         self.isBothSidesArtifactedCallback = None
         self.progressCalibrationCallback = None
@@ -50,54 +57,11 @@ class EmotionMonopolar:
         self.lastMindDataCallback = None
         
     def get_calibration_data(self) -> dict:
-        """Получение всех данных после калибровки"""
-        data = {
-            "calibration_completed": all(self.__is_calibrated.values()),
-            "channels": {}
-        }
-        
-        for channel in BB_channels:
-            if not self.__is_calibrated[channel]:
-                continue
-                
-            channel_data = {}
-            
-            # Спектральные данные
-            spectral_values = self.__maths[channel].read_spectral_data_percents_arr()
-            if len(spectral_values) > 0:
-                spectral = spectral_values[-1]
-                channel_data["spectral"] = {
-                    "delta": float(spectral.delta),
-                    "theta": float(spectral.theta),
-                    "alpha": float(spectral.alpha),
-                    "beta": float(spectral.beta),
-                    "gamma": float(spectral.gamma)
-                }
-            
-            # Сырые спектральные данные
-            raw_spectral = self.__maths[channel].read_raw_spectral_vals()
-            if raw_spectral:
-                channel_data["raw_spectral"] = {
-                    "alpha": float(raw_spectral.alpha),
-                    "beta": float(raw_spectral.beta)
-                }
-            
-            # Ментальные данные
-            mental_values = self.__maths[channel].read_mental_data_arr()
-            if len(mental_values) > 0:
-                mind = mental_values[-1]
-                channel_data["mind"] = {
-                    "rel_attention": float(mind.rel_attention),
-                    "rel_relaxation": float(mind.rel_relaxation),
-                    "inst_attention": float(mind.inst_attention),
-                    "inst_relaxation": float(mind.inst_relaxation)
-                }
-            
-            data["channels"][channel] = channel_data
-        
-        return data
+        """Получение всех данных после калибровки, из снимка без обращения к библиотекам"""
+        return self.snapshot.calibration_data(all(self.__is_calibrated.values()))
 
     def start_calibration(self):
+        self.snapshot.clear()
         for i in range(4):
             self.__maths[BB_channels[i]].start_calibration()
         self.__is_running = True
@@ -108,6 +72,7 @@ class EmotionMonopolar:
         # Сбрасываем состояние калибровки для всех каналов
         for channel in BB_channels:
             self.__is_calibrated[channel] = False
+        self.snapshot.clear()
             
     def __process_calibration(self):
         if not self.__is_running:
@@ -123,37 +88,37 @@ class EmotionMonopolar:
                 if self.progressCalibrationCallback:
                     self.progressCalibrationCallback(progress, BB_channels[i])
             else:
+                # Колбэк 100% может забрать get_calibration_data, снимок канала должен быть заполнен
+                self.__update_snapshot(BB_channels[i])
                 # Вызываем callback с progress=100 когда калибровка завершена
                 if self.progressCalibrationCallback:
                     self.progressCalibrationCallback(100, BB_channels[i])
 
+    def __update_snapshot(self, channel):
+        spectral_values = self.__maths[channel].read_spectral_data_percents_arr()
+        mental_values = self.__maths[channel].read_mental_data_arr()
+        self.snapshot.update(
+            channel,
+            spectral=spectral_values[-1] if len(spectral_values) > 0 else None,
+            raw_spectral=self.__maths[channel].read_raw_spectral_vals() or None,
+            mind=mental_values[-1] if len(mental_values) > 0 else None,
+        )
+
+    def __push_channel(self, channel, block):
+        # push_monopolars принимает только список RawChannelsArray, по одному на семпл
+        values = block.channel(channel)[:, None].tolist()
+        self.__maths[channel].push_monopolars(list(map(RawChannelsArray, values)))
+        self.__maths[channel].process_data_arr()
+
     def process_data(self, brain_bit_data: []):
+        """brain_bit_data - список SensorData, numpy-блок (N, 4) или SampleBlock"""
         # Проверяем, запущена ли калибровка
         if not self.__is_running:
             return
             
-        o1Values = []
-        o2Values = []
-        t3Values = []
-        t4Values = []
-        for i in range(len(brain_bit_data)):
-            o1Values.append(RawChannelsArray([brain_bit_data[i].O1]))
-            o2Values.append(RawChannelsArray([brain_bit_data[i].O2]))
-            t3Values.append(RawChannelsArray([brain_bit_data[i].T3]))
-            t4Values.append(RawChannelsArray([brain_bit_data[i].T4]))
-        try:
-            self.__maths['O1'].push_monopolars(o1Values)
-            self.__maths['O2'].push_monopolars(o2Values)
-            self.__maths['T3'].push_monopolars(t3Values)
-            self.__maths['T4'].push_monopolars(t4Values)
-        except Exception:
-            return
-
+        block = SampleBlock.coerce(brain_bit_data)
         try:
-            self.__maths['O1'].process_data_arr()
-            self.__maths['O2'].process_data_arr()
-            self.__maths['T3'].process_data_arr()
-            self.__maths['T4'].process_data_arr()
+            map_channels(self.__executor, lambda channel: self.__push_channel(channel, block), BB_channels)
         except Exception:
             return
 
@@ -167,11 +132,14 @@ class EmotionMonopolar:
                 spectral_values = self.__maths[channel].read_spectral_data_percents_arr()
                 if len(spectral_values) > 0:
                     spectral_val = spectral_values[-1]
+                    self.snapshot.update(channel, spectral=spectral_val)
                     if self.lastSpectralDataCallback:
                         self.lastSpectralDataCallback(spectral_val, channel)
 
                 # raw spectral data
                 raw_spectral_values = self.__maths[channel].read_raw_spectral_vals()
+                if raw_spectral_values:
+                    self.snapshot.update(channel, raw_spectral=raw_spectral_values)
                 if self.rawSpectralDataCallback:
                     self.rawSpectralDataCallback(raw_spectral_values, channel)
 
@@ -179,5 +147,6 @@ class EmotionMonopolar:
                 mental_values = self.__maths[channel].read_mental_data_arr()
                 if len(mental_values) > 0:
                     mind_data = mental_values[-1]
+                    self.snapshot.update(channel, mind=mind_data)
                     if self.lastMindDataCallback:
                         self.lastMindDataCallback(mind_data, channel)
\ No newline at end of file
@@ -0,0 +1,455 @@
+import asyncio
+import random
+import time
+from threading import Lock, Thread
+from neurosdk.cmn_types import SensorState, SensorInfo, SensorFamily, SensorCommand
+from neuro_impl.pacer import Pacer
+from neuro_impl.signal_generator import EMOTION_CYCLE, EMOTION_PATTERNS, SignalGenerator
+from neuro_impl.trace import DEBUG, Sampler, get_logger
+
+log = get_logger("emulator")
+
+# Эмоция эмулятора меняется каждые EMOTION_SAMPLES семплов
+EMOTION_SAMPLES = 500
+
+
+class SensorData:
+    def __init__(self, O1=0, O2=0, T3=0, T4=0):
+        self.O1 = O1
+        self.O2 = O2
+        self.T3 = T3
+        self.T4 = T4
+
+
+class ResistData:
+    def __init__(self, O1=float('inf'), O2=float('inf'), T3=float('inf'), T4=float('inf')):
+        self.O1 = O1
+        self.O2 = O2
+        self.T3 = T3
+        self.T4 = T4
+
+
+class EventHook:
+    """
+    Событие без Qt с тем же интерфейсом, что у pyqtSignal: connect,
+    disconnect, emit. Обработчики вызываются в потоке эмулятора.
+    """
+
+    def __init__(self):
+        self.__handlers = []
+        self.__lock = Lock()
+
+    def connect(self, handler):
+        with self.__lock:
+            self.__handlers = self.__handlers + [handler]
+
+    def disconnect(self, handler=None):
+        with self.__lock:
+            if handler is None:
+                self.__handlers = []
+            else:
+                self.__handlers = [h for h in self.__handlers if h != handler]
+
+    def connected(self):
+        """Есть ли обработчики"""
+        return bool(self.__handlers)
+
+    def emit(self, *args):
+        for handler in self.__handlers:
+            handler(*args)
+
+    def queue(self, maxsize=0, loop=None, on_drop=None):
+        """
+        asyncio.Queue с аргументами каждого события для кода на asyncio.
+        Вызывать из цикла событий; при переполнении выбрасывается самое
+        старое событие, и on_drop, если задан, вызывается с его
+        аргументами в цикле событий.
+        """
+        loop = loop or asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize)
+
+        def put(args):
+            if queue.full():
+                dropped = queue.get_nowait()
+                if on_drop is not None:
+                    on_drop(*dropped)
+            queue.put_nowait(args)
+
+        def forward(*args):
+            try:
+                loop.call_soon_threadsafe(put, args)
+            except RuntimeError:
+                # Цикл событий уже закрыт
+                self.disconnect(forward)
+
+        self.connect(forward)
+        return queue
+
+
+class HookAttribute:
+    """
+    Атрибут-событие EmulatorCore. Кроме connect поддерживает стиль
+    neurosdk.Sensor: присваивание функции делает ее единственным
+    обработчиком, присваивание None отключает все обработчики. Так ядро
+    работает и с BrainBitController, который назначает колбэки сенсору.
+    """
+
+    def __set_name__(self, owner, name):
+        self.key = "_hook_" + name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        hook = instance.__dict__.get(self.key)
+        if hook is None:
+            hook = instance.__dict__[self.key] = EventHook()
+        return hook
+
+    def __set__(self, instance, value):
+        if isinstance(value, EventHook):
+            instance.__dict__[self.key] = value
+            return
+        hook = self.__get__(instance, type(instance))
+        hook.disconnect()
+        if value is not None:
+            hook.connect(value)
+
+
+# Профили контакта электродов: диапазон сопротивления по каналам, Ом,
+# и вероятности пропадания контакта (inf) и очень плохого контакта
+CONTACT_PROFILES = {
+    "good": {
+        "ranges": {"O1": (1000, 3000), "O2": (1000, 3000), "T3": (1000, 4000), "T4": (1000, 3000)},
+        "lost": 0.0,
+        "poor": 0.0,
+    },
+    "default": {
+        "ranges": {"O1": (1000, 5000), "O2": (2000, 10000), "T3": (5000, 50000), "T4": (1000, 8000)},
+        "lost": 0.1,
+        "poor": 0.05,
+    },
+    "poor": {
+        "ranges": {"O1": (10000, 100000), "O2": (10000, 100000), "T3": (20000, 150000), "T4": (10000, 80000)},
+        "lost": 0.3,
+        "poor": 0.2,
+    },
+}
+
+RESIST_INTERVAL = 1.0
+
+
+class EmulatorCore:
+    """
+    Эмулятор BrainBit без Qt: сигнал, сопротивление, батарея. События
+    (sensorStateChanged, signalDataReceived, ...) - EventHook с тем же
+    интерфейсом, что у сигналов Qt-версии, см. SensorEmulator.
+
+    Блоки выдают tick_signal и tick_resist. Без scheduler эмулятор вызывает
+    их из своих потоков, с scheduler (EmulatorFarm) - их вызывает ферма.
+    С source (например, PlaybackSource) блоки сигнала берутся из него, а не
+    из генератора; sample_rate и block_size тогда задает источник.
+    verbose=False отключает журнал эмулятора (логгер bit.emulator) для
+    этого экземпляра.
+    """
+    sensorStateChanged = HookAttribute()   # sensor, state
+    batteryChanged = HookAttribute()       # sensor, battery_level
+    signalDataReceived = HookAttribute()   # sensor, data
+    signalBlockReceived = HookAttribute()  # sensor, numpy-блок (block_size, channel_count)
+    resistDataReceived = HookAttribute()   # sensor, data
+
+    def __init__(
+        self,
+        sample_rate=250,
+        block_size=25,
+        channel_count=4,
+        seed=None,
+        speed=1.0,
+        name="BrainBit Emulator",
+        serial_number="EMUL-001",
+        address="EMULATOR-001",
+        emotion_cycle=None,
+        emotion_samples=EMOTION_SAMPLES,
+        contact_profile="default",
+        scheduler=None,
+        verbose=True,
+        source=None,
+    ):
+        if source is not None:
+            sample_rate = source.sample_rate
+            block_size = source.block_size
+        self.__source = source
+        self.__generator = SignalGenerator(
+            sample_rate=sample_rate,
+            block_size=block_size,
+            channel_count=channel_count,
+            seed=seed,
+        )
+        # speed: 1 - реальное время, >1 - ускоренно, 0 - как можно быстрее
+        self.__pacer = Pacer(block_size / sample_rate, speed=speed)
+        self.__rng = random.Random(seed)
+        self.__name = name
+        self.__serial_number = serial_number
+        self.__address = address
+        self.__contact_profile = CONTACT_PROFILES[contact_profile]
+        self.__scheduler = scheduler
+        self.__verbose = verbose
+        self.__is_connected = False
+        self.__is_signal_started = False
+        self.__is_resist_started = False
+        self.__battery_level = 100
+        self.__signal_thread = None
+        self.__resist_thread = None
+        self.__commands_supported = [SensorCommand.StartSignal, SensorCommand.StopSignal, 
+                                   SensorCommand.StartResist, SensorCommand.StopResist]
+        
+        # Добавляем поддержку эмоций
+        self.__current_emotion = "neutral"  # Текущая эмоция
+        self.__emotion_patterns = EMOTION_PATTERNS
+        self.__emotion_cycle = list(emotion_cycle or EMOTION_CYCLE)
+        self.__emotion_samples = emotion_samples
+        self.__emotion_index = 0
+        self.__emotion_period = -1
+        self.__sample_count = 0
+        self.__trace_sample = Sampler()
+
+    def connect(self):
+        """Эмуляция подключения к сенсору"""
+        self.__is_connected = True
+        self.sensorStateChanged.emit(self, SensorState.StateInRange)
+        # Эмуляция изменения уровня батареи
+        self.batteryChanged.emit(self, self.__battery_level)
+
+    def disconnect(self):
+        """Эмуляция отключения от сенсора"""
+        self.__is_connected = False
+        self.__stop_signal()
+        self.__stop_resist()
+        self.sensorStateChanged.emit(self, SensorState.StateOutOfRange)
+
+    @property
+    def state(self):
+        """Возвращает состояние сенсора"""
+        return SensorState.StateInRange if self.__is_connected else SensorState.StateOutOfRange
+
+    @property
+    def Name(self):
+        """Возвращает имя сенсора"""
+        return self.__name
+
+    @property
+    def SerialNumber(self):
+        """Возвращает серийный номер сенсора"""
+        return self.__serial_number
+        
+    @property
+    def Address(self):
+        """Возвращает адрес сенсора"""
+        return self.__address
+
+    @property
+    def BattPower(self):
+        """Возвращает уровень заряда батареи"""
+        return self.__battery_level
+
+    @property
+    def is_signal_started(self):
+        return self.__is_signal_started
+
+    @property
+    def is_resist_started(self):
+        return self.__is_resist_started
+
+    def is_supported_feature(self, feature):
+        """Проверяет, поддерживается ли функция"""
+        # Для простоты будем считать, что все функции поддерживаются
+        return True
+
+    def is_supported_command(self, command):
+        """Проверяет, поддерживается ли команда"""
+        return command in self.__commands_supported
+
+    def exec_command(self, command):
+        """Эмуляция выполнения команды"""
+        if command == SensorCommand.StartSignal:
+            self.start_signal()
+        elif command == SensorCommand.StopSignal:
+            self.stop_signal()
+        elif command == SensorCommand.StartResist:
+            self.start_resist()
+        elif command == SensorCommand.StopResist:
+            self.stop_resist()
+        else:
+            pass
+
+    def start_signal(self):
+        """Запуск эмуляции сигнала"""
+        if not self.__is_signal_started:
+            self.__is_signal_started = True
+            if self.__scheduler is None:
+                self.__signal_thread = Thread(target=self.__generate_signal_data)
+                self.__signal_thread.daemon = True
+                self.__signal_thread.start()
+            return True
+        return False
+
+    def stop_signal(self):
+        """Остановка эмуляции сигнала"""
+        self.__stop_signal()
+
+    def start_resist(self):
+        """Запуск эмуляции сопротивления"""
+        if not self.__is_resist_started:
+            self.__is_resist_started = True
+            if self.__scheduler is None:
+                self.__resist_thread = Thread(target=self.__generate_resist_data)
+                self.__resist_thread.daemon = True
+                self.__resist_thread.start()
+            return True
+        return False
+
+    def stop_resist(self):
+        """Остановка эмуляции сопротивления"""
+        self.__stop_resist()
+
+    def __stop_signal(self):
+        """Остановка потока сигнала"""
+        self.__is_signal_started = False
+        if self.__signal_thread and self.__signal_thread.is_alive():
+            self.__signal_thread.join(timeout=1)
+
+    def __stop_resist(self):
+        """Остановка потока сопротивления"""
+        self.__is_resist_started = False
+        if self.__resist_thread and self.__resist_thread.is_alive():
+            self.__resist_thread.join(timeout=1)
+
+    def get_current_emotion(self):
+        """Получение текущей эмулируемой эмоции"""
+        return self.__current_emotion
+
+    @property
+    def generator(self):
+        """Генератор сигнала: частота дискретизации, размер блока, каналы"""
+        return self.__generator
+
+    @property
+    def pacer(self):
+        """Расписание блоков сигнала"""
+        return self.__pacer
+
+    def timing_stats(self):
+        """Опоздание блоков относительно расписания, см. Pacer.stats"""
+        return self.__pacer.stats()
+
+    @property
+    def source(self):
+        """Внешний источник блоков сигнала или None"""
+        return self.__source
+
+    def set_speed(self, speed):
+        """1 - реальное время, >1 - ускоренно, 0 - как можно быстрее"""
+        self.__pacer.set_speed(speed)
+
+    def tick_signal(self):
+        """Один блок сигнала: генерация и рассылка обработчикам"""
+        if self.__source is not None:
+            block = self.__source.read_block()
+            if block is None:
+                # Запись закончилась
+                self.__is_signal_started = False
+                return None
+            return self.__emit_block(block)
+
+        generator = self.__generator
+        # Меняем эмоцию каждые emotion_samples семплов
+        period = self.__sample_count // self.__emotion_samples
+        if period != self.__emotion_period:
+            self.__emotion_period = period
+            self.__emotion_index = (self.__emotion_index + 1) % len(self.__emotion_cycle)
+            self.__current_emotion = self.__emotion_cycle[self.__emotion_index]
+            if self.__verbose:
+                log.info("Эмулятор %s: текущая эмоция - %s", self.__address, self.__current_emotion)
+
+        # Весь блок одним вызовом: волны по паттерну текущей эмоции и шум
+        return self.__emit_block(generator.generate(self.__emotion_patterns[self.__current_emotion]))
+
+    def __emit_block(self, block):
+        self.__sample_count += len(block)
+
+        # Отладочный вывод на каждый блок только при уровне DEBUG и с прореживанием
+        if self.__verbose and log.isEnabledFor(DEBUG) and self.__trace_sample():
+            log.debug(
+                "Эмулятор %s: %d семплов, эмоция %s, последние значения O1=%.2f O2=%.2f T3=%.2f T4=%.2f",
+                self.__address, self.__sample_count, self.__current_emotion, *block[-1, :4].tolist(),
+            )
+
+        # Объекты SensorData для совместимости с SDK, первые четыре канала;
+        # без подписчиков не создаются
+        if self.signalDataReceived.connected():
+            signal_data = [SensorData(*row[:4]) for row in block.tolist()]
+            self.signalDataReceived.emit(self, signal_data)
+        self.signalBlockReceived.emit(self, block)
+        return block
+
+    def tick_resist(self):
+        """Одно измерение сопротивления по профилю контакта"""
+        # Хороший контакт: 1000-5000 Ом
+        # Плохой контакт: 10000-100000 Ом
+        # Отсутствие контакта: бесконечность
+        rng = self.__rng
+        profile = self.__contact_profile
+        ranges = profile["ranges"]
+        resist_data = ResistData(**{channel: rng.uniform(*bounds) for channel, bounds in ranges.items()})
+
+        # Иногда имитируем плохой контакт или отсутствие контакта
+        if rng.random() < profile["lost"]:
+            resist_data.O1 = float('inf')  # Отсутствие контакта
+        if rng.random() < profile["poor"]:
+            resist_data.T3 = rng.uniform(50000, 200000)  # Очень плохой контакт
+
+        # Эмитируем сигнал с данными
+        self.resistDataReceived.emit(self, resist_data)
+        return resist_data
+
+    def __generate_signal_data(self):
+        """Генерация реалистичных данных сигнала с волнами альфа, бета и т.д."""
+        pacer = self.__pacer
+        pacer.reset()
+        while self.__is_signal_started:
+            self.tick_signal()
+            # Следующий блок по расписанию: время генерации не накапливается
+            pacer.wait()
+
+    def __generate_resist_data(self):
+        """Генерация реалистичных данных сопротивления"""
+        while self.__is_resist_started:
+            self.tick_resist()
+            # Ждем немного между измерениями
+            time.sleep(RESIST_INTERVAL)
+
+
+# Функция для создания эмулятора без Qt
+def create_emulator_core(sample_rate=250, block_size=25, channel_count=4, seed=None, speed=1.0, **options):
+    """Создает эмулятор сенсора без Qt, для серверов и тестов"""
+    return EmulatorCore(
+        sample_rate=sample_rate,
+        block_size=block_size,
+        channel_count=channel_count,
+        seed=seed,
+        speed=speed,
+        **options,
+    )
+
+
+# Функция для создания информации о сенсоре-эмуляторе
+def create_emulator_sensor_info(sensor=None):
+    """Создает информацию о сенсоре-эмуляторе"""
+    return SensorInfo(
+        SensFamily=SensorFamily.LEBrainBit,
+        SensModel=0,
+        Name=sensor.Name if sensor else "BrainBit Emulator",
+        Address=sensor.Address if sensor else "EMULATOR-001",
+        SerialNumber=sensor.SerialNumber if sensor else "EMUL-001",
+        PairingRequired=False,
+        RSSI=-50
+    )
\ No newline at end of file
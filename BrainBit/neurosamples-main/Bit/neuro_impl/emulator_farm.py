@@ -0,0 +1,179 @@
+import random
+import time
+from threading import Thread
+
+from neuro_impl.emulator_core import (
+    CONTACT_PROFILES,
+    EMOTION_CYCLE,
+    EMOTION_SAMPLES,
+    RESIST_INTERVAL,
+    EmulatorCore,
+    create_emulator_sensor_info,
+)
+from neuro_impl.pacer import Pacer
+from neuro_impl.trace import get_logger
+
+log = get_logger("farm")
+
+# Доли устройств по профилю контакта
+DEFAULT_PROFILE_WEIGHTS = {"good": 0.6, "default": 0.3, "poor": 0.1}
+
+
+class EmulatorFarm:
+    """
+    Сотни виртуальных BrainBit в одном процессе. Устройства - EmulatorCore
+    без своих потоков: блоки сигнала для всех генерирует небольшой пул
+    потоков (workers), каждый со своей частью устройств и общим расписанием
+    Pacer. У каждого устройства свои серийный номер, адрес, порядок и
+    длительность эмоций, профиль контакта и seed.
+    """
+
+    def __init__(
+        self,
+        count,
+        sample_rate=250,
+        block_size=25,
+        channel_count=4,
+        speed=1.0,
+        seed=None,
+        workers=1,
+        profile_weights=None,
+    ):
+        if count <= 0 or workers <= 0:
+            raise ValueError("count и workers должны быть положительными")
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.speed = speed
+        self.workers = min(workers, count)
+        self.interval = block_size / sample_rate
+        self.running = False
+        self.threads = []
+        self.pacers = []
+        self.busy = [0.0] * self.workers
+        self.errors = 0
+
+        rng = random.Random(seed)
+        weights = profile_weights or DEFAULT_PROFILE_WEIGHTS
+        profiles = [name for name in weights if name in CONTACT_PROFILES]
+        self.devices = []
+        for i in range(count):
+            number = i + 1
+            self.devices.append(EmulatorCore(
+                sample_rate=sample_rate,
+                block_size=block_size,
+                channel_count=channel_count,
+                seed=rng.randrange(2 ** 32) if seed is not None else None,
+                speed=speed,
+                name=f"BrainBit Emulator {number}",
+                serial_number=f"EMUL-{number:04d}",
+                address=f"EMULATOR-{number:04d}",
+                emotion_cycle=rng.sample(EMOTION_CYCLE, len(EMOTION_CYCLE)),
+                emotion_samples=rng.randint(EMOTION_SAMPLES // 2, EMOTION_SAMPLES * 2),
+                contact_profile=rng.choices(profiles, [weights[name] for name in profiles])[0],
+                scheduler=self,
+                verbose=False,
+            ))
+        self.by_address = {device.Address: device for device in self.devices}
+
+    def device(self, address):
+        return self.by_address.get(address)
+
+    def sensor_infos(self):
+        return [create_emulator_sensor_info(device) for device in self.devices]
+
+    def start(self):
+        """Запуск потоков фермы; устройства стартуют командами, как сенсоры"""
+        if self.running:
+            return
+        self.running = True
+        # Загрузка считается заново вместе с новыми Pacer
+        self.busy = [0.0] * self.workers
+        self.pacers = [Pacer(self.interval, speed=self.speed) for _ in range(self.workers)]
+        self.threads = [
+            Thread(target=self.__run, args=(worker,), daemon=True, name=f"emulator-farm-{worker}")
+            for worker in range(self.workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=2)
+        self.threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def __run(self, worker):
+        devices = self.devices[worker::self.workers]
+        pacer = self.pacers[worker]
+        resist_every = max(round(RESIST_INTERVAL / self.interval), 1)
+        tick = 0
+        while self.running:
+            started = time.perf_counter()
+            resist = tick % resist_every == 0
+            for device in devices:
+                try:
+                    if device.is_signal_started:
+                        device.tick_signal()
+                    if resist and device.is_resist_started:
+                        device.tick_resist()
+                except Exception as err:
+                    # Ошибка обработчика одного устройства не останавливает ферму
+                    self.errors += 1
+                    if self.errors <= 10:
+                        log.error("Ферма эмуляторов: ошибка устройства %s: %s", device.Address, err)
+            self.busy[worker] += time.perf_counter() - started
+            tick += 1
+            pacer.wait()
+
+    def stats(self):
+        """Загрузка потоков и опоздание тиков по каждому потоку"""
+        workers = []
+        for worker, pacer in enumerate(self.pacers):
+            stats = pacer.stats()
+            stats["load"] = self.busy[worker] / stats["elapsed"] if stats["elapsed"] else 0.0
+            workers.append(stats)
+        return {
+            "devices": len(self.devices),
+            "signal": sum(1 for device in self.devices if device.is_signal_started),
+            "resist": sum(1 for device in self.devices if device.is_resist_started),
+            "errors": self.errors,
+            "workers": workers,
+        }
+
+
+class FarmScanner:
+    """
+    Сканер с интерфейсом neurosdk Scanner поверх EmulatorFarm: находит
+    все устройства фермы, create_sensor возвращает подключенное устройство.
+    Подходит для BrainBitController(scanner=FarmScanner(farm)).
+    """
+
+    def __init__(self, farm, families=None):
+        self.farm = farm
+        self.families = families
+        self.sensorsChanged = None
+
+    def start(self):
+        self.farm.start()
+        if self.sensorsChanged is not None:
+            self.sensorsChanged(self, self.sensors())
+
+    def stop(self):
+        pass
+
+    def sensors(self):
+        return self.farm.sensor_infos()
+
+    def create_sensor(self, sensor_info):
+        device = self.farm.device(sensor_info.Address)
+        if device is None:
+            raise ValueError(f"Устройство {sensor_info.Address} не найдено в ферме")
+        device.connect()
+        return device
@@ -0,0 +1,105 @@
+import time
+from collections import deque
+
+# Окно для перцентилей опоздания
+JITTER_WINDOW = 1000
+
+
+class Pacer:
+    """
+    Планировщик тиков по монотонным часам.
+
+    Тик n должен наступить в start + n * interval / speed. Сон считается от
+    этого срока, а не от конца предыдущего тика, поэтому время генерации и
+    неточность time.sleep не накапливаются. speed=1 - реальное время,
+    speed>1 - ускоренно, speed=0 - без пауз (как можно быстрее). Если
+    опоздание больше max_lag тиков, расписание сдвигается на текущее время,
+    а не догоняется пачкой.
+    """
+
+    def __init__(self, interval, speed=1.0, max_lag=5, clock=time.monotonic, sleep=time.sleep):
+        if interval <= 0:
+            raise ValueError("interval должен быть положительным")
+        if speed < 0:
+            raise ValueError("speed не может быть отрицательной")
+        self.interval = interval
+        self.speed = speed
+        self.max_lag = max_lag
+        self.clock = clock
+        self.sleep = sleep
+        self.lateness = deque(maxlen=JITTER_WINDOW)
+        self.reset()
+
+    def reset(self):
+        self.start = None
+        self.started = None
+        self.ticks = 0
+        self.resyncs = 0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+        self.lateness.clear()
+
+    def set_speed(self, speed):
+        """Смена скорости на ходу: расписание продолжается от текущего тика"""
+        if speed < 0:
+            raise ValueError("speed не может быть отрицательной")
+        self.speed = speed
+        if self.start is not None:
+            self.start = self.clock() - self.ticks * self.period
+
+    @property
+    def period(self):
+        """Реальная длительность тика, 0 без пауз"""
+        return self.interval / self.speed if self.speed else 0.0
+
+    @property
+    def stream_time(self):
+        """Номинальное время потока: сколько секунд сигнала уже выдано"""
+        return self.ticks * self.interval
+
+    def wait(self):
+        """Ждет срока следующего тика и возвращает опоздание в секундах."""
+        now = self.clock()
+        if self.start is None:
+            self.start = self.started = now
+        self.ticks += 1
+        period = self.period
+        if not period:
+            return 0.0
+
+        deadline = self.start + self.ticks * period
+        delay = deadline - now
+        if delay > 0:
+            self.sleep(delay)
+            now = self.clock()
+        late = now - deadline
+        if late > self.max_lag * period:
+            # Поток стоял (отладчик, перегрузка): начинаем расписание заново
+            self.start = now - self.ticks * period
+            self.resyncs += 1
+
+        late = max(late, 0.0)
+        self.lateness.append(late)
+        self.total_lateness += late
+        self.max_lateness = max(self.max_lateness, late)
+        return late
+
+    def stats(self):
+        """Статистика опоздания тиков относительно расписания, мс"""
+        window = sorted(self.lateness)
+
+        def percentile(q):
+            return window[min(int(q * len(window)), len(window) - 1)] * 1000 if window else 0.0
+
+        elapsed = self.clock() - self.started if self.started is not None else 0.0
+        return {
+            "ticks": self.ticks,
+            "speed": self.speed,
+            "stream_time": self.stream_time,
+            "elapsed": elapsed,
+            "resyncs": self.resyncs,
+            "mean_ms": self.total_lateness / self.ticks * 1000 if self.ticks else 0.0,
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "max_ms": self.max_lateness * 1000,
+        }
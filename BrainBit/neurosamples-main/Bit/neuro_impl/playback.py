@@ -0,0 +1,129 @@
+from threading import Lock
+
+import numpy as np
+
+from neuro_impl.emulator_core import EmulatorCore
+
+
+class PlaybackSource:
+    """
+    Записанный ЭЭГ для EmulatorCore: массив (samples, channels) в файле,
+    отображенном в память, поэтому запись любой длины открывается сразу и
+    читается только по мере воспроизведения.
+
+    .npy открывается через np.load(mmap_mode="r"), любой другой файл -
+    как сырые float32 с channel_count каналами подряд. Каналы в порядке
+    O1, O2, T3, T4. scale переводит единицы записи в единицы потребителя.
+    """
+
+    def __init__(self, path, sample_rate=250, block_size=25, channel_count=4, loop=False, scale=1.0):
+        if str(path).endswith(".npy"):
+            data = np.load(path, mmap_mode="r")
+        else:
+            data = np.memmap(path, dtype=np.float32, mode="r")
+            data = data[:len(data) // channel_count * channel_count].reshape(-1, channel_count)
+        if data.ndim != 2 or not len(data):
+            raise ValueError(f"Запись {path} должна быть непустым массивом (samples, channels)")
+        if loop and len(data) < block_size:
+            raise ValueError(f"Запись {path} короче одного блока, loop невозможен")
+        self.path = str(path)
+        self.data = data
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.loop = loop
+        self.scale = scale
+        self.position = 0
+        self.loops = 0
+        self.__lock = Lock()
+
+    @property
+    def channel_count(self):
+        return self.data.shape[1]
+
+    @property
+    def duration(self):
+        """Длительность записи, секунды"""
+        return len(self.data) / self.sample_rate
+
+    @property
+    def time(self):
+        """Текущая позиция, секунды"""
+        return self.position / self.sample_rate
+
+    def seek(self, seconds):
+        """Переход к моменту записи; с loop позиция берется по модулю длины"""
+        position = int(round(seconds * self.sample_rate))
+        with self.__lock:
+            if self.loop:
+                position %= len(self.data)
+            self.position = min(max(position, 0), len(self.data))
+
+    def read_block(self):
+        """Следующий блок (block_size, channels) или None в конце записи без loop"""
+        with self.__lock:
+            total = len(self.data)
+            start = self.position
+            if start >= total:
+                if not self.loop:
+                    return None
+                start = 0
+                self.loops += 1
+            end = start + self.block_size
+            block = np.array(self.data[start:min(end, total)], dtype=np.float64)
+            if end > total and self.loop:
+                # Склейка конца записи с началом, блок всегда полный
+                self.loops += 1
+                end -= total
+                block = np.concatenate([block, np.asarray(self.data[:end], dtype=np.float64)])
+            self.position = end
+        if self.scale != 1.0:
+            block *= self.scale
+        return block
+
+
+class SignalRecorder:
+    """
+    Запись сигнала сенсора для PlaybackSource. Обработчик для
+    signalDataReceived (sensor, data) или BrainBitController.signalReceived
+    (data); save сохраняет накопленное в .npy.
+    """
+
+    def __init__(self):
+        self.blocks = []
+        self.__lock = Lock()
+
+    def __call__(self, *args):
+        data = args[-1]
+        block = np.array([(sample.O1, sample.O2, sample.T3, sample.T4) for sample in data], dtype=np.float32)
+        with self.__lock:
+            self.blocks.append(block)
+
+    def save(self, path):
+        with self.__lock:
+            samples = np.concatenate(self.blocks) if self.blocks else np.zeros((0, 4), dtype=np.float32)
+        write_recording(path, samples)
+        return len(samples)
+
+
+def write_recording(path, samples):
+    """Сохраняет массив (samples, channels) как .npy для PlaybackSource"""
+    np.save(path, np.asarray(samples, dtype=np.float32))
+
+
+# Функция для создания сенсора, воспроизводящего запись
+def create_playback_sensor(path, sample_rate=250, block_size=25, channel_count=4, loop=False, speed=1.0,
+                           scale=1.0, contact_profile="good", **options):
+    """
+    Сенсор с интерфейсом EmulatorCore, сигнал которого - запись из файла.
+    Перемотка через sensor.source.seek, скорость - sensor.set_speed.
+    """
+    source = PlaybackSource(
+        path,
+        sample_rate=sample_rate,
+        block_size=block_size,
+        channel_count=channel_count,
+        loop=loop,
+        scale=scale,
+    )
+    options.setdefault("name", "BrainBit Playback")
+    return EmulatorCore(source=source, speed=speed, contact_profile=contact_profile, **options)
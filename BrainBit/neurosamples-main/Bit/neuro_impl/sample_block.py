@@ -0,0 +1,64 @@
+from operator import attrgetter
+
+import numpy as np
+
+from neuro_impl.utils import BB_channels
+
+
+class SampleBlock:
+    """
+    Блок семплов по столбцам: массив (channels, samples), строка на канал.
+
+    Каналы - непрерывные срезы одного массива, поэтому channel() и
+    bipolar() не копируют по семплу, а scaled() умножает весь блок одной
+    операцией. Контроллеры принимают блок вместо списка SensorData.
+    """
+
+    def __init__(self, columns, channels=BB_channels):
+        columns = np.asarray(columns, dtype=np.float64)
+        if columns.ndim != 2 or columns.shape[0] != len(channels):
+            raise ValueError(f"Ожидается массив ({len(channels)}, samples), получен {columns.shape}")
+        self.columns = columns
+        self.channels = list(channels)
+        self.__index = {name: i for i, name in enumerate(self.channels)}
+
+    @classmethod
+    def from_array(cls, block, channels=BB_channels):
+        """Из блока (samples, channels), как в signalBlockReceived и PlaybackSource"""
+        block = np.asarray(block, dtype=np.float64)
+        return cls(np.ascontiguousarray(block[:, :len(channels)].T), channels)
+
+    @classmethod
+    def from_sensor_data(cls, samples, channels=BB_channels):
+        """Из списка SensorData (neurosdk или эмулятора)"""
+        if not samples:
+            return cls(np.zeros((len(channels), 0)), channels)
+        rows = list(map(attrgetter(*channels), samples))
+        return cls(np.array(rows, dtype=np.float64).T.copy(), channels)
+
+    @classmethod
+    def coerce(cls, data, channels=BB_channels):
+        """SampleBlock, numpy-блок (samples, channels) или список SensorData"""
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, np.ndarray):
+            return cls.from_array(data, channels)
+        return cls.from_sensor_data(data, channels)
+
+    def __len__(self):
+        return self.columns.shape[1]
+
+    def __getitem__(self, name):
+        return self.channel(name)
+
+    def channel(self, name):
+        """Значения одного канала, без копирования"""
+        return self.columns[self.__index[name]]
+
+    def scaled(self, factor):
+        """Новый блок со всеми каналами, умноженными на factor"""
+        return SampleBlock(self.columns * factor, self.channels)
+
+    def bipolar(self, active, reference):
+        """Отведение active - reference для всего блока"""
+        return self.channel(active) - self.channel(reference)
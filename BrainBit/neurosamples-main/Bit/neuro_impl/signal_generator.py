@@ -0,0 +1,94 @@
+import numpy as np
+
+# Частоты ритмов, Гц
+BAND_FREQUENCIES = {"alpha": 10.0, "beta": 20.0, "theta": 6.0, "delta": 2.0}
+
+CHANNEL_NAMES = ["O1", "O2", "T3", "T4"]
+
+# Вклад ритмов (alpha, beta, theta, delta) в каждый канал BrainBit
+CHANNEL_MIX = [
+    [1.0, 0.5, 0.3, 0.1],     # O1
+    [0.9, 0.6, 0.2, 0.15],    # O2
+    [0.8, 0.7, 0.25, 0.12],   # T3
+    [0.85, 0.55, 0.35, 0.08], # T4
+]
+
+# Амплитуды ритмов для эмоций эмулятора и порядок их смены
+EMOTION_PATTERNS = {
+    "neutral": {"alpha": 50, "beta": 30, "theta": 20, "delta": 10},
+    "relaxed": {"alpha": 70, "beta": 20, "theta": 25, "delta": 15},
+    "focused": {"alpha": 40, "beta": 50, "theta": 15, "delta": 5},
+    "anxious": {"alpha": 30, "beta": 60, "theta": 30, "delta": 10},
+    "drowsy": {"alpha": 40, "beta": 20, "theta": 25, "delta": 30}
+}
+EMOTION_CYCLE = ["neutral", "relaxed", "focused", "anxious", "drowsy"]
+
+
+class SignalGenerator:
+    """
+    Генератор ЭЭГ блоками: один блок - массив (block_size, channel_count).
+
+    Фаза каждого ритма хранится между блоками, поэтому волны непрерывны
+    на стыках и не зависят от размера блока. Шум берется из собственного
+    numpy.random.Generator, при одинаковом seed сигнал повторяется.
+    """
+
+    def __init__(self, sample_rate=250, block_size=25, channel_count=4, noise=5.0, seed=None):
+        if sample_rate <= 0 or block_size <= 0 or channel_count <= 0:
+            raise ValueError("sample_rate, block_size и channel_count должны быть положительными")
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.channel_count = channel_count
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+        self.bands = list(BAND_FREQUENCIES)
+        frequencies = np.array([BAND_FREQUENCIES[band] for band in self.bands])
+        # Приращение фазы за один семпл и фаза первого семпла следующего блока
+        self.phase_step = 2 * np.pi * frequencies / sample_rate
+        self.phase = np.zeros(len(self.bands))
+        self.ramp = np.arange(block_size)
+
+        self.channel_names = self.__channel_names(channel_count)
+        self.mix = self.__channel_mix(channel_count)
+        self.samples_generated = 0
+
+    @staticmethod
+    def __channel_names(channel_count):
+        names = CHANNEL_NAMES[:channel_count]
+        return names + [f"CH{i + 1}" for i in range(len(names), channel_count)]
+
+    def __channel_mix(self, channel_count):
+        # Каналы сверх четырех повторяют смеси BrainBit с небольшим разбросом
+        base = np.array(CHANNEL_MIX)
+        mix = base[np.arange(channel_count) % len(base)]
+        if channel_count > len(base):
+            spread = np.random.default_rng(channel_count).uniform(0.9, 1.1, mix.shape)
+            mix = mix * spread
+            mix[:len(base)] = base
+        return mix
+
+    def generate(self, amplitudes):
+        """
+        Следующий блок сигнала. amplitudes - амплитуды ритмов, словарь
+        вида {"alpha": 50, "beta": 30, "theta": 20, "delta": 10}.
+        """
+        amplitude = np.array([amplitudes.get(band, 0.0) for band in self.bands], dtype=float)
+
+        # (bands, block_size): фаза каждого семпла блока
+        phases = self.phase[:, None] + self.phase_step[:, None] * self.ramp
+        self.phase = (self.phase + self.phase_step * self.block_size) % (2 * np.pi)
+        waves = amplitude[:, None] * np.sin(phases)
+
+        block = (self.mix @ waves).T
+        if self.noise:
+            # Шум общий для всех каналов одного семпла, как у прежнего эмулятора
+            block += self.rng.uniform(-self.noise, self.noise, (self.block_size, 1))
+        self.samples_generated += self.block_size
+        return block
+
+    def reset(self, seed=None):
+        self.phase = np.zeros(len(self.bands))
+        self.samples_generated = 0
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
@@ -1,10 +1,18 @@
 from spectrum_lib.spectrum_lib import SpectrumMath
 
+from neuro_impl.channel_executor import map_channels
+from neuro_impl.sample_block import SampleBlock
+from neuro_impl.trace import DEBUG, Sampler, get_logger
 from neuro_impl.utils import BB_channels
 
+log = get_logger("spectrum")
+
+# Сигнал сенсора в вольтах, SpectrumMath ждет милливольты
+SIGNAL_SCALE = 1e3
+
 
 class SpectrumController:
-    def __init__(self):
+    def __init__(self, executor=None):
         sampling_rate = 250  # raw signal sampling frequency
         fft_window = sampling_rate * 4  # spectrum calculation window length
         process_win_rate = 5  # spectrum calculation frequency
@@ -21,45 +29,51 @@ class SpectrumController:
             self.maths[BB_channels[i]].init_params(bord_frequency, normalize_spect_by_bandwidth)
             self.maths[BB_channels[i]].set_waves_coeffs(delta_coef, theta_coef, alpha_coef, beta_coef, gamma_coef)
 
+        # ChannelExecutor для расчета каналов параллельно, None - по очереди
+        self.executor = executor
+        self.__trace_sample = Sampler()
         self.processedSpectrum = None
         self.processedWaves = None
 
     def process_data(self, brain_bit_data):
-        print(f"SpectrumController: Processing {len(brain_bit_data)} samples")
-        o1Values = []
-        o2Values = []
-        t3Values = []
-        t4Values = []
-        for i in range(len(brain_bit_data)):
-            o1Values.append(brain_bit_data[i].O1 * 1e3)
-            o2Values.append(brain_bit_data[i].O2 * 1e3)
-            t3Values.append(brain_bit_data[i].T3 * 1e3)
-            t4Values.append(brain_bit_data[i].T4 * 1e3)
-        self.maths['O1'].push_and_process_data(o1Values)
-        self.maths['O2'].push_and_process_data(o2Values)
-        self.maths['T3'].push_and_process_data(t3Values)
-        self.maths['T4'].push_and_process_data(t4Values)
-        self.__resolve_spectrum()
-        self.__resolve_waves()
-        for i in range(4):
-            self.maths[BB_channels[i]].set_new_sample_size()
+        """brain_bit_data - список SensorData, numpy-блок (N, 4) или SampleBlock"""
+        block = SampleBlock.coerce(brain_bit_data).scaled(SIGNAL_SCALE)
+        results = map_channels(self.executor, lambda channel: self.__process_channel(channel, block), BB_channels)
+        # Колбэки в вызывающем потоке и в порядке каналов, как при последовательном расчете
+        self.__resolve_spectrum(results)
+        self.__resolve_waves(results)
+        if log.isEnabledFor(DEBUG) and self.__trace_sample():
+            self.__trace(results)
 
-    def __resolve_spectrum(self):
-        for i in range(4):
-            raw_spectrum = self.maths[BB_channels[i]].read_raw_spectrum_info_arr()
-            raw_data = []
-            if len(raw_spectrum) > 0:
-                raw_data = raw_spectrum[-1].all_bins_values
+    def __process_channel(self, channel, block):
+        math = self.maths[channel]
+        math.push_and_process_data(block.channel(channel).tolist())
+        raw_spectrum = math.read_raw_spectrum_info_arr()
+        waves_spectrum = math.read_waves_spectrum_info_arr()
+        math.set_new_sample_size()
+        raw_data = raw_spectrum[-1].all_bins_values if len(raw_spectrum) > 0 else []
+        waves_data = waves_spectrum[-1] if len(waves_spectrum) > 0 else None
+        return raw_data, waves_data
+
+    def __resolve_spectrum(self, results):
+        for channel, (raw_data, _) in zip(BB_channels, results):
             if len(raw_data) > 0:
-                print(f"SpectrumController: Spectrum data for {BB_channels[i]}, length: {len(raw_data)}")
                 if self.processedSpectrum:
-                    self.processedSpectrum(raw_data, BB_channels[i])
+                    self.processedSpectrum(raw_data, channel)
 
-    def __resolve_waves(self):
-        for i in range(4):
-            waves_spectrum = self.maths[BB_channels[i]].read_waves_spectrum_info_arr()
-            if len(waves_spectrum) > 0:
-                waves_data = waves_spectrum[-1]
-                print(f"SpectrumController: Waves data for {BB_channels[i]} - Delta: {waves_data.delta_raw:.4f}, Theta: {waves_data.theta_raw:.4f}, Alpha: {waves_data.alpha_raw:.4f}, Beta: {waves_data.beta_raw:.4f}, Gamma: {waves_data.gamma_raw:.4f}")
+    def __resolve_waves(self, results):
+        for channel, (_, waves_data) in zip(BB_channels, results):
+            if waves_data is not None:
                 if self.processedWaves:
-                    self.processedWaves(waves_data, BB_channels[i])
\ No newline at end of file
+                    self.processedWaves(waves_data, channel)
+
+    def __trace(self, results):
+        for channel, (raw_data, waves_data) in zip(BB_channels, results):
+            if len(raw_data) > 0:
+                log.debug("Spectrum data for %s, length: %d", channel, len(raw_data))
+            if waves_data is not None:
+                log.debug(
+                    "Waves data for %s - Delta: %.4f, Theta: %.4f, Alpha: %.4f, Beta: %.4f, Gamma: %.4f",
+                    channel, waves_data.delta_raw, waves_data.theta_raw, waves_data.alpha_raw,
+                    waves_data.beta_raw, waves_data.gamma_raw,
+                )
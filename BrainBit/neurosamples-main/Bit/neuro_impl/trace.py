@@ -0,0 +1,149 @@
+import logging
+import os
+import sys
+import time
+from collections import deque
+from threading import Lock
+
+# Корневой логгер приложения, модули пишут в его потомков (bit.emulator, ...)
+LOGGER_NAME = "bit"
+
+# Уровень вывода в консоль, по умолчанию INFO: сообщения на каждый блок
+# сигнала пишутся с DEBUG и без BIT_LOG_LEVEL=DEBUG не форматируются
+LEVEL_ENV = "BIT_LOG_LEVEL"
+# Кольцевой буфер трассы: уровень записей и емкость, 0 отключает буфер
+TRACE_LEVEL_ENV = "BIT_TRACE_LEVEL"
+TRACE_SIZE_ENV = "BIT_TRACE_SIZE"
+# Сообщения горячего пути пишутся раз в столько событий
+TRACE_SAMPLE_ENV = "BIT_TRACE_SAMPLE"
+
+DEFAULT_TRACE_SIZE = 5000
+DEFAULT_SAMPLE = 10
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+
+_trace = None
+_lock = Lock()
+
+
+def get_logger(name):
+    """Логгер модуля, например get_logger("emulator") -> bit.emulator"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+def _level(value, default):
+    if not value:
+        return default
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else default
+
+
+class Sampler:
+    """
+    Прореживание сообщений горячего пути: вызов возвращает True для
+    первого и далее для каждого every-го события. Вызывать только после
+    проверки уровня логгера, чтобы при выключенном уровне не было даже
+    счета.
+    """
+
+    def __init__(self, every=None):
+        self.every = max(every or int(os.environ.get(TRACE_SAMPLE_ENV) or DEFAULT_SAMPLE), 1)
+        self.count = 0
+
+    def __call__(self):
+        self.count += 1
+        return self.every == 1 or self.count % self.every == 1
+
+
+class TraceBuffer(logging.Handler):
+    """
+    Последние capacity записей в памяти. Записи хранятся как LogRecord,
+    строка записи собирается только в dump. При записи в буфер
+    фиксируются текст сообщения и трассировка исключения: аргументы могут
+    измениться до dump, а исключение держит кадры стека.
+    """
+
+    def __init__(self, capacity=DEFAULT_TRACE_SIZE, level=INFO):
+        super().__init__(level)
+        self.records = deque(maxlen=capacity)
+        self.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    def emit(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+    def dump(self, stream):
+        """Выводит буфер в поток и возвращает число записей"""
+        records = list(self.records)
+        for record in records:
+            stream.write(self.format(record) + "\n")
+        stream.flush()
+        return len(records)
+
+
+def configure(level=None, trace_level=None, trace_size=None, stream=None):
+    """
+    Настройка логгера bit: вывод в stream (stdout по умолчанию) с уровнем
+    level и кольцевой буфер trace_size записей с уровнем trace_level.
+    Не заданные параметры берутся из BIT_LOG_LEVEL, BIT_TRACE_LEVEL и
+    BIT_TRACE_SIZE. Повторный вызов заменяет прежние обработчики.
+    """
+    global _trace
+    level = level if level is not None else _level(os.environ.get(LEVEL_ENV), INFO)
+    trace_level = trace_level if trace_level is not None else _level(os.environ.get(TRACE_LEVEL_ENV), INFO)
+    if trace_size is None:
+        trace_size = int(os.environ.get(TRACE_SIZE_ENV) or DEFAULT_TRACE_SIZE)
+
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.propagate = False
+
+    levels = []
+    # В собранном exe без консоли sys.stdout равен None
+    stream = stream or sys.stdout
+    if stream is not None:
+        console = logging.StreamHandler(stream)
+        console.setLevel(level)
+        console.setFormatter(logging.Formatter(LOG_FORMAT))
+        logger.addHandler(console)
+        levels.append(level)
+
+    _trace = TraceBuffer(trace_size, trace_level) if trace_size > 0 else None
+    if _trace is not None:
+        logger.addHandler(_trace)
+        levels.append(trace_level)
+    # Уровень логгера - самый подробный из обработчиков: ниже него
+    # isEnabledFor отсекает сообщение до создания записи
+    logger.setLevel(min(levels) if levels else logging.CRITICAL + 1)
+    return _trace
+
+
+def trace_buffer():
+    """Кольцевой буфер после configure или None"""
+    return _trace
+
+
+def dump_trace(path=None):
+    """
+    Сохраняет кольцевой буфер в файл (по умолчанию logs/trace-<время>.log)
+    и возвращает путь, или None, если буфер не настроен.
+    """
+    if _trace is None:
+        return None
+    if path is None:
+        path = os.path.join("logs", time.strftime("trace-%Y%m%d-%H%M%S.log"))
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _lock, open(path, "w", encoding="utf-8") as f:
+        _trace.dump(f)
+    return path
@@ -1,4 +1,5 @@
 import json
+import time
 import asyncio
 import websockets
 from PyQt6.QtCore import QObject, pyqtSignal, QThread, QTimer
@@ -13,9 +14,13 @@ class WebSocketClient(QObject):
     error = pyqtSignal(str)
     message_received = pyqtSignal(dict)
     
-    def __init__(self, url: str = "ws://5.129.252.186:3000/ws/device"):
+    def __init__(self, url: str = "ws://5.129.252.186:3000/ws/device", record_path: Optional[str] = None):
         super().__init__()
         self.url = url
+        # Запись сессии в JSONL, тот же формат что у сервера (/v1/replay)
+        self.record_path = record_path
+        self.record_file = None
+        self.record_started = 0.0
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.connected_status = False
         self.loop: Optional[asyncio.AbstractEventLoop] = None
@@ -29,6 +34,8 @@ class WebSocketClient(QObject):
             return
             
         self.running = True
+        if self.record_path:
+            self._open_recording()
         self.worker = WebSocketWorker(self.url)
         self.worker.connected_callback = self._on_connected
         self.worker.disconnected_callback = self._on_disconnected
@@ -45,7 +52,32 @@ class WebSocketClient(QObject):
             self.worker.stop()
         if self.thread and self.thread.is_alive():
             self.thread.join(timeout=2)
-            
+        self._close_recording()
+
+    def _open_recording(self):
+        try:
+            self.record_file = open(self.record_path, "w", encoding="utf-8", buffering=64 * 1024)
+        except OSError as e:
+            self.error.emit(f"Не удалось открыть файл записи: {e}")
+            return
+        self.record_started = time.monotonic()
+        self._write_record({
+            "type": "session",
+            "version": 1,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        })
+
+    def _write_record(self, record: dict):
+        try:
+            self.record_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except (OSError, TypeError, ValueError):
+            self._close_recording()
+
+    def _close_recording(self):
+        if self.record_file:
+            self.record_file.close()
+            self.record_file = None
+
     def _on_connected(self):
         self.connected_status = True
         self.connected.emit()
@@ -71,10 +103,14 @@ class WebSocketClient(QObject):
     def send_eeg_sample(self, data: Dict[str, Any]):
         """Отправка EEG данных"""
         if self.worker:
-            self.worker.send_message({
+            # Метка времени нужна серверу для измерения задержки доставки
+            message = {
                 "type": "eeg_sample",
-                "data": data
-            })
+                "data": {**data, "timestamp": time.time()}
+            }
+            self.worker.send_message(message)
+            if self.record_file:
+                self._write_record({**message, "t": round(time.monotonic() - self.record_started, 4)})
             
     def is_connected(self) -> bool:
         """Проверка статуса подключения"""
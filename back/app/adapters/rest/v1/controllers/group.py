@@ -1,6 +1,6 @@
 import uuid
 from app.service.group_service import GroupService
-from app.domains.group import Group, GroupWithMembers, CreateGroup, GroupMember, GroupSession
+from app.domains.group import Group, GroupWithMembers, CreateGroup, GroupMember, GroupSession, GroupSessionHeatmapBucket
 import uuid
 
 
@@ -23,6 +23,12 @@ class GroupController:
     async def delete_sessions(self, access_token: str, group_id: uuid.UUID) -> None:
         return await self.service.delete_sessions(access_token, group_id)
 
+    async def get_session_heatmap(self, access_token: str, group_id: uuid.UUID, session_id: uuid.UUID) -> list[GroupSessionHeatmapBucket]:
+        return await self.service.get_session_heatmap(access_token, group_id, session_id)
+
+    async def rebuild_session_heatmap(self, access_token: str, group_id: uuid.UUID, session_id: uuid.UUID) -> list[GroupSessionHeatmapBucket]:
+        return await self.service.rebuild_session_heatmap(access_token, group_id, session_id)
+
     async def list_for_user(self, access_token: str):
         return await self.service.list_groups_for_user(access_token)
 
@@ -0,0 +1,30 @@
+import uuid
+
+from app.domains.replay import Recording, Replay, StartReplay
+from app.service.session_replay import ReplayService
+from app.service.token_service import TokenService
+
+
+class ReplayController:
+    def __init__(self, service: ReplayService, token_service: TokenService):
+        self.service = service
+        self.token_service = token_service
+
+    def _user_id(self, access_token: str) -> uuid.UUID:
+        payload = self.token_service.validate_access_token(access_token)
+        return uuid.UUID(payload.sub)
+
+    async def list_recordings(self, access_token: str) -> list[Recording]:
+        return self.service.list_recordings(self._user_id(access_token))
+
+    async def upload_recording(self, access_token: str, filename: str | None, content: bytes) -> Recording:
+        return await self.service.save_recording(self._user_id(access_token), filename, content)
+
+    async def start(self, access_token: str, data: StartReplay) -> Replay:
+        return await self.service.start(self._user_id(access_token), data)
+
+    async def list(self, access_token: str) -> list[Replay]:
+        return self.service.list_replays(self._user_id(access_token))
+
+    async def stop(self, access_token: str, replay_id: uuid.UUID) -> Replay:
+        return await self.service.stop(self._user_id(access_token), replay_id)
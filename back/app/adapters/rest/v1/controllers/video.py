@@ -1,6 +1,6 @@
 import uuid
 
-from app.domains.video import Video
+from app.domains.video import Video, VideoDetail
 from app.service.video_service import VideoService
 
 
@@ -11,7 +11,7 @@ class VideoController:
     async def upload(self, filename: str | None, content: bytes) -> Video:
         return await self.video_service.upload(filename, content)
 
-    async def get_one(self, video_id: uuid.UUID) -> Video:
+    async def get_one(self, video_id: uuid.UUID) -> VideoDetail:
         return await self.video_service.get_one(video_id)
 
     async def get_all(self) -> list[Video]:
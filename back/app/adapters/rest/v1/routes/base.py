@@ -8,6 +8,8 @@ from app.adapters.rest.v1.routes.user import router as user_router
 from app.adapters.rest.v1.routes.group import router as group_router
 from app.adapters.rest.v1.routes.engagement import router as eeg_router
 from app.adapters.rest.v1.routes.history import router as history_router
+from app.adapters.rest.v1.routes.stats import router as stats_router
+from app.adapters.rest.v1.routes.replay import router as replay_router
 
 router = APIRouter()
 
@@ -19,4 +21,6 @@ router.include_router(router=organization_router, prefix="/organization")
 router.include_router(router=user_router, prefix="/users")
 router.include_router(router=group_router, prefix="/groups")
 router.include_router(router=eeg_router, prefix="/eeg")
-router.include_router(router=history_router, prefix="/history")
\ No newline at end of file
+router.include_router(router=history_router, prefix="/history")
+router.include_router(router=stats_router, prefix="/stats")
+router.include_router(router=replay_router, prefix="/replay")
\ No newline at end of file
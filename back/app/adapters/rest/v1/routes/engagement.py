@@ -2,7 +2,6 @@ import asyncio
 import json
 import uuid
 
-import requests
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 
@@ -64,6 +63,9 @@ async def analyze_engagements(
         "stream": False,
     }
 
+    # imported on first use, it is only needed by this endpoint
+    import requests
+
     response = await asyncio.to_thread(
         requests.post,
         f"{settings.AGENT_HOST}/chat",
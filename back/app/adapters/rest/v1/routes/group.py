@@ -4,7 +4,7 @@ from fastapi.security import OAuth2PasswordBearer
 
 from app.adapters.rest.v1.controllers.group import GroupController
 from app.composites.group_composite import get_controller
-from app.domains.group import Group, GroupWithMembers, CreateGroup, GroupMember, GroupSession
+from app.domains.group import Group, GroupWithMembers, CreateGroup, GroupMember, GroupSession, GroupSessionHeatmapBucket
 
 router = APIRouter()
 
@@ -58,6 +58,26 @@ async def delete_sessions(
     await controller.delete_sessions(access_token=token, group_id=group_id)
 
 
+@router.get("/{group_id}/sessions/{session_id}/heatmap", response_model=list[GroupSessionHeatmapBucket])
+async def get_session_heatmap(
+    group_id: uuid.UUID = Path(...),
+    session_id: uuid.UUID = Path(...),
+    token: str = Depends(oauth2_scheme),
+    controller: GroupController = Depends(get_controller),
+):
+    return await controller.get_session_heatmap(access_token=token, group_id=group_id, session_id=session_id)
+
+
+@router.post("/{group_id}/sessions/{session_id}/heatmap/rebuild", response_model=list[GroupSessionHeatmapBucket])
+async def rebuild_session_heatmap(
+    group_id: uuid.UUID = Path(...),
+    session_id: uuid.UUID = Path(...),
+    token: str = Depends(oauth2_scheme),
+    controller: GroupController = Depends(get_controller),
+):
+    return await controller.rebuild_session_heatmap(access_token=token, group_id=group_id, session_id=session_id)
+
+
 @router.get("/my", response_model=list[GroupWithMembers])
 async def list_my_groups(
     token: str = Depends(oauth2_scheme),
@@ -0,0 +1,33 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.metrics import registry
+
+router = APIRouter()
+
+
+def _authorized(authorization: str | None) -> bool:
+    if not settings.METRICS_TOKEN:
+        # open for local scraping, hidden in production until a token is set
+        return settings.NODE_ENV != "production"
+    scheme, _, token = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and secrets.compare_digest(token, settings.METRICS_TOKEN)
+
+
+async def require_metrics_token(authorization: str | None = Header(default=None)) -> None:
+    """Dependency of /metrics and the /v1/stats routes."""
+    if not _authorized(authorization):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+    dependencies=[Depends(require_metrics_token)],
+)
+async def metrics() -> str:
+    return registry.render()
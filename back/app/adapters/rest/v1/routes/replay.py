@@ -0,0 +1,58 @@
+import uuid
+
+from fastapi import APIRouter, Body, Depends, File, Path, UploadFile
+from fastapi.security import OAuth2PasswordBearer
+
+from app.adapters.rest.v1.controllers.replay import ReplayController
+from app.composites.replay_composite import get_controller
+from app.core.config import settings
+from app.domains.replay import Recording, Replay, StartReplay
+
+router = APIRouter()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="ya s ruletom na balkone")
+
+
+@router.get("/recordings", response_model=list[Recording])
+async def list_recordings(
+    token: str = Depends(oauth2_scheme),
+    controller: ReplayController = Depends(get_controller),
+):
+    return await controller.list_recordings(access_token=token)
+
+
+@router.post("/recordings", response_model=Recording)
+async def upload_recording(
+    file: UploadFile = File(...),
+    token: str = Depends(oauth2_scheme),
+    controller: ReplayController = Depends(get_controller),
+):
+    # one byte over the limit is enough for the service to reject it
+    content = await file.read(settings.RECORDING_MAX_UPLOAD_BYTES + 1)
+    return await controller.upload_recording(access_token=token, filename=file.filename, content=content)
+
+
+@router.post("/", response_model=Replay)
+async def start_replay(
+    payload: StartReplay = Body(...),
+    token: str = Depends(oauth2_scheme),
+    controller: ReplayController = Depends(get_controller),
+):
+    return await controller.start(access_token=token, data=payload)
+
+
+@router.get("/", response_model=list[Replay])
+async def list_replays(
+    token: str = Depends(oauth2_scheme),
+    controller: ReplayController = Depends(get_controller),
+):
+    return await controller.list(access_token=token)
+
+
+@router.delete("/{replay_id}", response_model=Replay)
+async def stop_replay(
+    replay_id: uuid.UUID = Path(...),
+    token: str = Depends(oauth2_scheme),
+    controller: ReplayController = Depends(get_controller),
+):
+    return await controller.stop(access_token=token, replay_id=replay_id)
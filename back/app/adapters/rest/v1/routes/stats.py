@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import text
+
+from app.adapters.rest.v1.routes.metrics import require_metrics_token
+from app.composites.cohort_composite import get_aggregator as get_cohort_aggregator
+from app.composites.ingest_composite import get_registry as get_ingest_registry
+from app.core.db import get_pool_status, session_scope
+from app.service.cohort_aggregator import CohortAggregator
+from app.service.device_ingest import IngestRegistry
+
+# same access as /metrics: pool internals, user and session ids
+router = APIRouter(dependencies=[Depends(require_metrics_token)])
+
+
+@router.get("/db")
+async def db_stats() -> dict:
+    healthy = True
+    try:
+        async with session_scope() as session:
+            await session.execute(text("SELECT 1"))
+    except Exception:
+        healthy = False
+
+    return {"healthy": healthy, "pool": get_pool_status()}
+
+
+@router.get("/devices")
+async def device_stats(
+    ingest_registry: IngestRegistry = Depends(get_ingest_registry),
+) -> dict:
+    return ingest_registry.stats()
+
+
+@router.get("/cohorts")
+async def cohort_stats(
+    cohort: CohortAggregator = Depends(get_cohort_aggregator),
+) -> dict:
+    return cohort.stats()
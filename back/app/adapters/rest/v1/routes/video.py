@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, File, UploadFile
 
 from app.adapters.rest.v1.controllers.video import VideoController
 from app.composites.video_composite import get_controller
-from app.domains.video import Video
+from app.domains.video import Video, VideoDetail
 
 
 router = APIRouter()
@@ -19,7 +19,7 @@ async def upload_video(
     return await controller.upload(file.filename, content)
 
 
-@router.get("/videos/{video_id}", response_model=Video)
+@router.get("/videos/{video_id}", response_model=VideoDetail)
 async def get_video(
     video_id: uuid.UUID,
     controller: VideoController = Depends(get_controller),
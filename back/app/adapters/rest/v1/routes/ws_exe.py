@@ -2,31 +2,66 @@ import uuid
 import json
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
-from app.composites.pair_token_composite import get_controller as get_token_controller
-from app.adapters.rest.v1.controllers.pair_token import PairTokenController
+from app.composites.pair_token_composite import get_controller_scope as get_token_controller_scope
 from app.composites.connection_manager_composite import get_service as get_cm_service
 from app.service.connection_manager import ConnectionManager
+from app.service.client_stream import Subscription
 from app.composites.token_composite import get_service as get_token_service
 from app.service.token_service import TokenService
+from app.composites.cohort_composite import get_aggregator as get_cohort_aggregator
+from app.composites.group_composite import get_service_scope as get_group_service_scope
+from app.service.cohort_aggregator import CohortAggregator
+from app.core.errors import InvalidDataError, NotFoundError
 from app.composites.engagement_composite import (
-    get_service as get_engagement_service,
+    get_service_scope as get_engagement_service_scope,
     get_tracker as get_engagement_tracker,
 )
 from fastapi.encoders import jsonable_encoder
-from app.service.engagement_service import EngagementService
 from app.service.engagement_tracker import EngagementTracker
-from app.core.logger import logger
+from app.core.logger import hot_logger, logger
+from app.composites.ingest_composite import (
+    get_pipeline as get_eeg_pipeline,
+    get_registry as get_ingest_registry,
+)
+from app.service.device_ingest import IngestRegistry
+from app.composites.replay_composite import get_recorder as get_session_recorder
+from app.service.session_recorder import SessionRecorder
+from app.service.eeg_pipeline import EEGPipeline
+from app.core.metrics import (
+    ws_invalid_messages_total,
+    ws_messages_total,
+)
 
 router = APIRouter()
 
+
+def _optional_number(value, cast=float):
+    # echoed fields arrive as numbers or strings depending on the client
+    try:
+        return cast(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+# message types counted by name, anything else is counted as "unknown"
+DEVICE_MESSAGE_TYPES = {"eeg_sample"}
+CLIENT_MESSAGE_TYPES = {
+    "video_start", "video_end", "video_progress", "video_frame", "subscribe", "unsubscribe",
+    "cohort_subscribe", "cohort_unsubscribe",
+}
+
 @router.websocket("/ws/device")
 async def device_ws(
     websocket: WebSocket,
-    controller: PairTokenController = Depends(get_token_controller),
+    controller_scope = Depends(get_token_controller_scope),
     manager: ConnectionManager = Depends(get_cm_service),
-    engagement_tracker: EngagementTracker = Depends(get_engagement_tracker),
+    ingest_registry: IngestRegistry = Depends(get_ingest_registry),
+    pipeline: EEGPipeline = Depends(get_eeg_pipeline),
+    recorder: SessionRecorder | None = Depends(get_session_recorder),
 ):
     logger.debug("Device WS: connection opened from %s", websocket.client)
+    ingest = None
+    recording = None
     await websocket.accept()
 
     try:
@@ -40,7 +75,8 @@ async def device_ws(
         #   "pair_token": "553f6cef-cf9e-4ad6-90ba-f75aaccf4b57"
         # }
         pair_token = first.get("pair_token")
-        pair_token_data = await controller.validate(pair_token)
+        async with controller_scope() as controller:
+            pair_token_data = await controller.validate(pair_token)
 
         if pair_token_data is None:
             logger.debug("Device WS: invalid pair token received")
@@ -49,44 +85,54 @@ async def device_ws(
         user_id = str(pair_token_data.user_id)
 
         await manager.connect_device(user_id, websocket)
+        ingest = ingest_registry.open(
+            user_id, lambda sample: pipeline.process(user_id, sample)
+        )
+        if recorder is not None:
+            recording = recorder.open(user_id)
         logger.debug("Device WS: paired user_id=%s", user_id)
         await websocket.send_json({"type": "paired", "user_id": user_id})
 
         while True:
             data = await websocket.receive_json()
-            logger.debug("Device WS: received raw data for user_id=%s payload=%s", user_id, data)
+            hot_logger.debug("Device WS: received raw data for user_id=%s payload=%s", user_id, data)
             if isinstance(data, str):
                 try:
                     data = json.loads(data)
                 except json.JSONDecodeError:
                     logger.debug("Device WS: invalid json payload from user_id=%s", user_id)
+                    ws_invalid_messages_total.labels("device", "invalid_json").inc()
                     await websocket.send_json({"type": "error", "message": "invalid json payload"})
                     continue
             if not isinstance(data, dict):
                 logger.debug("Device WS: non-dict payload from user_id=%s", user_id)
+                ws_invalid_messages_total.labels("device", "not_object").inc()
                 await websocket.send_json({"type": "error", "message": "invalid payload"})
                 continue
 
             msg_type = data.get("type")
-            logger.debug("Device WS: message type=%s user_id=%s", msg_type, user_id)
+            hot_logger.debug("Device WS: message type=%s user_id=%s", msg_type, user_id)
+            ws_messages_total.labels(
+                "device", msg_type if msg_type in DEVICE_MESSAGE_TYPES else "unknown"
+            ).inc()
 
             if msg_type == "eeg_sample":
                 eeg_data = data.get("data")
                 if not isinstance(eeg_data, dict):
-                    logger.debug("Device WS: missing eeg data user_id=%s payload=%s", user_id, data)
+                    hot_logger.debug("Device WS: missing eeg data user_id=%s payload=%s", user_id, data)
+                    ws_invalid_messages_total.labels("device", "missing_eeg_data").inc()
                     await websocket.send_json({"type": "error", "message": "missing eeg data"})
                     continue
 
-                await manager.send_to_clients(user_id, {
-                    "type": "eeg_sample",
-                    "data": eeg_data
-                })
-                logger.debug("Device WS: forwarded eeg_sample to clients user_id=%s", user_id)
-
-                frame = engagement_tracker.handle_sample(user_id, eeg_data)
-                if frame:
-                    logger.debug("Device WS: engagement spike detected user_id=%s", user_id)
-                    await manager.send_to_clients(user_id, {"type": "request_screenshot"})
+                if recording is not None:
+                    recording.write(eeg_data)
+                if not ingest.offer(eeg_data) and ingest.should_notify_throttle():
+                    hot_logger.debug("Device WS: throttling user_id=%s", user_id)
+                    await websocket.send_json({
+                        "type": "throttle",
+                        "rate_limit": ingest.bucket.rate,
+                        "retry_after": ingest.bucket.time_until_token(),
+                    })
 
     except WebSocketDisconnect:
         logger.debug("Device WS: disconnect for user_id=%s", locals().get("user_id"))
@@ -95,6 +141,11 @@ async def device_ws(
         logger.exception("Device WS: unexpected error for user_id=%s", locals().get("user_id"))
         await manager.disconnect(websocket)
         await websocket.close(code=1011)
+    finally:
+        if ingest is not None:
+            await ingest_registry.close(ingest)
+        if recording is not None:
+            recording.close()
 
 
 @router.websocket("/ws/client")
@@ -103,10 +154,14 @@ async def client_ws(
     token_service: TokenService = Depends(get_token_service),
     manager: ConnectionManager = Depends(get_cm_service),
     engagement_tracker: EngagementTracker = Depends(get_engagement_tracker),
-    engagement_service: EngagementService = Depends(get_engagement_service),
+    engagement_service_scope = Depends(get_engagement_service_scope),
+    group_service_scope = Depends(get_group_service_scope),
+    cohort: CohortAggregator = Depends(get_cohort_aggregator),
 ):
     logger.debug("Client WS: connection opened from %s", websocket.client)
     await websocket.accept()
+    # cohort joined through this socket, left when it drops without video_end
+    cohort_session_id = None
 
     try:
         token = websocket.query_params.get("token")
@@ -125,16 +180,99 @@ async def client_ws(
         while True:
             message = await websocket.receive_json()
             msg_type = message.get("type")
-            logger.debug("Client WS: received message type=%s user_id=%s payload=%s", msg_type, user_id, message)
+            hot_logger.debug("Client WS: received message type=%s user_id=%s payload=%s", msg_type, user_id, message)
+            ws_messages_total.labels(
+                "client", msg_type if msg_type in CLIENT_MESSAGE_TYPES else "unknown"
+            ).inc()
 
             if msg_type == "video_start":
-                engagement_tracker.start_video(user_id)
-                logger.debug("Client WS: video tracking started user_id=%s", user_id)
-                await websocket.send_json({"type": "video_tracking_started"})
+                group_session_id = message.get("group_session_id")
+                if group_session_id is not None:
+                    try:
+                        # canonical form, cohorts and engagements are keyed by it
+                        group_session_id = str(uuid.UUID(str(group_session_id)))
+                        async with group_service_scope() as group_service:
+                            await group_service.get_member_session(
+                                uuid.UUID(user_id), uuid.UUID(group_session_id)
+                            )
+                    except (ValueError, NotFoundError, InvalidDataError) as e:
+                        ws_invalid_messages_total.labels("client", "invalid_group_session").inc()
+                        await websocket.send_json({"type": "error", "message": str(e)})
+                        continue
+                    cohort_session_id = group_session_id
+                    cohort.join(cohort_session_id, user_id)
+                else:
+                    cohort.leave(user_id)
+                    cohort_session_id = None
+                engagement_tracker.start_video(
+                    user_id,
+                    video_id=message.get("video_id"),
+                    timecode=_optional_number(message.get("timecode")),
+                    playing=bool(message.get("playing", True)),
+                    group_session_id=cohort_session_id,
+                )
+                logger.debug(
+                    "Client WS: video tracking started user_id=%s group_session_id=%s",
+                    user_id, group_session_id
+                )
+                await websocket.send_json({
+                    "type": "video_tracking_started",
+                    "group_session_id": group_session_id,
+                })
+            elif msg_type == "video_progress":
+                # playback position for server side frame extraction
+                timecode = _optional_number(message.get("timecode"))
+                if timecode is None:
+                    ws_invalid_messages_total.labels("client", "video_progress_missing_timecode").inc()
+                    await websocket.send_json({"type": "error", "message": "video_progress missing timecode"})
+                    continue
+                engagement_tracker.update_progress(
+                    user_id,
+                    timecode,
+                    playing=bool(message.get("playing", True)),
+                    video_id=message.get("video_id"),
+                )
+                hot_logger.debug("Client WS: video progress user_id=%s timecode=%s", user_id, timecode)
             elif msg_type == "video_end":
                 engagement_tracker.end_video(user_id)
+                cohort.leave(user_id)
+                cohort_session_id = None
                 logger.debug("Client WS: video tracking ended user_id=%s", user_id)
                 await websocket.send_json({"type": "video_tracking_ended"})
+            elif msg_type == "subscribe":
+                try:
+                    subscription = Subscription.from_message(message)
+                except ValueError as e:
+                    ws_invalid_messages_total.labels("client", "invalid_subscription").inc()
+                    await websocket.send_json({"type": "error", "message": str(e)})
+                    continue
+                manager.subscribe(websocket, subscription)
+                logger.debug("Client WS: subscribed user_id=%s %s", user_id, subscription)
+                await websocket.send_json({"type": "subscribed", **subscription.as_dict()})
+            elif msg_type == "unsubscribe":
+                manager.unsubscribe(websocket)
+                await websocket.send_json({"type": "unsubscribed"})
+            elif msg_type == "cohort_subscribe":
+                group_session_id = message.get("group_session_id")
+                try:
+                    group_session_id = str(uuid.UUID(str(group_session_id)))
+                    async with group_service_scope() as group_service:
+                        await group_service.get_organization_session(
+                            uuid.UUID(user_id), uuid.UUID(group_session_id)
+                        )
+                except (ValueError, NotFoundError, InvalidDataError) as e:
+                    ws_invalid_messages_total.labels("client", "invalid_group_session").inc()
+                    await websocket.send_json({"type": "error", "message": str(e)})
+                    continue
+                snapshot = cohort.subscribe(group_session_id, websocket)
+                logger.debug(
+                    "Client WS: cohort subscribed user_id=%s group_session_id=%s",
+                    user_id, group_session_id
+                )
+                await websocket.send_json({"type": "cohort_subscribed", **snapshot})
+            elif msg_type == "cohort_unsubscribe":
+                cohort.unsubscribe(websocket)
+                await websocket.send_json({"type": "cohort_unsubscribed"})
             elif msg_type == "video_frame":
                 timecode_raw = message.get("timecode") or message.get("time_code")
                 video_id_raw = message.get("video_id")
@@ -145,22 +283,32 @@ async def client_ws(
                         "Client WS: video_frame missing fields user_id=%s payload=%s",
                         user_id, message
                     )
+                    ws_invalid_messages_total.labels("client", "video_frame_missing_fields").inc()
                     await websocket.send_json({"type": "error", "message": "video_frame missing fields"})
                     continue
 
                 timecode = str(timecode_raw)
                 video_id = uuid.UUID(video_id_raw)
-                stored = engagement_tracker.attach_video_frame(user_id, timecode, video_id, screenshot_url)
+                stored = engagement_tracker.attach_video_frame(
+                    user_id,
+                    timecode,
+                    video_id,
+                    screenshot_url,
+                    spike_id=_optional_number(message.get("spike_id"), int),
+                    timestamp=_optional_number(message.get("timestamp")),
+                )
                 if stored:
-                    relaxation, concentration = stored
-                    engagement = await engagement_service.create(
-                        user_id=uuid.UUID(user_id),
-                        video_id=video_id,
-                        relaxation=relaxation,
-                        concentration=concentration,
-                        screenshot_url=screenshot_url,
-                        timecode=timecode,
-                    )
+                    relaxation, concentration, group_session_id = stored
+                    async with engagement_service_scope() as engagement_service:
+                        engagement = await engagement_service.create(
+                            user_id=uuid.UUID(user_id),
+                            video_id=video_id,
+                            relaxation=relaxation,
+                            concentration=concentration,
+                            screenshot_url=screenshot_url,
+                            timecode=timecode,
+                            group_session_id=uuid.UUID(group_session_id) if group_session_id else None,
+                        )
                     logger.debug(
                         "Client WS: engagement saved user_id=%s video_id=%s timecode=%s",
                         user_id, video_id, timecode
@@ -177,6 +325,7 @@ async def client_ws(
                     await websocket.send_json({"type": "error", "message": "timecode not pending"})
             else:
                 logger.debug("Client WS: unknown message type user_id=%s payload=%s", user_id, message)
+                ws_invalid_messages_total.labels("client", "unknown_type").inc()
                 await websocket.send_json({"type": "error", "message": "unknown message type"})
 
     except WebSocketDisconnect:
@@ -190,3 +339,8 @@ async def client_ws(
         logger.exception("Client WS: unexpected error for user_id=%s", locals().get("user_id"))
         await manager.disconnect(websocket)
         await websocket.close(code=1011)
+    finally:
+        cohort.unsubscribe(websocket)
+        if cohort_session_id is not None:
+            # another socket of the user may have joined a session since
+            cohort.leave(user_id, cohort_session_id)
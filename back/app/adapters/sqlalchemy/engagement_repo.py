@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import db_operation_seconds, timed
 from app.domains.engagement import CreateEngagement, Engagement
 from app.models.engagement import EngagementModel
 
@@ -10,6 +11,7 @@ class EngagementRepo:
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @timed(db_operation_seconds, "engagement.create")
     async def create(self, create_engagement: CreateEngagement) -> Engagement:
         engagement_model = EngagementModel(**create_engagement.model_dump())
 
@@ -19,6 +21,7 @@ class EngagementRepo:
 
         return Engagement(**engagement_model.as_dict())
 
+    @timed(db_operation_seconds, "engagement.get_all_by_video_id")
     async def get_all_by_video_id(self, video_id: uuid.UUID) -> list[Engagement]:
         stmt = select(EngagementModel).where(EngagementModel.video_id == video_id)
 
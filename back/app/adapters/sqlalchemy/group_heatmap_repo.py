@@ -0,0 +1,126 @@
+import math
+import re
+import uuid
+
+from sqlalchemy import Float, Integer, cast, delete, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import db_operation_seconds, timed
+from app.domains.group import GroupSessionHeatmapBucket
+from app.models.engagement import EngagementModel
+from app.models.group import GroupSessionHeatmapModel
+
+# timecodes are video seconds sent by the dashboard as strings
+TIMECODE_PATTERN = r"^[0-9]+(\.[0-9]+)?$"
+_timecode_re = re.compile(TIMECODE_PATTERN)
+
+HEATMAP_COLUMNS = [
+    "group_session_id",
+    "bucket_start",
+    "engagements",
+    "concentration_sum",
+    "relaxation_sum",
+    "concentration_max",
+]
+
+
+def timecode_bucket(timecode: str | None, bucket_seconds: int) -> int | None:
+    if timecode is None or not _timecode_re.match(timecode):
+        return None
+    seconds = float(timecode)
+    if not math.isfinite(seconds):
+        return None
+    return int(seconds // bucket_seconds) * bucket_seconds
+
+
+class GroupHeatmapRepo:
+    def __init__(self, session: AsyncSession, bucket_seconds: int):
+        self.session = session
+        self.bucket_seconds = bucket_seconds
+
+    def _upsert(self, rows):
+        stmt = insert(GroupSessionHeatmapModel).from_select(HEATMAP_COLUMNS, rows)
+        table = GroupSessionHeatmapModel.__table__
+        return stmt.on_conflict_do_update(
+            index_elements=["group_session_id", "bucket_start"],
+            set_={
+                "engagements": table.c.engagements + stmt.excluded.engagements,
+                "concentration_sum": table.c.concentration_sum + stmt.excluded.concentration_sum,
+                "relaxation_sum": table.c.relaxation_sum + stmt.excluded.relaxation_sum,
+                "concentration_max": func.greatest(
+                    table.c.concentration_max, stmt.excluded.concentration_max
+                ),
+            },
+        )
+
+    @timed(db_operation_seconds, "group_heatmap.add_engagement")
+    async def add_engagement(
+        self,
+        session_id: uuid.UUID,
+        timecode: str | None,
+        concentration: float,
+        relaxation: float | None,
+    ) -> None:
+        """
+        Adds one engagement to the heatmap of the group session it was
+        recorded in. Not committed, the caller commits it together with
+        the engagement.
+        """
+        bucket_start = timecode_bucket(timecode, self.bucket_seconds)
+        if bucket_start is None:
+            return
+
+        rows = select(
+            literal(session_id, GroupSessionHeatmapModel.group_session_id.type),
+            literal(bucket_start, Integer),
+            literal(1, Integer),
+            literal(concentration, Float),
+            literal(relaxation or 0.0, Float),
+            literal(concentration, Float),
+        )
+        await self.session.execute(self._upsert(rows))
+
+    @timed(db_operation_seconds, "group_heatmap.rebuild")
+    async def rebuild(self, session_id: uuid.UUID) -> int:
+        """Recomputes the heatmap of one session from its engagements."""
+        await self.session.execute(
+            delete(GroupSessionHeatmapModel).where(
+                GroupSessionHeatmapModel.group_session_id == session_id
+            )
+        )
+
+        # inlined, a bound parameter would make the GROUP BY expression differ
+        bucket_seconds = literal_column(str(int(self.bucket_seconds)))
+        bucket_start = cast(
+            func.floor(cast(EngagementModel.timecode, Float) / bucket_seconds) * bucket_seconds,
+            Integer,
+        )
+        rows = (
+            select(
+                EngagementModel.group_session_id,
+                bucket_start,
+                func.count(),
+                func.sum(EngagementModel.concentration),
+                func.sum(func.coalesce(EngagementModel.relaxation, 0.0)),
+                func.max(EngagementModel.concentration),
+            )
+            .where(
+                EngagementModel.group_session_id == session_id,
+                EngagementModel.timecode.regexp_match(TIMECODE_PATTERN),
+            )
+            .group_by(EngagementModel.group_session_id, bucket_start)
+        )
+        result = await self.session.execute(self._upsert(rows))
+        await self.session.commit()
+        return result.rowcount
+
+    @timed(db_operation_seconds, "group_heatmap.list_by_session")
+    async def list_by_session(self, session_id: uuid.UUID) -> list[GroupSessionHeatmapBucket]:
+        stmt = (
+            select(GroupSessionHeatmapModel)
+            .where(GroupSessionHeatmapModel.group_session_id == session_id)
+            .order_by(GroupSessionHeatmapModel.bucket_start)
+        )
+        result = await self.session.execute(stmt)
+        return [GroupSessionHeatmapBucket(**m.as_dict()) for m in result.scalars().all()]
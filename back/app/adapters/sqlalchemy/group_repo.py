@@ -25,6 +25,12 @@ class GroupRepo:
         await self.session.refresh(model)
         return Group(**model.as_dict())
 
+    async def get_one_by_id(self, group_id: uuid.UUID) -> Group | None:
+        model = await self.session.get(GroupModel, group_id)
+        if not model:
+            return None
+        return Group(**model.as_dict())
+
     async def list_by_organization(self, organization_id: uuid.UUID) -> List[Group]:
         stmt = select(GroupModel).where(GroupModel.organization_id == organization_id)
         result = await self.session.execute(stmt)
@@ -55,6 +61,10 @@ class GroupRepo:
             joined_at=membership.joined_at,
         )
 
+    async def is_member(self, group_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        membership = await self.session.get(GroupMemberModel, (group_id, user_id))
+        return membership is not None
+
     async def get_members(self, group_id: uuid.UUID) -> List[GroupMember]:
         stmt = (
             select(UserModel, GroupMemberModel.joined_at)
@@ -97,6 +107,26 @@ class GroupRepo:
             created_at=session_model.created_at,
         )
 
+    async def get_session_by_id(self, session_id: uuid.UUID) -> GroupSession | None:
+        stmt = (
+            select(GroupSessionModel, VideoModel)
+            .join(VideoModel, VideoModel.id == GroupSessionModel.video_id)
+            .where(GroupSessionModel.id == session_id)
+        )
+        result = await self.session.execute(stmt)
+        row = result.first()
+        if not row:
+            return None
+        session_model, video = row
+        return GroupSession(
+            id=session_model.id,
+            group_id=session_model.group_id,
+            video_id=session_model.video_id,
+            video_name=session_model.video_name or video.url,
+            video_url=video.url,
+            created_at=session_model.created_at,
+        )
+
     async def list_sessions(self, group_id: uuid.UUID) -> list[GroupSession]:
         stmt = (
             select(GroupSessionModel, VideoModel)
@@ -2,6 +2,7 @@ import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import db_operation_seconds, timed
 from app.models.pair_token import PairTokenModel
 from app.domains.pair_token import CreatePairToken, PairToken
 
@@ -9,6 +10,7 @@ class PairTokenRepo():
     def __init__(self, session: AsyncSession):
         self.session = session
 
+    @timed(db_operation_seconds, "pair_token.create")
     async def create(self, create_pair_token: CreatePairToken) -> PairToken:
         pair_token_model = PairTokenModel(
             **create_pair_token.model_dump(),
@@ -20,6 +22,7 @@ class PairTokenRepo():
 
         return PairTokenModel(**pair_token_model.as_dict())
 
+    @timed(db_operation_seconds, "pair_token.get_one_by_id")
     async def get_one_by_id(self, id: uuid.UUID) -> PairToken | None:
         pair_token_model = await self.session.get(PairTokenModel, id)
         if not pair_token_model:
@@ -1,9 +1,9 @@
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domains.video import CreateVideo, Video
+from app.domains.video import CreateVideo, Video, VideoDetail, VideoIndexUpdate
 from app.models.video import VideoModel
 
 
@@ -20,14 +20,19 @@ class VideoRepo():
 
         return Video(**video_model.as_dict())
 
-    async def get_one_by_id(self, id: uuid.UUID) -> Video | None:
+    async def get_one_by_id(self, id: uuid.UUID) -> VideoDetail | None:
         video_model = await self.session.get(VideoModel, id)
         if not video_model:
             return None
-        return Video(**video_model.as_dict())
+        return VideoDetail(**video_model.as_dict())
 
     async def get_all(self) -> list[Video]:
-        stmt = select(VideoModel)
+        # only the list columns, the keyframe table can be large
+        stmt = select(*(getattr(VideoModel, name) for name in Video.model_fields))
         result = await self.session.execute(stmt)
-        video_models = result.scalars().all()
-        return [Video(**video.as_dict()) for video in video_models]
+        return [Video(**row._mapping) for row in result.all()]
+
+    async def set_index(self, id: uuid.UUID, index: VideoIndexUpdate) -> None:
+        stmt = update(VideoModel).where(VideoModel.id == id).values(**index.model_dump())
+        await self.session.execute(stmt)
+        await self.session.commit()
@@ -9,12 +9,16 @@ from sqlalchemy.exc import IntegrityError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from app.adapters.rest.v1.routes.ws_exe import router as ws_exe_router
+from app.adapters.rest.v1.routes.metrics import router as metrics_router
 
 from app.adapters.rest.v1.errors.base import RestBaseError
 from app.adapters.rest.v1.routes.base import router as v1_router
+from app.composites.replay_composite import replay_service
+from app.composites.video_composite import frame_extractor
 from app.core.config import settings
 from app.core.db import engine
 from app.core.errors import DomainBaseError
+from app.core.logger import stop_logging
 from app.core.exception_handlers import (
     domain_exception_handler,
     http_exception_handler,
@@ -31,6 +35,9 @@ async def lifespan(app: FastAPI):
 
     yield
     # shutdown
+    await replay_service.shutdown()
+    frame_extractor.shutdown()
+    stop_logging()
 
 
 def create_app():
@@ -43,6 +50,7 @@ def create_app():
     # routers
     app.include_router(router=v1_router, prefix="/v1", tags=["v1"])
     app.include_router(router=ws_exe_router)
+    app.include_router(router=metrics_router)
 
     # static files
     upload_dir = Path(settings.UPLOAD_DIR)
@@ -0,0 +1,20 @@
+from app.core.config import settings
+from app.core.metrics import registry
+from app.service.cohort_aggregator import CohortAggregator
+
+cohort_aggregator = CohortAggregator(
+    bucket_seconds=settings.COHORT_BUCKET_SECONDS,
+    publish_rate=settings.COHORT_PUBLISH_RATE,
+    history=settings.COHORT_HISTORY_BUCKETS,
+)
+
+registry.gauge(
+    "cohort_session_members",
+    "Members streaming into a live group session",
+    ["group_session_id"],
+    callback=lambda: {(sid,): s["members"] for sid, s in cohort_aggregator.stats().items()},
+)
+
+
+async def get_aggregator():
+    return cohort_aggregator
@@ -1,12 +1,28 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.sqlalchemy.engagement_repo import EngagementRepo
-from app.core.db import get_session
+from app.adapters.sqlalchemy.group_heatmap_repo import GroupHeatmapRepo
+from app.core.config import settings
+from app.core.db import get_session, session_scope
+from app.core.metrics import registry
 from app.service.engagement_service import EngagementService
 from app.service.engagement_tracker import EngagementTracker
 
-engagement_tracker = EngagementTracker()
+engagement_tracker = EngagementTracker(
+    max_pending=settings.PENDING_FRAME_LIMIT,
+    pending_ttl=settings.PENDING_FRAME_TTL,
+    match_tolerance=settings.FRAME_MATCH_TOLERANCE,
+)
+
+registry.gauge(
+    "engagement_pending_frames",
+    "Spikes waiting for a video frame",
+    callback=lambda: {(): engagement_tracker.pending_count()},
+)
 
 
 async def get_tracker():
@@ -17,5 +33,26 @@ async def get_repo(session: AsyncSession = Depends(get_session)):
     return EngagementRepo(session)
 
 
-async def get_service(repo: EngagementRepo = Depends(get_repo)):
-    return EngagementService(repo)
+async def get_heatmap_repo(session: AsyncSession = Depends(get_session)):
+    return GroupHeatmapRepo(session, settings.HEATMAP_BUCKET_SECONDS)
+
+
+async def get_service(
+    repo: EngagementRepo = Depends(get_repo),
+    heatmap_repo: GroupHeatmapRepo = Depends(get_heatmap_repo),
+):
+    return EngagementService(repo, heatmap_repo)
+
+
+@asynccontextmanager
+async def service_scope() -> AsyncIterator[EngagementService]:
+    # per-operation service for websocket handlers
+    async with session_scope() as session:
+        yield EngagementService(
+            EngagementRepo(session),
+            GroupHeatmapRepo(session, settings.HEATMAP_BUCKET_SECONDS),
+        )
+
+
+async def get_service_scope():
+    return service_scope
@@ -0,0 +1,19 @@
+from app.composites.connection_manager_composite import connection_manager
+from app.composites.engagement_composite import engagement_tracker
+from app.composites.engagement_composite import service_scope as engagement_service_scope
+from app.composites.video_composite import frame_extractor
+from app.composites.video_composite import service_scope as video_service_scope
+from app.core.config import settings
+from app.service.frame_capture import FrameCapture
+
+frame_capture = (
+    FrameCapture(
+        frame_extractor,
+        engagement_tracker,
+        connection_manager,
+        engagement_service_scope,
+        video_service_scope,
+    )
+    if settings.FRAME_EXTRACTION_ENABLED
+    else None
+)
@@ -1,13 +1,20 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.adapters.sqlalchemy.group_heatmap_repo import GroupHeatmapRepo
 from app.adapters.sqlalchemy.group_repo import GroupRepo
 from app.adapters.sqlalchemy.user_repo import UserRepo
 from app.adapters.sqlalchemy.video_repo import VideoRepo
-from app.core.db import get_session
+from app.core.config import settings
+from app.core.db import get_session, session_scope
 from app.service.group_service import GroupService
 from app.adapters.rest.v1.controllers.group import GroupController
 from app.composites.token_composite import get_service as get_token_service
+from app.composites.video_composite import video_indexer
+from app.service.token_service import TokenService
 from app.service.video_service import VideoService
 
 
@@ -22,14 +29,19 @@ async def get_video_repo(session: AsyncSession = Depends(get_session)):
     return VideoRepo(session)
 
 
+async def get_heatmap_repo(session: AsyncSession = Depends(get_session)):
+    return GroupHeatmapRepo(session, settings.HEATMAP_BUCKET_SECONDS)
+
+
 async def get_service(
     group_repo: GroupRepo = Depends(get_group_repo),
     user_repo: UserRepo = Depends(get_user_repo),
     video_repo: VideoRepo = Depends(get_video_repo),
+    heatmap_repo: GroupHeatmapRepo = Depends(get_heatmap_repo),
     token_service = Depends(get_token_service),
 ):
-    video_service = VideoService(video_repo)
-    return GroupService(group_repo, user_repo, video_service, token_service)
+    video_service = VideoService(video_repo, video_indexer)
+    return GroupService(group_repo, user_repo, video_service, token_service, heatmap_repo)
 
 
 async def get_controller(
@@ -37,3 +49,20 @@ async def get_controller(
 ):
     return GroupController(service)
 
+
+
+@asynccontextmanager
+async def service_scope() -> AsyncIterator[GroupService]:
+    # per-operation service for websocket handlers
+    async with session_scope() as session:
+        yield GroupService(
+            GroupRepo(session),
+            UserRepo(session),
+            VideoService(VideoRepo(session), video_indexer),
+            TokenService(),
+            GroupHeatmapRepo(session, settings.HEATMAP_BUCKET_SECONDS),
+        )
+
+
+async def get_service_scope():
+    return service_scope
@@ -0,0 +1,38 @@
+from app.composites.cohort_composite import cohort_aggregator
+from app.composites.connection_manager_composite import connection_manager
+from app.composites.engagement_composite import engagement_tracker
+from app.composites.frame_composite import frame_capture
+from app.core.config import settings
+from app.core.metrics import registry
+from app.service.device_ingest import IngestRegistry
+from app.service.eeg_pipeline import EEGPipeline
+
+ingest_registry = IngestRegistry(
+    rate=settings.DEVICE_RATE_LIMIT,
+    burst=settings.DEVICE_RATE_BURST,
+    queue_size=settings.DEVICE_QUEUE_SIZE,
+)
+eeg_pipeline = EEGPipeline(
+    connection_manager, engagement_tracker, cohort_aggregator, frame_capture
+)
+
+registry.gauge(
+    "device_ingest_queue_depth",
+    "Samples waiting in the per-device ingest queue",
+    ["user_id"],
+    callback=lambda: {(uid,): s["queue_depth"] for uid, s in ingest_registry.stats().items()},
+)
+registry.gauge(
+    "device_ingest_received_rate",
+    "Samples per second received from each device",
+    ["user_id"],
+    callback=lambda: {(uid,): s["received_rate"] for uid, s in ingest_registry.stats().items()},
+)
+
+
+async def get_registry():
+    return ingest_registry
+
+
+async def get_pipeline():
+    return eeg_pipeline
@@ -1,6 +1,9 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.db import get_session
+from app.core.db import get_session, session_scope
 from app.adapters.sqlalchemy.pair_token_repo import PairTokenRepo
 from app.adapters.rest.v1.controllers.pair_token import PairTokenController
 from app.service.pair_token_service import PairTokenService
@@ -15,4 +18,16 @@ async def get_service(repo: PairTokenRepo = Depends(get_repo), token_service: To
     return PairTokenService(repo, token_service)
 
 async def get_controller(service: PairTokenService = Depends(get_service)):
-    return PairTokenController(service)
\ No newline at end of file
+    return PairTokenController(service)
+
+
+@asynccontextmanager
+async def controller_scope() -> AsyncIterator[PairTokenController]:
+    # per-operation controller for websocket handlers
+    async with session_scope() as session:
+        service = PairTokenService(PairTokenRepo(session), TokenService())
+        yield PairTokenController(service)
+
+
+async def get_controller_scope():
+    return controller_scope
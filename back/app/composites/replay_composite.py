@@ -0,0 +1,39 @@
+from fastapi import Depends
+
+from app.adapters.rest.v1.controllers.replay import ReplayController
+from app.composites.ingest_composite import eeg_pipeline, ingest_registry
+from app.composites.token_composite import get_service as get_token_service
+from app.core.config import settings
+from app.core.metrics import registry
+from app.service.session_recorder import SessionRecorder
+from app.service.session_replay import ReplayService
+from app.service.token_service import TokenService
+
+session_recorder = SessionRecorder(settings.RECORDINGS_DIR) if settings.RECORD_DEVICE_SESSIONS else None
+replay_service = ReplayService(
+    settings.RECORDINGS_DIR,
+    ingest_registry,
+    eeg_pipeline,
+    settings.RECORDING_MAX_UPLOAD_BYTES,
+)
+
+registry.gauge(
+    "session_replay_rate",
+    "Samples per second sent by all running replays",
+    callback=lambda: {(): sum(s["rate"] for s in replay_service.stats().values() if s["status"] == "running")},
+)
+
+
+async def get_recorder():
+    return session_recorder
+
+
+async def get_service():
+    return replay_service
+
+
+async def get_controller(
+    service: ReplayService = Depends(get_service),
+    token_service: TokenService = Depends(get_token_service),
+):
+    return ReplayController(service, token_service)
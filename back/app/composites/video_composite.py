@@ -1,19 +1,60 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.rest.v1.controllers.video import VideoController
 from app.adapters.sqlalchemy.video_repo import VideoRepo
-from app.core.db import get_session
+from app.core.config import settings
+from app.core.db import get_session, session_scope
+from app.service.frame_extractor import FrameExtractor
+from app.service.video_indexer import VideoIndexer
 from app.service.video_service import VideoService
 
 
+@asynccontextmanager
+async def repo_scope() -> AsyncIterator[VideoRepo]:
+    # per-operation repo for background tasks
+    async with session_scope() as session:
+        yield VideoRepo(session)
+
+
+# one limit on concurrent ffmpeg jobs for the whole app
+frame_extractor = FrameExtractor(
+    upload_dir=settings.UPLOAD_DIR,
+    ffmpeg_bin=settings.FFMPEG_BIN,
+    ffprobe_bin=settings.FFPROBE_BIN,
+    max_workers=settings.FRAME_EXTRACTION_WORKERS,
+    keyframe_snap=settings.FRAME_KEYFRAME_SNAP,
+)
+video_indexer = (
+    VideoIndexer(
+        frame_extractor,
+        repo_scope,
+        sprite_interval=settings.VIDEO_SPRITE_INTERVAL,
+        sprite_columns=settings.VIDEO_SPRITE_COLUMNS,
+        sprite_tile_width=settings.VIDEO_SPRITE_TILE_WIDTH,
+    )
+    if settings.VIDEO_INDEX_ENABLED
+    else None
+)
+
+
 async def get_repo(session: AsyncSession = Depends(get_session)):
     return VideoRepo(session)
 
 
 async def get_service(repo: VideoRepo = Depends(get_repo)):
-    return VideoService(repo)
+    return VideoService(repo, video_indexer)
 
 
 async def get_controller(service: VideoService = Depends(get_service)):
     return VideoController(service)
+
+
+@asynccontextmanager
+async def service_scope() -> AsyncIterator[VideoService]:
+    # per-operation service outside of a request
+    async with session_scope() as session:
+        yield VideoService(VideoRepo(session), video_indexer)
@@ -1,4 +1,3 @@
-from fastapi.templating import Jinja2Templates
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -20,10 +19,49 @@ class Settings(BaseSettings):
     DB_PWD: str
     DB_NAME: str
 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_MIGRATE_ON_STARTUP: bool = True
+
     AGENT_HOST: str
 
     UPLOAD_DIR: str = "uploads"
 
+    DEVICE_RATE_LIMIT: float = 20
+    DEVICE_RATE_BURST: int = 40
+    DEVICE_QUEUE_SIZE: int = 64
+    WS_PER_MESSAGE_DEFLATE: bool = True
+    COHORT_BUCKET_SECONDS: float = 1
+    COHORT_PUBLISH_RATE: float = 2
+    COHORT_HISTORY_BUCKETS: int = 300
+    HEATMAP_BUCKET_SECONDS: int = 5
+    PENDING_FRAME_LIMIT: int = 32
+    PENDING_FRAME_TTL: float = 10
+    FRAME_MATCH_TOLERANCE: float = 1
+
+    FRAME_EXTRACTION_ENABLED: bool = True
+    FFMPEG_BIN: str = "ffmpeg"
+    FFPROBE_BIN: str = "ffprobe"
+    FRAME_EXTRACTION_WORKERS: int = 2
+    FRAME_KEYFRAME_SNAP: float = 0
+    VIDEO_INDEX_ENABLED: bool = True
+    VIDEO_SPRITE_INTERVAL: float = 5
+    VIDEO_SPRITE_COLUMNS: int = 10
+    VIDEO_SPRITE_TILE_WIDTH: int = 160
+
+    RECORD_DEVICE_SESSIONS: bool = False
+    RECORDINGS_DIR: str = "recordings"
+    RECORDING_MAX_UPLOAD_BYTES: int = 16 * 1024 * 1024
+
+    LOG_LEVEL: str | None = None
+    LOG_FORMAT: str = "console"
+    LOG_HOT_PATH_RATE: float = 5
+    METRICS_TOKEN: str | None = None
+
     @property
     def DATABASE_URL_asyncpg(self):
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PWD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
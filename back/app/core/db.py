@@ -1,5 +1,8 @@
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -9,7 +12,19 @@ from sqlalchemy.ext.asyncio import (
 
 from app.core.config import settings
 
-engine: AsyncEngine = create_async_engine(url=settings.DATABASE_URL_asyncpg)
+# asyncpg prepared statement cache is configured through the url query
+db_url = make_url(settings.DATABASE_URL_asyncpg).update_query_dict(
+    {"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)}
+)
+
+engine: AsyncEngine = create_async_engine(
+    url=db_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
 
 async_session = async_sessionmaker(
     bind=engine,
@@ -18,6 +33,55 @@ async_session = async_sessionmaker(
 )
 
 
+class PoolStats:
+    """
+    Counts pool checkouts so saturation can be seen without a profiler.
+    """
+
+    def __init__(self):
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.total_checkouts = 0
+
+    def on_checkout(self, *args):
+        self.checked_out += 1
+        self.total_checkouts += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def on_checkin(self, *args):
+        self.checked_out = max(self.checked_out - 1, 0)
+
+
+pool_stats = PoolStats()
+event.listen(engine.sync_engine, "checkout", pool_stats.on_checkout)
+event.listen(engine.sync_engine, "checkin", pool_stats.on_checkin)
+
+
+def get_pool_status() -> dict:
+    pool = engine.pool
+    capacity = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),  # type: ignore[attr-defined]
+        "checked_out": pool_stats.checked_out,
+        "overflow": max(pool.overflow(), 0),  # type: ignore[attr-defined]
+        "peak_checked_out": pool_stats.peak_checked_out,
+        "total_checkouts": pool_stats.total_checkouts,
+        "saturation": pool_stats.checked_out / capacity if capacity else 0.0,
+    }
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
         yield session
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Borrow a session for a single operation. Long-lived handlers
+    (websockets) use this instead of holding a connection for hours.
+    """
+    async with async_session() as session:
+        yield session
@@ -1,25 +1,122 @@
+import atexit
+import datetime
+import json
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 
 from colorlog import ColoredFormatter
 
 from app.core.config import settings
 
+# attributes every LogRecord has, anything else came in through `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(
+                record.created, datetime.timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Lets through at most `rate` records per second for every message
+    template, the rest are counted and reported on the next record.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.windows: dict[str, tuple[int, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        window = int(time.monotonic())
+        key = str(record.msg)
+        current, passed, suppressed = self.windows.get(key, (window, 0, 0))
+        if current != window:
+            passed = 0
+        if passed >= self.rate:
+            self.windows[key] = (window, passed, suppressed + 1)
+            return False
+        if suppressed:
+            record.suppressed = suppressed
+        self.windows[key] = (window, passed + 1, 0)
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues records with the message rendered but the exception kept. The
+    stock prepare() also formats the record and drops exc_info, so the
+    formatter in the listener thread could not render the traceback. The
+    message is still rendered here: args may be payload dicts the caller
+    keeps mutating.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _build_formatter() -> logging.Formatter:
+    if settings.LOG_FORMAT == "json":
+        return JsonFormatter()
+    return ColoredFormatter(
+        "%(log_color)s%(levelname)s:%(reset)s     %(message)s",
+        log_colors={
+            "DEBUG": "cyan",
+            "INFO": "light_green",
+            "WARNING": "yellow",
+            "ERROR": "red",
+            "CRITICAL": "bold_red",
+        },
+        reset=True,
+    )
+
+
 logger = logging.getLogger("app")
-logger.setLevel(logging.DEBUG if settings.NODE_ENV != "production" else logging.INFO)
-
-formatter = ColoredFormatter(
-    "%(log_color)s%(levelname)s:%(reset)s     %(message)s",
-    log_colors={
-        "DEBUG": "cyan",
-        "INFO": "light_green",
-        "WARNING": "yellow",
-        "ERROR": "red",
-        "CRITICAL": "bold_red",
-    },
-    reset=True,
+logger.setLevel(
+    (settings.LOG_LEVEL and settings.LOG_LEVEL.upper())
+    or (logging.DEBUG if settings.NODE_ENV != "production" else logging.INFO)
 )
 
+# per-message events (every EEG sample) go through a sampled child logger
+hot_logger = logging.getLogger("app.hot")
+hot_logger.addFilter(SamplingFilter(settings.LOG_HOT_PATH_RATE))
+
 console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+console_handler.setFormatter(_build_formatter())
+
+# the event loop only enqueues records, a background thread writes them
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+queue_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+logger.addHandler(DeferredQueueHandler(log_queue))
+queue_listener.start()
+_listening = True
+
+
+def stop_logging():
+    # flushes queued records, safe to call more than once
+    global _listening
+    if _listening:
+        _listening = False
+        queue_listener.stop()
+
+
+atexit.register(stop_logging)
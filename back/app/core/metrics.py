@@ -0,0 +1,303 @@
+import bisect
+import functools
+import math
+import time
+from typing import Callable, Iterable
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = self._new_child()
+        return child
+
+    def remove(self, *values: str):
+        self._children.pop(tuple(str(v) for v in values), None)
+
+    def _default(self):
+        return self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def collect(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in list(self._children.items()):
+            lines.extend(self._render(key, child))
+        return lines
+
+    def _render(self, key, child) -> list[str]:
+        labels = _format_labels(self.labelnames, key)
+        return [f"{self.name}{labels} {_format_value(child.value)}"]
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Callable[[], dict[tuple[str, ...], float]] | None = None, **kwargs):
+        """
+        `callback` is evaluated at scrape time and returns label values
+        mapped to the gauge value, for state that lives elsewhere.
+        """
+        super().__init__(*args, **kwargs)
+        self.callback = callback
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default().dec(amount)
+
+    def collect(self) -> list[str]:
+        if self.callback is not None:
+            self._children = {}
+            for key, value in self.callback().items():
+                self.labels(*key).set(value)
+        return super().collect()
+
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum", "count")
+
+    def __init__(self, upper_bounds: tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * len(upper_bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.upper_bounds, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Bucket upper bound that covers the q-quantile, for quick reports."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.upper_bounds, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return math.inf
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def _render(self, key, child: _HistogramValue) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(child.upper_bounds, child.counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+        lines.append(f"{self.name}_bucket{labels} {child.count}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(child.sum)}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback=callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in list(self.metrics.values()):
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _pool_status():
+    # imported lazily so this module stays free of the db engine
+    from app.core.db import get_pool_status
+
+    status = get_pool_status()
+    return {
+        ("checked_out",): status["checked_out"],
+        ("checked_in",): status["checked_in"],
+        ("overflow",): status["overflow"],
+        ("peak_checked_out",): status["peak_checked_out"],
+    }
+
+
+ws_connections = registry.gauge(
+    "ws_connections", "Open websocket connections", ["kind"]
+)
+ws_messages_total = registry.counter(
+    "ws_messages_total", "Websocket messages received", ["kind", "type"]
+)
+ws_invalid_messages_total = registry.counter(
+    "ws_invalid_messages_total", "Websocket messages rejected as invalid", ["kind", "reason"]
+)
+ws_dropped_messages_total = registry.counter(
+    "ws_dropped_messages_total", "Messages dropped before delivery", ["reason"]
+)
+# the per-device rate is device_ingest_received_rate, a scrape-time gauge
+# over the connected devices only (app/composites/ingest_composite.py)
+eeg_samples_total = registry.counter(
+    "eeg_samples_total",
+    "EEG samples received from all devices, see device_ingest_received_rate per device",
+)
+engagement_spikes_total = registry.counter(
+    "engagement_spikes_total", "Engagement spikes detected"
+)
+send_to_clients_seconds = registry.histogram(
+    "send_to_clients_seconds", "Time to fan a message out to all client sockets of a user"
+)
+client_stream_bytes_total = registry.counter(
+    "client_stream_bytes_total", "Bytes sent through subscribed client streams", ["encoding"]
+)
+client_send_errors_total = registry.counter(
+    "client_send_errors_total", "Failed sends to client sockets"
+)
+handle_sample_seconds = registry.histogram(
+    "engagement_handle_sample_seconds",
+    "Time spent in EngagementTracker.handle_sample",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+)
+device_to_client_latency_seconds = registry.histogram(
+    "eeg_device_to_client_latency_seconds",
+    "Time from the eeg_sample timestamp set by the device to the fan-out to clients",
+)
+db_operation_seconds = registry.histogram(
+    "db_operation_seconds", "Repository call duration", ["operation"]
+)
+db_pool = registry.gauge(
+    "db_pool_connections", "Database pool connections by state", ["state"], callback=_pool_status
+)
+
+
+def timed(histogram: Histogram, *label_values: str):
+    """Decorator observing the duration of an async function."""
+
+    def decorator(func):
+        child = histogram.labels(*label_values)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def sample_timestamp(data: dict) -> float | None:
+    """
+    Device timestamp of an eeg_sample in unix seconds. Milliseconds are
+    accepted too, as browsers and some devices send Date.now().
+    """
+    value = data.get("timestamp")
+    if not isinstance(value, (int, float)) or value <= 0:
+        return None
+    return value / 1000 if value > 1e11 else float(value)
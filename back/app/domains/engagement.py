@@ -11,6 +11,7 @@ class Engagement(BaseModel):
     concentration: float
     screenshot_url: str
     timecode: str | None = None
+    group_session_id: uuid.UUID | None = None
 
 
 class CreateEngagement(BaseModel):
@@ -20,3 +21,4 @@ class CreateEngagement(BaseModel):
     concentration: float
     screenshot_url: str
     timecode: str | None = None
+    group_session_id: uuid.UUID | None = None
@@ -32,6 +32,14 @@ class GroupSession(BaseModel):
     created_at: datetime.datetime
 
 
+class GroupSessionHeatmapBucket(BaseModel):
+    bucket_start: int
+    engagements: int
+    mean_concentration: float
+    mean_relaxation: float
+    max_concentration: float
+
+
 class GroupWithMembers(Group):
     members: list[GroupMember]
     sessions: list[GroupSession] = []
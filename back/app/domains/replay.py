@@ -0,0 +1,40 @@
+import datetime
+import uuid
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class Recording(BaseModel):
+    name: str
+    size: int
+    modified_at: datetime.datetime
+
+
+class StartReplay(BaseModel):
+    recording: str
+    # 1 is real time, 0 is as fast as the pipeline goes
+    speed: float = Field(default=1.0, ge=0)
+    loop: bool = False
+
+    @model_validator(mode="after")
+    def check_loop(self):
+        # max speed bypasses DeviceIngest rate limiting, it must end
+        if self.loop and self.speed == 0:
+            raise ValueError("loop is not allowed with speed 0")
+        return self
+
+
+class Replay(BaseModel):
+    id: uuid.UUID
+    user_id: uuid.UUID
+    recording: str
+    speed: float
+    loop: bool
+    status: str
+    samples: int
+    sent: int
+    elapsed: float
+    rate: float
+    started_at: datetime.datetime
+    finished_at: datetime.datetime | None = None
+    error: str | None = None
@@ -6,7 +6,22 @@ from pydantic import BaseModel
 class Video(BaseModel):
     id: uuid.UUID
     url: str
+    index_status: str = "pending"
+    duration: float | None = None
+    sprite: dict | None = None
+
+
+class VideoDetail(Video):
+    # keyframe table, only returned for a single video
+    keyframes: list[float] | None = None
 
 
 class CreateVideo(BaseModel):
     url: str
+
+
+class VideoIndexUpdate(BaseModel):
+    index_status: str
+    duration: float | None = None
+    keyframes: list[float] | None = None
+    sprite: dict | None = None
@@ -7,7 +7,7 @@ from app.models.pair_token import PairTokenModel
 from app.models.video import VideoModel
 from app.models.engagement import EngagementModel
 from app.models.organization import OrganizationModel
-from app.models.group import GroupModel, GroupMemberModel, GroupSessionModel
+from app.models.group import GroupModel, GroupMemberModel, GroupSessionModel, GroupSessionHeatmapModel
 from app.models.history import HistoryModel
 
 __all__ = [
@@ -20,5 +20,6 @@ __all__ = [
     "GroupModel",
     "GroupMemberModel",
     "GroupSessionModel",
+    "GroupSessionHeatmapModel",
     "HistoryModel",
 ]
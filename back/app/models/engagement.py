@@ -24,7 +24,7 @@ class EngagementModel(Base):
     )
 
     video_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False
+        UUID(as_uuid=True), ForeignKey("videos.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     relaxation: Mapped[float] = mapped_column(Float, nullable=False)
@@ -35,6 +35,13 @@ class EngagementModel(Base):
 
     timecode: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
+    group_session_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("group_sessions.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
     def as_dict(self):
         return {
             "id": str(self.id),
@@ -44,4 +51,5 @@ class EngagementModel(Base):
             "concentration": self.concentration,
             "screenshot_url": self.screenshot_url,
             "timecode": self.timecode,
+            "group_session_id": str(self.group_session_id) if self.group_session_id else None,
         }
@@ -1,7 +1,7 @@
 import datetime
 import uuid
 
-from sqlalchemy import String, text, ForeignKey, UniqueConstraint
+from sqlalchemy import Float, Integer, String, text, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -89,6 +89,7 @@ class GroupSessionModel(Base):
         UUID(as_uuid=True),
         ForeignKey("videos.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     video_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     created_at: Mapped[datetime.datetime] = mapped_column(
@@ -104,3 +105,34 @@ class GroupSessionModel(Base):
             "created_at": self.created_at,
         }
 
+
+
+class GroupSessionHeatmapModel(Base):
+    """
+    Engagement of the group members per timecode bucket of a session,
+    kept up to date as engagements are saved.
+    """
+
+    __tablename__ = "group_session_heatmap"
+
+    group_session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("group_sessions.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    bucket_start: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    engagements: Mapped[int] = mapped_column(Integer, nullable=False)
+    concentration_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    relaxation_sum: Mapped[float] = mapped_column(Float, nullable=False)
+    concentration_max: Mapped[float] = mapped_column(Float, nullable=False)
+
+    def as_dict(self):
+        return {
+            "group_session_id": str(self.group_session_id),
+            "bucket_start": self.bucket_start,
+            "engagements": self.engagements,
+            "mean_concentration": self.concentration_sum / self.engagements,
+            "mean_relaxation": self.relaxation_sum / self.engagements,
+            "max_concentration": self.concentration_max,
+        }
@@ -1,7 +1,7 @@
 import uuid
 
-from sqlalchemy import String, text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Float, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from . import Base
@@ -19,8 +19,20 @@ class VideoModel(Base):
 
     url: Mapped[str] = mapped_column(String(255), nullable=False)
 
+    # filled in by VideoIndexer after the upload
+    index_status: Mapped[str] = mapped_column(
+        String(16), server_default=text("'pending'"), nullable=False
+    )
+    duration: Mapped[float | None] = mapped_column(Float, nullable=True)
+    keyframes: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    sprite: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+
     def as_dict(self):
         return {
             "id": str(self.id),
             "url": self.url,
+            "index_status": self.index_status,
+            "duration": self.duration,
+            "keyframes": self.keyframes,
+            "sprite": self.sprite,
         }
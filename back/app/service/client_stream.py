@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque
+
+from fastapi import WebSocket
+
+from app.core.metrics import (
+    client_send_errors_total,
+    client_stream_bytes_total,
+    ws_dropped_messages_total,
+)
+from app.service.delta_encoder import DeltaEncoder
+
+STREAM_MODES = ("latest", "batch")
+STREAM_ENCODINGS = ("json", "delta")
+MAX_BATCH_SIZE = 256
+
+
+@dataclass
+class Subscription:
+    channels: frozenset[str] | None = None
+    metrics: frozenset[str] | None = None
+    max_rate: float | None = None
+    mode: str = "latest"
+    encoding: str = "json"
+    precision: int | None = None
+
+    @classmethod
+    def from_message(cls, message: dict) -> "Subscription":
+        channels = message.get("channels")
+        metrics = message.get("metrics")
+        max_rate = message.get("max_rate")
+        mode = message.get("mode", "latest")
+        encoding = message.get("encoding", "json")
+        precision = message.get("precision")
+
+        if channels is not None and not (
+            isinstance(channels, list) and all(isinstance(c, str) for c in channels)
+        ):
+            raise ValueError("channels must be a list of strings")
+        if metrics is not None and not (
+            isinstance(metrics, list) and all(isinstance(m, str) for m in metrics)
+        ):
+            raise ValueError("metrics must be a list of strings")
+        if max_rate is not None and (
+            not isinstance(max_rate, (int, float)) or max_rate <= 0
+        ):
+            raise ValueError("max_rate must be a positive number")
+        if mode not in STREAM_MODES:
+            raise ValueError(f"mode must be one of {', '.join(STREAM_MODES)}")
+        if encoding not in STREAM_ENCODINGS:
+            raise ValueError(f"encoding must be one of {', '.join(STREAM_ENCODINGS)}")
+        if precision is not None and (
+            not isinstance(precision, int) or not 0 <= precision <= 10
+        ):
+            raise ValueError("precision must be an integer between 0 and 10")
+
+        return cls(
+            channels=frozenset(channels) if channels is not None else None,
+            metrics=frozenset(metrics) if metrics is not None else None,
+            max_rate=float(max_rate) if max_rate is not None else None,
+            mode=mode,
+            encoding=encoding,
+            precision=precision,
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "channels": sorted(self.channels) if self.channels is not None else None,
+            "metrics": sorted(self.metrics) if self.metrics is not None else None,
+            "max_rate": self.max_rate,
+            "mode": self.mode,
+            "encoding": self.encoding,
+            "precision": self.precision,
+        }
+
+    def filter(self, sample: dict) -> dict:
+        if self.channels is None and self.metrics is None:
+            return sample
+        filtered = {key: value for key, value in sample.items() if key != "channels"}
+        channels = {}
+        for name, values in (sample.get("channels") or {}).items():
+            if self.channels is not None and name not in self.channels:
+                continue
+            if self.metrics is not None and isinstance(values, dict):
+                values = {k: v for k, v in values.items() if k in self.metrics}
+            channels[name] = values
+        filtered["channels"] = channels
+        return filtered
+
+
+class ClientStream:
+    """
+    Delivers eeg samples to one dashboard socket according to its
+    subscription. With a max_rate, samples are coalesced into the latest
+    state or batched, and at most one frame is sent per interval. The delta
+    encoding replaces eeg_sample with eeg_keyframe/eeg_delta frames.
+    """
+
+    def __init__(self, websocket: WebSocket, subscription: Subscription):
+        self.websocket = websocket
+        self.subscription = subscription
+        self.encoder = (
+            DeltaEncoder(precision=subscription.precision)
+            if subscription.encoding == "delta"
+            else None
+        )
+        self.bytes_sent = 0
+        self.frames_sent = 0
+        self.started_at = time.monotonic()
+        self.latest: dict | None = None
+        self.batch: Deque[dict] = deque(maxlen=MAX_BATCH_SIZE)
+        self.ready = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        if subscription.max_rate is not None:
+            self.task = asyncio.create_task(self._run(1 / subscription.max_rate))
+
+    async def push(self, sample: dict):
+        data = self.subscription.filter(sample)
+        if self.task is None:
+            await self._send(self._frame(data))
+            return
+
+        if self.subscription.mode == "batch":
+            if len(self.batch) == self.batch.maxlen:
+                ws_dropped_messages_total.labels("client_batch_full").inc()
+            self.batch.append(data)
+        else:
+            if self.latest is not None:
+                ws_dropped_messages_total.labels("client_coalesced").inc()
+            self.latest = data
+        self.ready.set()
+
+    def close(self):
+        if self.task is not None:
+            self.task.cancel()
+
+    async def _run(self, interval: float):
+        while True:
+            await self.ready.wait()
+            self.ready.clear()
+            await self._flush()
+            await asyncio.sleep(interval)
+
+    async def _flush(self):
+        if self.subscription.mode == "batch":
+            if not self.batch:
+                return
+            samples = list(self.batch)
+            self.batch.clear()
+            if self.encoder is not None:
+                samples = [self.encoder.encode(sample) for sample in samples]
+            await self._send({"type": "eeg_batch", "data": samples})
+        elif self.latest is not None:
+            data, self.latest = self.latest, None
+            await self._send(self._frame(data))
+
+    def _frame(self, data: dict) -> dict:
+        if self.encoder is not None:
+            return self.encoder.encode(data)
+        return {"type": "eeg_sample", "data": data}
+
+    async def _send(self, message: dict):
+        text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        try:
+            await self.websocket.send_text(text)
+        except Exception:
+            client_send_errors_total.inc()
+            if self.encoder is not None:
+                # the client missed a delta, start over from a keyframe
+                self.encoder.keys = []
+            return
+        self.bytes_sent += len(text)
+        self.frames_sent += 1
+        client_stream_bytes_total.labels(self.subscription.encoding).inc(len(text))
+
+    def stats(self) -> dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "frames_sent": self.frames_sent,
+            "bytes_sent": self.bytes_sent,
+            "bytes_per_second": self.bytes_sent / elapsed,
+            **self.subscription.as_dict(),
+        }
@@ -0,0 +1,211 @@
+import asyncio
+import bisect
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque
+
+from fastapi import WebSocket
+
+from app.core.logger import logger
+from app.core.metrics import client_send_errors_total, ws_dropped_messages_total
+
+
+@dataclass
+class CohortBucket:
+    """
+    Group statistics of one time bucket, updated per sample. Every member
+    counts once per bucket with its latest values; a member that spiked at
+    any point of the bucket counts as spiking.
+    """
+
+    start: float
+    concentration: dict[str, float] = field(default_factory=dict)
+    relaxation: dict[str, float] = field(default_factory=dict)
+    spiking: set[str] = field(default_factory=set)
+    ordered: list[float] = field(default_factory=list)
+    concentration_total: float = 0.0
+    relaxation_total: float = 0.0
+
+    def update(self, user_id: str, concentration: float, relaxation: float, spiked: bool):
+        previous = self.concentration.get(user_id)
+        if previous is not None:
+            del self.ordered[bisect.bisect_left(self.ordered, previous)]
+            self.concentration_total -= previous
+            self.relaxation_total -= self.relaxation[user_id]
+        bisect.insort(self.ordered, concentration)
+        self.concentration[user_id] = concentration
+        self.relaxation[user_id] = relaxation
+        self.concentration_total += concentration
+        self.relaxation_total += relaxation
+        if spiked:
+            self.spiking.add(user_id)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.ordered:
+            return None
+        return self.ordered[min(int(q * len(self.ordered)), len(self.ordered) - 1)]
+
+    def as_dict(self) -> dict:
+        members = len(self.concentration)
+        return {
+            "start": self.start,
+            "members": members,
+            "mean_concentration": self.concentration_total / members if members else None,
+            "mean_relaxation": self.relaxation_total / members if members else None,
+            "p10_concentration": self.quantile(0.1),
+            "p50_concentration": self.quantile(0.5),
+            "p90_concentration": self.quantile(0.9),
+            "spiking_fraction": len(self.spiking) / members if members else 0.0,
+        }
+
+
+@dataclass
+class CohortSession:
+    session_id: str
+    history: int
+    members: set[str] = field(default_factory=set)
+    subscribers: set[WebSocket] = field(default_factory=set)
+    buckets: Deque[CohortBucket] = field(default_factory=deque)
+    dirty: dict[float, CohortBucket] = field(default_factory=dict)
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+
+    def bucket(self, start: float) -> CohortBucket | None:
+        if not self.buckets or self.buckets[-1].start < start:
+            self.buckets.append(CohortBucket(start))
+            if len(self.buckets) > self.history:
+                self.buckets.popleft()
+            return self.buckets[-1]
+        # late sample, look back from the newest bucket
+        for bucket in reversed(self.buckets):
+            if bucket.start == start:
+                return bucket
+            if bucket.start < start:
+                break
+        return None
+
+
+class CohortAggregator:
+    """
+    Live engagement of every member watching a group session. Samples of
+    the members update per-bucket statistics in place, and organization
+    clients receive the changed buckets of a session as one coalesced
+    `cohort_stats` message at most `publish_rate` times per second.
+    """
+
+    def __init__(self, bucket_seconds: float = 1.0, publish_rate: float = 2.0, history: int = 300):
+        self.bucket_seconds = bucket_seconds
+        self.publish_interval = 1 / publish_rate
+        self.history = history
+        self.sessions: dict[str, CohortSession] = {}
+        self.user_sessions: dict[str, str] = {}  # member user_id -> session_id
+        self.subscriber_sessions: dict[WebSocket, str] = {}
+
+    def _session(self, session_id: str) -> CohortSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = self.sessions[session_id] = CohortSession(session_id, self.history)
+        return session
+
+    def _release(self, session: CohortSession):
+        if session.members or session.subscribers:
+            return
+        if session.task is not None:
+            session.task.cancel()
+        self.sessions.pop(session.session_id, None)
+
+    def join(self, session_id: str, user_id: str):
+        self.leave(user_id)
+        self._session(session_id).members.add(user_id)
+        self.user_sessions[user_id] = session_id
+
+    def leave(self, user_id: str, session_id: str | None = None):
+        """With `session_id`, only if the user is still in that session."""
+        if session_id is not None and self.user_sessions.get(user_id) != session_id:
+            return
+        session_id = self.user_sessions.pop(user_id, None)
+        session = self.sessions.get(session_id) if session_id else None
+        if session is not None:
+            session.members.discard(user_id)
+            self._release(session)
+
+    def record(self, user_id: str, concentration: float, relaxation: float, spiked: bool, timestamp: float):
+        session_id = self.user_sessions.get(user_id)
+        if session_id is None:
+            return
+        session = self.sessions[session_id]
+        start = timestamp - timestamp % self.bucket_seconds
+        bucket = session.bucket(start)
+        if bucket is None:
+            ws_dropped_messages_total.labels("cohort_bucket_expired").inc()
+            return
+        bucket.update(user_id, concentration, relaxation, spiked)
+        if session.subscribers:
+            session.dirty[bucket.start] = bucket
+            session.ready.set()
+
+    def subscribe(self, session_id: str, websocket: WebSocket) -> dict:
+        """Add an organization socket, returns the current session snapshot."""
+        self.unsubscribe(websocket)
+        session = self._session(session_id)
+        session.subscribers.add(websocket)
+        self.subscriber_sessions[websocket] = session_id
+        if session.task is None:
+            session.task = asyncio.create_task(self._run(session))
+        return self.snapshot(session)
+
+    def unsubscribe(self, websocket: WebSocket):
+        session_id = self.subscriber_sessions.pop(websocket, None)
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            return
+        session.subscribers.discard(websocket)
+        if not session.subscribers:
+            if session.task is not None:
+                session.task.cancel()
+                session.task = None
+            session.dirty.clear()
+        self._release(session)
+
+    def snapshot(self, session: CohortSession) -> dict:
+        return {
+            "group_session_id": session.session_id,
+            "bucket_seconds": self.bucket_seconds,
+            "members": len(session.members),
+            "buckets": [bucket.as_dict() for bucket in session.buckets],
+        }
+
+    def stats(self) -> dict:
+        return {
+            session_id: {
+                "members": len(session.members),
+                "subscribers": len(session.subscribers),
+                "buckets": len(session.buckets),
+            }
+            for session_id, session in self.sessions.items()
+        }
+
+    async def _run(self, session: CohortSession):
+        while True:
+            await session.ready.wait()
+            session.ready.clear()
+            await self._flush(session)
+            await asyncio.sleep(self.publish_interval)
+
+    async def _flush(self, session: CohortSession):
+        if not session.dirty:
+            return
+        buckets = sorted(session.dirty.values(), key=lambda bucket: bucket.start)
+        session.dirty.clear()
+        message = {
+            "type": "cohort_stats",
+            "group_session_id": session.session_id,
+            "members": len(session.members),
+            "buckets": [bucket.as_dict() for bucket in buckets],
+        }
+        for websocket in list(session.subscribers):
+            try:
+                await websocket.send_json(message)
+            except Exception:
+                client_send_errors_total.inc()
+                logger.debug("Cohort stats send failed for session=%s", session.session_id)
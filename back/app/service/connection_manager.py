@@ -1,26 +1,80 @@
+import time
+
 from fastapi import WebSocket
 
+from app.core.metrics import (
+    client_send_errors_total,
+    send_to_clients_seconds,
+    ws_connections,
+)
+from app.core.logger import logger
+from app.service.client_stream import ClientStream, Subscription
+
+
 class ConnectionManager:
     def __init__(self):
         self.device_sockets: dict[str, WebSocket] = {}        # user_id -> device ws
         self.client_sockets: dict[str, set[WebSocket]] = {}   # user_id -> set of client ws
+        self.client_streams: dict[WebSocket, ClientStream] = {}  # subscribed client ws
 
     async def connect_device(self, user_id: str, websocket: WebSocket):
+        if user_id not in self.device_sockets:
+            ws_connections.labels("device").inc()
         self.device_sockets[user_id] = websocket
 
     async def connect_client(self, user_id: str, websocket: WebSocket):
-        self.client_sockets.setdefault(user_id, set()).add(websocket)
+        sockets = self.client_sockets.setdefault(user_id, set())
+        if websocket not in sockets:
+            ws_connections.labels("client").inc()
+        sockets.add(websocket)
 
     async def disconnect(self, websocket: WebSocket):
         for uid, ws in list(self.device_sockets.items()):
             if ws is websocket:
                 del self.device_sockets[uid]
+                ws_connections.labels("device").dec()
         for uid, ws_set in list(self.client_sockets.items()):
             if websocket in ws_set:
                 ws_set.remove(websocket)
+                self.unsubscribe(websocket)
+                ws_connections.labels("client").dec()
                 if not ws_set:
                     del self.client_sockets[uid]
 
+    def subscribe(self, websocket: WebSocket, subscription: Subscription):
+        self.unsubscribe(websocket)
+        self.client_streams[websocket] = ClientStream(websocket, subscription)
+
+    def unsubscribe(self, websocket: WebSocket):
+        stream = self.client_streams.pop(websocket, None)
+        if stream is not None:
+            stream.close()
+
+    async def send_sample(self, user_id: str, sample: dict):
+        """
+        Forward an eeg sample. Subscribed clients get it through their
+        stream, the rest get every sample in full.
+        """
+        started = time.perf_counter()
+        for ws in list(self.client_sockets.get(user_id, set())):
+            stream = self.client_streams.get(ws)
+            if stream is not None:
+                await stream.push(sample)
+                continue
+            try:
+                await ws.send_json({"type": "eeg_sample", "data": sample})
+            except Exception:
+                client_send_errors_total.inc()
+                logger.debug("Send to client failed for user_id=%s", user_id)
+        send_to_clients_seconds.observe(time.perf_counter() - started)
+
     async def send_to_clients(self, user_id: str, message: dict):
-        for ws in self.client_sockets.get(user_id, set()):
-            await ws.send_json(message)
+        started = time.perf_counter()
+        for ws in list(self.client_sockets.get(user_id, set())):
+            try:
+                await ws.send_json(message)
+            except Exception:
+                # a dead dashboard must not break the device loop
+                client_send_errors_total.inc()
+                logger.debug("Send to client failed for user_id=%s", user_id)
+        send_to_clients_seconds.observe(time.perf_counter() - started)
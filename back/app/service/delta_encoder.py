@@ -0,0 +1,91 @@
+DEFAULT_KEYFRAME_INTERVAL = 50
+
+
+def flatten(value: dict, prefix: str = "") -> dict:
+    """{"a": {"b": 1}} -> {"a.b": 1}"""
+    flat = {}
+    for key, item in value.items():
+        path = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(item, dict) and item:
+            flat.update(flatten(item, path))
+        else:
+            flat[path] = item
+    return flat
+
+
+def unflatten(flat: dict) -> dict:
+    value: dict = {}
+    for path, item in flat.items():
+        node = value
+        *parents, leaf = path.split(".")
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = item
+    return value
+
+
+class DeltaEncoder:
+    """
+    Compact frames for a client stream. A keyframe carries the key table
+    and every value; the frames after it only carry [index, value] pairs of
+    the values that changed. A new keyframe is sent periodically and
+    whenever the set of keys changes.
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL, precision: int | None = None):
+        self.keyframe_interval = keyframe_interval
+        self.precision = precision
+        self.seq = 0
+        self.keys: list[str] = []
+        self.values: list = []
+        self.since_keyframe = 0
+
+    def _round(self, value):
+        if self.precision is not None and isinstance(value, float):
+            return round(value, self.precision)
+        return value
+
+    def encode(self, sample: dict) -> dict:
+        flat = {key: self._round(value) for key, value in flatten(sample).items()}
+        self.seq += 1
+
+        if (
+            not self.keys
+            or self.since_keyframe >= self.keyframe_interval
+            or len(flat) != len(self.keys)
+            or any(key not in flat for key in self.keys)
+        ):
+            self.keys = list(flat)
+            self.values = list(flat.values())
+            self.since_keyframe = 0
+            return {"type": "eeg_keyframe", "seq": self.seq, "keys": self.keys, "values": self.values}
+
+        changes = []
+        for index, key in enumerate(self.keys):
+            value = flat[key]
+            if value != self.values[index]:
+                self.values[index] = value
+                changes.append([index, value])
+        self.since_keyframe += 1
+        return {"type": "eeg_delta", "seq": self.seq, "changes": changes}
+
+
+class DeltaDecoder:
+    """Reference decoder, mirrors what a dashboard has to do."""
+
+    def __init__(self):
+        self.seq = 0
+        self.keys: list[str] = []
+        self.values: list = []
+
+    def decode(self, frame: dict) -> dict:
+        if frame["type"] == "eeg_keyframe":
+            self.keys = list(frame["keys"])
+            self.values = list(frame["values"])
+        else:
+            if frame["seq"] != self.seq + 1:
+                raise ValueError(f"missed frame {self.seq + 1}, wait for a keyframe")
+            for index, value in frame["changes"]:
+                self.values[index] = value
+        self.seq = frame["seq"]
+        return unflatten(dict(zip(self.keys, self.values)))
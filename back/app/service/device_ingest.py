@@ -0,0 +1,177 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque
+
+from app.core.logger import logger
+from app.core.metrics import ws_dropped_messages_total
+
+SampleHandler = Callable[[dict], Awaitable[None]]
+
+
+@dataclass
+class TokenBucket:
+    rate: float
+    capacity: float
+    tokens: float = 0.0
+    updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self.tokens = self.capacity
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> bool:
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_token(self) -> float:
+        self._refill(time.monotonic())
+        return max((1 - self.tokens) / self.rate, 0.0)
+
+
+class DeviceIngest:
+    """
+    Bounded ingest for one device. Accepted samples are processed in order
+    by a consumer task, so a flooding device only delays itself. Samples over
+    the rate budget are coalesced: only the latest one is kept and processed
+    as soon as a token is available.
+    """
+
+    def __init__(self, user_id: str, handler: SampleHandler, rate: float, burst: int, queue_size: int):
+        self.user_id = user_id
+        self.handler = handler
+        self.bucket = TokenBucket(rate=rate, capacity=burst)
+        self.pending: Deque[dict] = deque(maxlen=queue_size)
+        self.latest: dict | None = None
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+        self.received = 0
+        self.processed = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.last_throttle_at = 0.0
+        self._window_start = time.monotonic()
+        self._window_received = 0
+        self.received_rate = 0.0
+
+    def start(self):
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def offer(self, sample: dict) -> bool:
+        """
+        Queue a sample. Returns False when the device is over its budget
+        and the sample was coalesced instead.
+        """
+        self._count_received()
+        if self.bucket.take():
+            if self.latest is not None:
+                # superseded by a newer accepted sample
+                self.latest = None
+                self.coalesced += 1
+                ws_dropped_messages_total.labels("coalesced").inc()
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+                ws_dropped_messages_total.labels("queue_full").inc()
+            self.pending.append(sample)
+            self.wakeup.set()
+            return True
+
+        if self.latest is not None:
+            self.coalesced += 1
+            ws_dropped_messages_total.labels("coalesced").inc()
+        self.latest = sample
+        self.wakeup.set()
+        return False
+
+    def should_notify_throttle(self, interval: float = 1.0) -> bool:
+        now = time.monotonic()
+        if now - self.last_throttle_at < interval:
+            return False
+        self.last_throttle_at = now
+        return True
+
+    async def run(self):
+        while True:
+            if self.pending:
+                sample = self.pending.popleft()
+            elif self.latest is not None:
+                delay = self.bucket.time_until_token()
+                if delay > 0 or not self.bucket.take():
+                    await self._wait(delay)
+                    continue
+                sample, self.latest = self.latest, None
+            else:
+                await self._wait(None)
+                continue
+
+            try:
+                await self.handler(sample)
+            except Exception:
+                logger.exception("Device ingest: handler failed for user_id=%s", self.user_id)
+            self.processed += 1
+
+    async def _wait(self, timeout: float | None):
+        self.wakeup.clear()
+        try:
+            await asyncio.wait_for(self.wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _count_received(self):
+        self.received += 1
+        self._window_received += 1
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.received_rate = self._window_received / elapsed
+            self._window_start = now
+            self._window_received = 0
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "processed": self.processed,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "queue_depth": len(self.pending),
+            "received_rate": self.received_rate,
+            "rate_limit": self.bucket.rate,
+        }
+
+
+class IngestRegistry:
+    def __init__(self, rate: float, burst: int, queue_size: int):
+        self.rate = rate
+        self.burst = burst
+        self.queue_size = queue_size
+        self.devices: dict[str, DeviceIngest] = {}
+
+    def open(self, user_id: str, handler: SampleHandler) -> DeviceIngest:
+        ingest = DeviceIngest(user_id, handler, self.rate, self.burst, self.queue_size)
+        ingest.start()
+        self.devices[user_id] = ingest
+        return ingest
+
+    async def close(self, ingest: DeviceIngest):
+        await ingest.stop()
+        if self.devices.get(ingest.user_id) is ingest:
+            del self.devices[ingest.user_id]
+
+    def stats(self) -> dict[str, dict]:
+        return {user_id: ingest.stats() for user_id, ingest in list(self.devices.items())}
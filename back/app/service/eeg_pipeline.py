@@ -0,0 +1,57 @@
+import time
+
+from app.core.logger import hot_logger, logger
+from app.core.metrics import (
+    device_to_client_latency_seconds,
+    eeg_samples_total,
+    sample_timestamp,
+)
+from app.service.cohort_aggregator import CohortAggregator
+from app.service.connection_manager import ConnectionManager
+from app.service.engagement_tracker import EngagementTracker
+from app.service.frame_capture import FrameCapture
+
+
+class EEGPipeline:
+    """
+    Processing of one accepted eeg_sample: fan-out to the user's clients,
+    spike detection and the group session statistics.
+    """
+
+    def __init__(
+        self,
+        manager: ConnectionManager,
+        tracker: EngagementTracker,
+        cohort: CohortAggregator | None = None,
+        capture: FrameCapture | None = None,
+    ):
+        self.manager = manager
+        self.tracker = tracker
+        self.cohort = cohort
+        self.capture = capture
+
+    async def process(self, user_id: str, eeg_data: dict):
+        await self.manager.send_sample(user_id, eeg_data)
+        hot_logger.debug("Device WS: forwarded eeg_sample to clients user_id=%s", user_id)
+        eeg_samples_total.inc()
+        sent_at = sample_timestamp(eeg_data)
+        if sent_at is not None:
+            device_to_client_latency_seconds.observe(max(time.time() - sent_at, 0.0))
+
+        frame = self.tracker.handle_sample(user_id, eeg_data)
+        if self.cohort is not None:
+            state = self.tracker.user_states.get(user_id)
+            if state is not None and state.last_concentration is not None:
+                self.cohort.record(
+                    user_id,
+                    state.last_concentration,
+                    state.last_relaxation,
+                    bool(frame),
+                    # server time: a device clock ahead of the others would
+                    # open future buckets and expire everyone else's samples
+                    time.time(),
+                )
+        if frame:
+            logger.debug("Device WS: engagement spike detected user_id=%s", user_id)
+            if self.capture is None or not self.capture.start(user_id, frame):
+                await self.manager.send_to_clients(user_id, frame.screenshot_request())
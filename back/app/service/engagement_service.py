@@ -1,12 +1,14 @@
 import uuid
 
 from app.adapters.sqlalchemy.engagement_repo import EngagementRepo
+from app.adapters.sqlalchemy.group_heatmap_repo import GroupHeatmapRepo
 from app.domains.engagement import CreateEngagement, Engagement
 
 
 class EngagementService:
-    def __init__(self, repo: EngagementRepo):
+    def __init__(self, repo: EngagementRepo, heatmap_repo: GroupHeatmapRepo | None = None):
         self.repo = repo
+        self.heatmap_repo = heatmap_repo
 
     async def create(
         self,
@@ -16,6 +18,7 @@ class EngagementService:
         concentration: float,
         screenshot_url: str,
         timecode: str | None = None,
+        group_session_id: uuid.UUID | None = None,
     ) -> Engagement:
         create_engagement = CreateEngagement(
             user_id=user_id,
@@ -24,7 +27,13 @@ class EngagementService:
             concentration=concentration,
             screenshot_url=screenshot_url,
             timecode=timecode,
+            group_session_id=group_session_id,
         )
+        if self.heatmap_repo is not None and group_session_id is not None:
+            # committed together with the engagement below
+            await self.heatmap_repo.add_engagement(
+                group_session_id, timecode, concentration, relaxation
+            )
         return await self.repo.create(create_engagement)
 
     async def list_by_video(self, video_id: uuid.UUID) -> list[Engagement]:
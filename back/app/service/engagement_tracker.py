@@ -1,62 +1,178 @@
+import itertools
+import time
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Deque
+from typing import Callable, Deque
+
+from app.core.metrics import (
+    engagement_spikes_total,
+    handle_sample_seconds,
+    sample_timestamp,
+    ws_dropped_messages_total,
+)
+
+DEFAULT_MAX_PENDING = 32
+DEFAULT_PENDING_TTL = 10.0
+DEFAULT_MATCH_TOLERANCE = 1.0
+RTT_ALPHA = 0.2
+
+_spike_ids = itertools.count(1)
 
 
 @dataclass
 class PendingFrame:
     relaxation: float
     concentration: float
+    spike_id: int = 0
+    sample_ts: float = 0.0     # device time of the spike sample, unix seconds
+    created_at: float = 0.0    # tracker clock when the spike was detected
+    group_session_id: str | None = None
+
+    def screenshot_request(self) -> dict:
+        return {
+            "type": "request_screenshot",
+            "spike_id": self.spike_id,
+            "timestamp": self.sample_ts,
+        }
 
 
 @dataclass
 class EngagementState:
     active: bool = False
     last_concentration: float | None = None
+    last_relaxation: float | None = None
     pending_frames: Deque[PendingFrame] = field(default_factory=deque)
+    # request_screenshot -> video_frame round trip, tracker clock
+    rtt: float | None = None
+    # playback position reported by the dashboard
+    video_id: str | None = None
+    timecode: float | None = None
+    timecode_at: float = 0.0
+    playing: bool = False
+    # group session the video is watched in, tags the stored engagements
+    group_session_id: str | None = None
 
 
 class EngagementTracker:
     """
     Keeps EEG state per user to detect sharp engagement spikes and
     correlate them with uploaded video frames.
+
+    Every spike is kept as a PendingFrame stamped with the device sample
+    time. A video_frame is matched to the spike it echoes (spike_id or
+    sample timestamp); an echo that matches no pending spike is dropped. A
+    frame without an echo goes to the spike whose expected answer time,
+    detection time plus the measured round trip, is the closest, and is
+    dropped while no round trip has been measured. Pending frames are
+    bounded per user and expire after `pending_ttl` seconds.
     """
 
-    def __init__(self, spike_threshold: float = 0.1):
+    def __init__(
+        self,
+        spike_threshold: float = 0.1,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        pending_ttl: float = DEFAULT_PENDING_TTL,
+        match_tolerance: float = DEFAULT_MATCH_TOLERANCE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.spike_threshold = spike_threshold
+        self.max_pending = max_pending
+        self.pending_ttl = pending_ttl
+        self.match_tolerance = match_tolerance
+        self.clock = clock
         self.user_states: dict[str, EngagementState] = {}
 
-    def start_video(self, user_id: str):
-        self.user_states[user_id] = EngagementState(active=True)
+    def start_video(
+        self,
+        user_id: str,
+        video_id: str | None = None,
+        timecode: float | None = None,
+        playing: bool = True,
+        group_session_id: str | None = None,
+    ):
+        self.user_states[user_id] = EngagementState(
+            active=True,
+            pending_frames=deque(maxlen=self.max_pending),
+            group_session_id=group_session_id,
+        )
+        if video_id is not None and timecode is not None:
+            self.update_progress(user_id, timecode, playing, video_id)
+
+    def update_progress(
+        self,
+        user_id: str,
+        timecode: float,
+        playing: bool = True,
+        video_id: str | None = None,
+    ):
+        state = self.user_states.get(user_id)
+        if not state:
+            return
+        if video_id is not None:
+            state.video_id = video_id
+        state.timecode = timecode
+        state.timecode_at = self.clock()
+        state.playing = playing
+
+    def playback_position(self, user_id: str, at: float) -> tuple[str, float] | None:
+        """Video and timecode the user was watching at tracker time `at`."""
+        state = self.user_states.get(user_id)
+        if not state or state.video_id is None or state.timecode is None:
+            return None
+        timecode = state.timecode
+        if state.playing:
+            timecode += max(at - state.timecode_at, 0.0)
+        return state.video_id, timecode
 
     def end_video(self, user_id: str):
         self.user_states.pop(user_id, None)
 
-    def handle_sample(self, user_id: str, sample: dict) -> bool:
+    def handle_sample(self, user_id: str, sample: dict) -> PendingFrame | None:
         """
-        Process EEG sample. On spike, enqueue a pending frame (no timecode yet).
-        Returns True when spike detected.
+        Process EEG sample. On spike, enqueue a pending frame (no timecode yet)
+        and return it.
         """
+        started = time.perf_counter()
+        try:
+            return self._handle_sample(user_id, sample)
+        finally:
+            handle_sample_seconds.observe(time.perf_counter() - started)
+
+    def _handle_sample(self, user_id: str, sample: dict) -> PendingFrame | None:
         state = self.user_states.get(user_id)
         if not state or not state.active:
-            return False
+            return None
 
         aggregate = self._aggregate(sample)
         if aggregate is None:
-            return False
+            return None
         relaxation, concentration = aggregate
 
         last = state.last_concentration
         state.last_concentration = concentration
+        state.last_relaxation = relaxation
 
         if last is None:
-            return False
+            return None
 
         if concentration >= last * (1 + self.spike_threshold):
-            state.pending_frames.append(PendingFrame(relaxation=relaxation, concentration=concentration))
-            return True
+            now = self.clock()
+            self._expire(state, now)
+            if len(state.pending_frames) == state.pending_frames.maxlen:
+                ws_dropped_messages_total.labels("pending_frame_overflow").inc()
+            frame = PendingFrame(
+                relaxation=relaxation,
+                concentration=concentration,
+                spike_id=next(_spike_ids),
+                sample_ts=sample_timestamp(sample) or time.time(),
+                created_at=now,
+                group_session_id=state.group_session_id,
+            )
+            state.pending_frames.append(frame)
+            engagement_spikes_total.inc()
+            return frame
 
-        return False
+        return None
 
     def attach_video_frame(
         self,
@@ -64,19 +180,77 @@ class EngagementTracker:
         timecode: str,
         video_id,
         screenshot_url: str,
+        spike_id: int | None = None,
+        timestamp: float | None = None,
     ):
         """
-        Match the oldest pending frame to the provided timecode from client.
+        Match the provided video frame to one pending spike, see the class
+        docstring. Returns its relaxation, concentration and group session,
+        or None when no spike is pending within the tolerance.
         """
         state = self.user_states.get(user_id)
         if not state:
+            ws_dropped_messages_total.labels("frame_not_pending").inc()
             return None
 
+        now = self.clock()
+        self._expire(state, now)
         if not state.pending_frames:
+            ws_dropped_messages_total.labels("frame_not_pending").inc()
+            return None
+
+        frame = self._match(state, now, spike_id, timestamp)
+        if frame is None:
             return None
 
-        frame = state.pending_frames.popleft()
-        return frame.relaxation, frame.concentration
+        state.pending_frames.remove(frame)
+        rtt = now - frame.created_at
+        state.rtt = rtt if state.rtt is None else state.rtt + RTT_ALPHA * (rtt - state.rtt)
+        return frame.relaxation, frame.concentration, frame.group_session_id
+
+    def _match(
+        self,
+        state: EngagementState,
+        now: float,
+        spike_id: int | None,
+        timestamp: float | None,
+    ) -> PendingFrame | None:
+        frames = state.pending_frames
+        if spike_id is not None:
+            for frame in frames:
+                if frame.spike_id == spike_id:
+                    return frame
+
+        if timestamp is not None:
+            sample_ts = timestamp / 1000 if timestamp > 1e11 else timestamp
+            frame = min(frames, key=lambda f: abs(f.sample_ts - sample_ts))
+            if abs(frame.sample_ts - sample_ts) <= self.match_tolerance:
+                return frame
+
+        if spike_id is not None or timestamp is not None:
+            # the echoed spike is gone, any other one would be a mismatch
+            ws_dropped_messages_total.labels("frame_echo_unmatched").inc()
+            return None
+
+        # nothing echoed back, expect the answer one round trip after the spike
+        if state.rtt is None:
+            ws_dropped_messages_total.labels("frame_no_rtt").inc()
+            return None
+        rtt = state.rtt
+        frame = min(frames, key=lambda f: abs(f.created_at + rtt - now))
+        if abs(frame.created_at + rtt - now) <= max(self.match_tolerance, rtt):
+            return frame
+        ws_dropped_messages_total.labels("frame_not_pending").inc()
+        return None
+
+    def _expire(self, state: EngagementState, now: float):
+        frames = state.pending_frames
+        while frames and now - frames[0].created_at > self.pending_ttl:
+            frames.popleft()
+            ws_dropped_messages_total.labels("pending_frame_expired").inc()
+
+    def pending_count(self) -> int:
+        return sum(len(state.pending_frames) for state in self.user_states.values())
 
     def _aggregate(self, sample: dict) -> tuple[float, float] | None:
         channels = sample.get("channels") or {}
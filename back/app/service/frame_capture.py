@@ -0,0 +1,108 @@
+import asyncio
+import time
+import uuid
+from typing import AsyncContextManager, Callable
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.errors import NotFoundError
+from app.core.logger import logger
+from app.service.connection_manager import ConnectionManager
+from app.service.engagement_service import EngagementService
+from app.service.engagement_tracker import EngagementTracker, PendingFrame
+from app.service.frame_extractor import FrameExtractor
+from app.service.video_service import VideoService
+
+# device clocks further off than this are not trusted for latency compensation
+MAX_DEVICE_LAG = 2.0
+
+
+class FrameCapture:
+    """
+    Answers spikes on the server: the frame at the playback position of
+    the spike is extracted from the stored video and the engagement is
+    saved right away, without a request_screenshot round trip. Falls back
+    to request_screenshot whenever the frame cannot be extracted.
+    """
+
+    def __init__(
+        self,
+        extractor: FrameExtractor,
+        tracker: EngagementTracker,
+        manager: ConnectionManager,
+        engagement_scope: Callable[[], AsyncContextManager[EngagementService]],
+        video_scope: Callable[[], AsyncContextManager[VideoService]],
+    ):
+        self.extractor = extractor
+        self.tracker = tracker
+        self.manager = manager
+        self.engagement_scope = engagement_scope
+        self.video_scope = video_scope
+        self.video_urls: dict[str, str] = {}
+        self.tasks: set[asyncio.Task] = set()
+
+    def start(self, user_id: str, frame: PendingFrame) -> bool:
+        """Starts a capture for the spike, False when the client has to answer."""
+        if not self.extractor.available:
+            return False
+        # the spike happened when the device sampled it, not when it got here
+        lag = min(max(time.time() - frame.sample_ts, 0.0), MAX_DEVICE_LAG)
+        position = self.tracker.playback_position(user_id, frame.created_at - lag)
+        if position is None:
+            return False
+
+        video_id, timecode = position
+        task = asyncio.create_task(self._capture(user_id, frame, video_id, timecode))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return True
+
+    async def _video_url(self, video_id: str) -> str | None:
+        url = self.video_urls.get(video_id)
+        if url is None:
+            try:
+                async with self.video_scope() as video_service:
+                    video = await video_service.get_one(uuid.UUID(video_id))
+            except (ValueError, NotFoundError):
+                return None
+            url = self.video_urls[video_id] = video.url
+        return url
+
+    async def _capture(self, user_id: str, frame: PendingFrame, video_id: str, timecode: float):
+        try:
+            url = await self._video_url(video_id)
+            screenshot_url = await self.extractor.extract(url, timecode) if url else None
+            if screenshot_url is None:
+                await self.manager.send_to_clients(user_id, frame.screenshot_request())
+                return
+
+            # same format as the dashboard, whole seconds
+            timecode_str = str(int(timecode))
+            stored = self.tracker.attach_video_frame(
+                user_id, timecode_str, video_id, screenshot_url, spike_id=frame.spike_id
+            )
+            if not stored:
+                # video ended or the spike expired while decoding
+                return
+            relaxation, concentration, group_session_id = stored
+            async with self.engagement_scope() as engagement_service:
+                engagement = await engagement_service.create(
+                    user_id=uuid.UUID(user_id),
+                    video_id=uuid.UUID(video_id),
+                    relaxation=relaxation,
+                    concentration=concentration,
+                    screenshot_url=screenshot_url,
+                    timecode=timecode_str,
+                    group_session_id=uuid.UUID(group_session_id) if group_session_id else None,
+                )
+            logger.debug(
+                "Frame capture: engagement saved user_id=%s video_id=%s timecode=%s",
+                user_id, video_id, timecode_str
+            )
+            await self.manager.send_to_clients(user_id, {
+                "type": "engagement_saved",
+                "spike_id": frame.spike_id,
+                "engagement": jsonable_encoder(engagement),
+            })
+        except Exception:
+            logger.exception("Frame capture failed for user_id=%s", user_id)
@@ -0,0 +1,260 @@
+import asyncio
+import bisect
+import json
+import shutil
+import subprocess
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from app.core.logger import logger
+
+FRAMES_DIR = "frames"
+MAX_CACHED_INDEXES = 64
+PROBE_TIMEOUT = 60
+EXTRACT_TIMEOUT = 15
+
+
+@dataclass
+class VideoIndex:
+    duration: float
+    keyframes: list[float]
+    width: int = 0
+    height: int = 0
+
+    def keyframe_before(self, timecode: float) -> float:
+        index = bisect.bisect_right(self.keyframes, timecode) - 1
+        return self.keyframes[index] if index >= 0 else 0.0
+
+
+async def run_command(args: list[str], timeout: float) -> bytes:
+    """
+    Runs ffmpeg or ffprobe as a subprocess of the event loop and returns
+    its stdout. The process is killed when it outlives `timeout` or the
+    caller is cancelled.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise subprocess.TimeoutExpired(args, timeout)
+    except asyncio.CancelledError:
+        process.kill()
+        raise
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+    return stdout
+
+
+async def probe_video(ffprobe_bin: str, path: str) -> VideoIndex:
+    """Keyframe times from the packet flags, nothing is decoded."""
+    packets = (await run_command(
+        [
+            ffprobe_bin, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", path,
+        ],
+        PROBE_TIMEOUT,
+    )).decode()
+    keyframes = []
+    for line in packets.splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" in flags and pts_time not in ("", "N/A"):
+            keyframes.append(float(pts_time))
+
+    info = json.loads(await run_command(
+        [
+            ffprobe_bin, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "stream=width,height:format=duration", "-of", "json", path,
+        ],
+        PROBE_TIMEOUT,
+    ))
+    stream = (info.get("streams") or [{}])[0]
+    duration = info.get("format", {}).get("duration")
+    return VideoIndex(
+        duration=float(duration) if duration not in (None, "N/A") else 0.0,
+        keyframes=sorted(keyframes),
+        width=int(stream.get("width") or 0),
+        height=int(stream.get("height") or 0),
+    )
+
+
+async def extract_frame(ffmpeg_bin: str, path: str, keyframe: float, offset: float, output: str):
+    """
+    Seeks the demuxer to the keyframe and decodes `offset` seconds from
+    there, so only one GOP is decoded whatever the position in the file.
+    """
+    await run_command(
+        [
+            ffmpeg_bin, "-v", "error", "-ss", f"{keyframe:.3f}", "-i", path,
+            "-ss", f"{offset:.3f}", "-frames:v", "1", "-q:v", "3", "-y", output,
+        ],
+        EXTRACT_TIMEOUT,
+    )
+
+
+async def build_sprite(
+    ffmpeg_bin: str,
+    path: str,
+    output: str,
+    interval: float,
+    columns: int,
+    rows: int,
+    tile_width: int,
+    tile_height: int,
+):
+    """
+    One thumbnail every `interval` seconds tiled into a single jpeg. Only
+    keyframes are decoded, the fps filter repeats them as needed.
+    """
+    await run_command(
+        [
+            ffmpeg_bin, "-v", "error", "-skip_frame", "nokey", "-i", path,
+            "-vf", f"fps=1/{interval:.3f},scale={tile_width}:{tile_height},tile={columns}x{rows}",
+            "-frames:v", "1", "-q:v", "5", "-y", output,
+        ],
+        PROBE_TIMEOUT * 5,
+    )
+
+
+def index_file(path: Path) -> Path:
+    # stored beside the video, served along with it from /uploads
+    return path.with_name(path.name + ".index.json")
+
+
+def write_index_file(path: Path, index: VideoIndex, sprite: dict | None):
+    index_file(path).write_text(json.dumps({**asdict(index), "sprite": sprite}))
+
+
+def read_index_file(path: Path) -> VideoIndex | None:
+    try:
+        data = json.loads(index_file(path).read_text())
+        return VideoIndex(
+            duration=data["duration"],
+            keyframes=data["keyframes"],
+            width=data.get("width", 0),
+            height=data.get("height", 0),
+        )
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+class FrameExtractor:
+    """
+    Decodes single frames of uploaded videos with ffmpeg subprocesses, at
+    most `max_workers` at a time. Keyframe indexes are probed once per video and cached, frames within
+    `keyframe_snap` seconds after a keyframe are taken from the keyframe
+    itself.
+    """
+
+    def __init__(
+        self,
+        upload_dir: str,
+        ffmpeg_bin: str = "ffmpeg",
+        ffprobe_bin: str = "ffprobe",
+        max_workers: int = 2,
+        keyframe_snap: float = 0.0,
+    ):
+        self.upload_dir = Path(upload_dir)
+        self.ffmpeg_bin = ffmpeg_bin
+        self.ffprobe_bin = ffprobe_bin
+        self.max_workers = max_workers
+        self.keyframe_snap = keyframe_snap
+        self.available = bool(shutil.which(ffmpeg_bin) and shutil.which(ffprobe_bin))
+        self.slots = asyncio.Semaphore(max_workers)
+        self.jobs: set[asyncio.Task] = set()
+        self.indexes: OrderedDict[str, VideoIndex] = OrderedDict()
+        self.probing: dict[str, asyncio.Future] = {}
+        if not self.available:
+            logger.info("Frame extraction disabled: %s or %s not found", ffmpeg_bin, ffprobe_bin)
+
+    async def run(self, func, *args):
+        """Runs one of the ffmpeg functions of this module, bounded by max_workers."""
+        job = asyncio.current_task()
+        self.jobs.add(job)
+        try:
+            async with self.slots:
+                return await func(*args)
+        finally:
+            self.jobs.discard(job)
+
+    def shutdown(self):
+        # cancelled jobs kill their ffmpeg process
+        for job in list(self.jobs):
+            job.cancel()
+
+    def video_path(self, url: str) -> Path | None:
+        """Local file of an /uploads url, None for anything outside UPLOAD_DIR."""
+        if not url.startswith("/uploads/"):
+            return None
+        path = (self.upload_dir / url.removeprefix("/uploads/")).resolve()
+        if self.upload_dir.resolve() not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def cache_index(self, path: str, index: VideoIndex):
+        self.indexes[path] = index
+        self.indexes.move_to_end(path)
+        while len(self.indexes) > MAX_CACHED_INDEXES:
+            self.indexes.popitem(last=False)
+
+    async def index(self, path: str) -> VideoIndex:
+        cached = self.indexes.get(path)
+        if cached is not None:
+            self.indexes.move_to_end(path)
+            return cached
+
+        # built at upload time by VideoIndexer
+        stored = read_index_file(Path(path))
+        if stored is not None:
+            self.cache_index(path, stored)
+            return stored
+
+        # concurrent spikes on the same video share one probe
+        pending = self.probing.get(path)
+        if pending is None:
+            pending = asyncio.ensure_future(self.run(probe_video, self.ffprobe_bin, path))
+            self.probing[path] = pending
+        try:
+            index = await pending
+        finally:
+            self.probing.pop(path, None)
+        self.cache_index(path, index)
+        return index
+
+    async def extract(self, url: str, timecode: float) -> str | None:
+        """Stores the frame at `timecode` as a jpeg, returns its url."""
+        if not self.available:
+            return None
+        path = self.video_path(url)
+        if path is None:
+            return None
+
+        try:
+            index = await self.index(str(path))
+            if index.duration:
+                timecode = min(max(timecode, 0.0), index.duration)
+            keyframe = index.keyframe_before(timecode)
+            offset = timecode - keyframe
+            if offset <= self.keyframe_snap:
+                offset = 0.0
+
+            frames_dir = self.upload_dir / FRAMES_DIR
+            frames_dir.mkdir(parents=True, exist_ok=True)
+            stored_name = f"{uuid.uuid4()}.jpg"
+            await self.run(
+                extract_frame,
+                self.ffmpeg_bin,
+                str(path),
+                keyframe,
+                offset,
+                str(frames_dir / stored_name),
+            )
+        except Exception:
+            logger.exception("Frame extraction failed for %s at %.2f", url, timecode)
+            return None
+        return f"/uploads/{FRAMES_DIR}/{stored_name}"
@@ -1,19 +1,21 @@
 import uuid
 
+from app.adapters.sqlalchemy.group_heatmap_repo import GroupHeatmapRepo
 from app.adapters.sqlalchemy.group_repo import GroupRepo
 from app.adapters.sqlalchemy.user_repo import UserRepo
-from app.domains.group import Group, GroupMember, GroupWithMembers, CreateGroup, GroupSession
+from app.domains.group import Group, GroupMember, GroupWithMembers, CreateGroup, GroupSession, GroupSessionHeatmapBucket
 from app.service.token_service import TokenService
 from app.service.video_service import VideoService
 from app.core.errors import NotFoundError, InvalidDataError
 
 
 class GroupService:
-    def __init__(self, group_repo: GroupRepo, user_repo: UserRepo, video_service: VideoService, token_service: TokenService):
+    def __init__(self, group_repo: GroupRepo, user_repo: UserRepo, video_service: VideoService, token_service: TokenService, heatmap_repo: GroupHeatmapRepo):
         self.group_repo = group_repo
         self.user_repo = user_repo
         self.video_service = video_service
         self.token_service = token_service
+        self.heatmap_repo = heatmap_repo
 
     async def _get_org_user(self, access_token: str):
         payload = self.token_service.validate_access_token(access_token)
@@ -75,6 +77,49 @@ class GroupService:
             raise InvalidDataError("group", "organization_id", "mismatch")
         await self.group_repo.delete_sessions(group_id)
 
+    async def _get_org_session(self, access_token: str, group_id: uuid.UUID, session_id: uuid.UUID) -> GroupSession:
+        org_user = await self._get_org_user(access_token)
+        groups = await self.group_repo.list_by_organization(org_user.organization_id)
+        if not any(g.id == group_id for g in groups):
+            raise InvalidDataError("group", "organization_id", "mismatch")
+        session = await self.group_repo.get_session_by_id(session_id)
+        if not session or session.group_id != group_id:
+            raise NotFoundError("group_session", "id", str(session_id))
+        return session
+
+    async def get_session_heatmap(self, access_token: str, group_id: uuid.UUID, session_id: uuid.UUID) -> list[GroupSessionHeatmapBucket]:
+        await self._get_org_session(access_token, group_id, session_id)
+        return await self.heatmap_repo.list_by_session(session_id)
+
+    async def rebuild_session_heatmap(self, access_token: str, group_id: uuid.UUID, session_id: uuid.UUID) -> list[GroupSessionHeatmapBucket]:
+        await self._get_org_session(access_token, group_id, session_id)
+        await self.heatmap_repo.rebuild(session_id)
+        return await self.heatmap_repo.list_by_session(session_id)
+
+    async def get_member_session(self, user_id: uuid.UUID, session_id: uuid.UUID) -> GroupSession:
+        """Group session the user may stream into as a group member."""
+        session = await self.group_repo.get_session_by_id(session_id)
+        if not session:
+            raise NotFoundError("group_session", "id", str(session_id))
+        if not await self.group_repo.is_member(session.group_id, user_id):
+            raise InvalidDataError("group_session", "user_id", str(user_id))
+        return session
+
+    async def get_organization_session(self, user_id: uuid.UUID, session_id: uuid.UUID) -> GroupSession:
+        """Group session of the organization the user belongs to."""
+        user = await self.user_repo.get_one_by_id(user_id)
+        if not user:
+            raise NotFoundError("user", "id", str(user_id))
+        if user.role != "organization":
+            raise InvalidDataError("user", "role", user.role)
+        session = await self.group_repo.get_session_by_id(session_id)
+        if not session:
+            raise NotFoundError("group_session", "id", str(session_id))
+        group = await self.group_repo.get_one_by_id(session.group_id)
+        if not group or group.organization_id != user.organization_id:
+            raise InvalidDataError("group", "organization_id", "mismatch")
+        return session
+
     async def list_groups_for_user(self, access_token: str) -> list[GroupWithMembers]:
         payload = self.token_service.validate_access_token(access_token)
         user = await self.user_repo.get_one_by_id(uuid.UUID(payload.sub))
@@ -0,0 +1,103 @@
+import datetime
+import json
+import time
+from pathlib import Path
+from typing import IO, Iterator
+
+from app.core.logger import logger
+from app.core.metrics import sample_timestamp
+
+RECORDING_SUFFIX = ".jsonl"
+RECORDING_VERSION = 1
+WRITE_BUFFER = 64 * 1024
+
+
+class SessionRecording:
+    """
+    One device session as JSON lines: a `session` header, then every
+    accepted eeg_sample with its offset from the start in seconds. The
+    desktop client writes the same format.
+    """
+
+    def __init__(self, path: Path, user_id: str):
+        self.path = path
+        self.user_id = user_id
+        self.started = time.monotonic()
+        self.samples = 0
+        self.file: IO[str] | None = path.open("w", buffering=WRITE_BUFFER)
+        self._write({
+            "type": "session",
+            "version": RECORDING_VERSION,
+            "user_id": user_id,
+            "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        })
+
+    def _write(self, record: dict):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def write(self, eeg_data: dict):
+        if self.file is None:
+            return
+        try:
+            self._write({
+                "type": "eeg_sample",
+                "t": round(time.monotonic() - self.started, 4),
+                "data": eeg_data,
+            })
+            self.samples += 1
+        except (OSError, TypeError, ValueError):
+            logger.exception("Session recording failed, stopped: %s", self.path)
+            self.close()
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            logger.debug("Session recorded: %s samples=%s", self.path, self.samples)
+
+
+class SessionRecorder:
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def open(self, user_id: str) -> SessionRecording | None:
+        # one directory per user, only its owner can list and replay them
+        stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S")
+        directory = self.directory / user_id
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            return SessionRecording(directory / f"{stamp}{RECORDING_SUFFIX}", user_id)
+        except OSError:
+            logger.exception("Session recording could not be started for user_id=%s", user_id)
+            return None
+
+
+def read_recording(lines: Iterator[str]) -> list[tuple[float, dict]]:
+    """
+    (offset, eeg_data) of every sample of a recording. Samples without an
+    offset are placed by their device timestamp, lines that do not parse
+    are skipped.
+    """
+    samples: list[tuple[float, dict]] = []
+    first_ts: float | None = None
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if not isinstance(record, dict) or record.get("type") != "eeg_sample":
+            continue
+        data = record.get("data")
+        if not isinstance(data, dict):
+            continue
+
+        offset = record.get("t")
+        if not isinstance(offset, (int, float)):
+            sent_at = sample_timestamp(data)
+            if sent_at is None:
+                offset = samples[-1][0] if samples else 0.0
+            else:
+                first_ts = sent_at if first_ts is None else first_ts
+                offset = sent_at - first_ts
+        samples.append((float(offset), data))
+    return samples
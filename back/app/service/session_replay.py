@@ -0,0 +1,276 @@
+import asyncio
+import datetime
+import time
+import uuid
+from pathlib import Path
+
+from app.core.errors import InvalidDataError, NotFoundError
+from app.core.logger import logger
+from app.domains.replay import Recording, Replay, StartReplay
+from app.service.device_ingest import IngestRegistry
+from app.service.eeg_pipeline import EEGPipeline
+from app.service.session_recorder import RECORDING_SUFFIX, read_recording
+
+# replays that never wait yield to the event loop this often
+YIELD_EVERY = 100
+
+
+def _retimed(data: dict) -> dict:
+    # fresh device time, in the unit the recording used
+    previous = data.get("timestamp")
+    now = time.time()
+    ms = isinstance(previous, (int, float)) and previous > 1e11
+    return {**data, "timestamp": now * 1000 if ms else now}
+
+
+class SessionReplay:
+    """
+    Streams a recording as if the device were connected. At a positive
+    speed samples keep their recorded spacing, divided by the speed, and go
+    through a DeviceIngest like live ones. Speed 0 awaits the pipeline for
+    every sample, which measures its throughput.
+    """
+
+    def __init__(
+        self,
+        user_id: str,
+        recording: str,
+        samples: list[tuple[float, dict]],
+        speed: float,
+        loop: bool,
+    ):
+        self.id = uuid.uuid4()
+        self.user_id = user_id
+        self.recording = recording
+        self.samples = samples
+        self.speed = speed
+        self.loop = loop
+        self.status = "running"
+        self.sent = 0
+        self.error: str | None = None
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.finished_at: datetime.datetime | None = None
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+        self.task: asyncio.Task | None = None
+
+    @property
+    def duration(self) -> float:
+        # one mean sample interval between the last sample and the next loop
+        last = self.samples[-1][0]
+        return last + (last / (len(self.samples) - 1) if len(self.samples) > 1 else 0.0)
+
+    async def run(self, ingest_registry: IngestRegistry, pipeline: EEGPipeline):
+        try:
+            if self.speed > 0:
+                await self._paced(ingest_registry, pipeline)
+            else:
+                await self._max_speed(pipeline)
+            self.status = "finished"
+        except asyncio.CancelledError:
+            self.status = "stopped"
+            raise
+        except Exception as e:
+            logger.exception("Replay failed user_id=%s recording=%s", self.user_id, self.recording)
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            self.finished = time.perf_counter()
+            self.finished_at = datetime.datetime.now(datetime.timezone.utc)
+            logger.debug(
+                "Replay %s user_id=%s recording=%s sent=%s rate=%.1f/s",
+                self.status, self.user_id, self.recording, self.sent, self.rate
+            )
+
+    async def _paced(self, ingest_registry: IngestRegistry, pipeline: EEGPipeline):
+        user_id = self.user_id
+        ingest = ingest_registry.open(user_id, lambda sample: pipeline.process(user_id, sample))
+        try:
+            loop = asyncio.get_running_loop()
+            origin = loop.time()
+            while True:
+                since_yield = 0
+                for offset, data in self.samples:
+                    delay = origin + offset / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                        since_yield = 0
+                    elif since_yield >= YIELD_EVERY:
+                        # behind schedule or fast, no sample waits
+                        await asyncio.sleep(0)
+                        since_yield = 0
+                    ingest.offer(_retimed(data))
+                    self.sent += 1
+                    since_yield += 1
+                if not self.loop:
+                    break
+                origin += self.duration / self.speed
+                # a pass never waits when every delay is due, give others a turn
+                await asyncio.sleep(0)
+            # let the consumer drain what is still queued
+            while ingest.pending or ingest.latest is not None:
+                await asyncio.sleep(0.05)
+        finally:
+            await ingest_registry.close(ingest)
+
+    async def _max_speed(self, pipeline: EEGPipeline):
+        # one pass only: StartReplay refuses loop at speed 0
+        for _, data in self.samples:
+            await pipeline.process(self.user_id, _retimed(data))
+            self.sent += 1
+            if self.sent % YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rate(self) -> float:
+        elapsed = self.elapsed
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+    def as_domain(self) -> Replay:
+        return Replay(
+            id=self.id,
+            user_id=uuid.UUID(self.user_id),
+            recording=self.recording,
+            speed=self.speed,
+            loop=self.loop,
+            status=self.status,
+            samples=len(self.samples),
+            sent=self.sent,
+            elapsed=self.elapsed,
+            rate=self.rate,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            error=self.error,
+        )
+
+
+class ReplayService:
+    """
+    Recordings of device sessions, stored by the server or uploaded from
+    the desktop client, replayed into the live pipeline of their user. Each
+    user sees and replays only the recordings in its own directory. One
+    replay per user, a new one replaces the previous.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ingest_registry: IngestRegistry,
+        pipeline: EEGPipeline,
+        max_upload_bytes: int,
+    ):
+        self.directory = Path(directory)
+        self.ingest_registry = ingest_registry
+        self.pipeline = pipeline
+        self.max_upload_bytes = max_upload_bytes
+        self.replays: dict[str, SessionReplay] = {}
+
+    def _user_directory(self, user_id: uuid.UUID) -> Path:
+        return self.directory / str(user_id)
+
+    def _path(self, user_id: uuid.UUID, name: str) -> Path:
+        if not name or Path(name).name != name or not name.endswith(RECORDING_SUFFIX):
+            raise InvalidDataError("Recording", "name", name)
+        return self._user_directory(user_id) / name
+
+    def list_recordings(self, user_id: uuid.UUID) -> list[Recording]:
+        directory = self._user_directory(user_id)
+        if not directory.is_dir():
+            return []
+        recordings = []
+        for path in sorted(directory.glob(f"*{RECORDING_SUFFIX}")):
+            stat = path.stat()
+            recordings.append(Recording(
+                name=path.name,
+                size=stat.st_size,
+                modified_at=datetime.datetime.fromtimestamp(stat.st_mtime, datetime.timezone.utc),
+            ))
+        return recordings
+
+    async def save_recording(self, user_id: uuid.UUID, filename: str | None, content: bytes) -> Recording:
+        if len(content) > self.max_upload_bytes:
+            raise InvalidDataError("Recording", "size", f"over {self.max_upload_bytes} bytes")
+
+        def parse():
+            return read_recording(content.decode("utf-8", errors="replace").splitlines())
+
+        samples = await asyncio.to_thread(parse)
+        if not samples:
+            raise InvalidDataError("Recording", "content", filename)
+
+        stem = Path(filename or "").stem or "recording"
+        path = self._path(user_id, f"{stem}-{uuid.uuid4().hex[:8]}{RECORDING_SUFFIX}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(path.write_bytes, content)
+        stat = path.stat()
+        return Recording(
+            name=path.name,
+            size=stat.st_size,
+            modified_at=datetime.datetime.fromtimestamp(stat.st_mtime, datetime.timezone.utc),
+        )
+
+    async def _load(self, user_id: uuid.UUID, name: str) -> list[tuple[float, dict]]:
+        path = self._path(user_id, name)
+        if not path.is_file():
+            raise NotFoundError("Recording", "name", name)
+
+        def load():
+            with path.open(encoding="utf-8", errors="replace") as f:
+                return read_recording(f)
+
+        samples = await asyncio.to_thread(load)
+        if not samples:
+            raise InvalidDataError("Recording", "content", name)
+        return samples
+
+    async def start(self, user_id: uuid.UUID, data: StartReplay) -> Replay:
+        samples = await self._load(user_id, data.recording)
+        if data.loop and len({offset for offset, _ in samples}) < 2:
+            # a pass of zero duration would loop without ever sleeping
+            raise InvalidDataError("Recording", "duration for loop", data.recording)
+        key = str(user_id)
+        await self._cancel(self.replays.get(key))
+
+        replay = SessionReplay(key, data.recording, samples, data.speed, data.loop)
+        replay.task = asyncio.create_task(replay.run(self.ingest_registry, self.pipeline))
+        self.replays[key] = replay
+        logger.debug(
+            "Replay started user_id=%s recording=%s samples=%s speed=%s",
+            key, data.recording, len(samples), data.speed
+        )
+        return replay.as_domain()
+
+    def list_replays(self, user_id: uuid.UUID) -> list[Replay]:
+        replay = self.replays.get(str(user_id))
+        return [replay.as_domain()] if replay else []
+
+    async def stop(self, user_id: uuid.UUID, replay_id: uuid.UUID) -> Replay:
+        replay = self.replays.get(str(user_id))
+        if replay is None or replay.id != replay_id:
+            raise NotFoundError("Replay", "id", replay_id)
+        await self._cancel(replay)
+        del self.replays[str(user_id)]
+        return replay.as_domain()
+
+    async def _cancel(self, replay: SessionReplay | None):
+        if replay is None or replay.task is None or replay.task.done():
+            return
+        replay.task.cancel()
+        try:
+            await replay.task
+        except asyncio.CancelledError:
+            pass
+
+    async def shutdown(self):
+        for replay in list(self.replays.values()):
+            await self._cancel(replay)
+
+    def stats(self) -> dict[str, dict]:
+        return {
+            user_id: {"status": replay.status, "sent": replay.sent, "rate": replay.rate}
+            for user_id, replay in list(self.replays.items())
+        }
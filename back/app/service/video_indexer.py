@@ -0,0 +1,103 @@
+import asyncio
+import math
+import uuid
+from typing import AsyncContextManager, Callable
+
+from app.adapters.sqlalchemy.video_repo import VideoRepo
+from app.core.logger import logger
+from app.domains.video import Video, VideoIndexUpdate
+from app.service.frame_extractor import FrameExtractor, build_sprite, write_index_file
+
+MAX_SPRITE_TILES = 100
+
+
+class VideoIndexer:
+    """
+    Background stage of an upload: probes duration and the keyframe table
+    and renders a sprite sheet of preview thumbnails. The result is written
+    beside the file (`<name>.index.json`) and into the video row, so the
+    timeline can scrub and frames can be extracted without probing again.
+    """
+
+    def __init__(
+        self,
+        extractor: FrameExtractor,
+        repo_scope: Callable[[], AsyncContextManager[VideoRepo]],
+        sprite_interval: float = 5.0,
+        sprite_columns: int = 10,
+        sprite_tile_width: int = 160,
+    ):
+        self.extractor = extractor
+        self.repo_scope = repo_scope
+        self.sprite_interval = sprite_interval
+        self.sprite_columns = sprite_columns
+        self.sprite_tile_width = sprite_tile_width
+        self.tasks: set[asyncio.Task] = set()
+
+    def schedule(self, video: Video):
+        if self.extractor.available:
+            job = self.build(video.id, video.url)
+        else:
+            # no ffmpeg, the video will never be indexed
+            job = self.save(video.id, VideoIndexUpdate(index_status="unavailable"))
+        task = asyncio.create_task(job)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def build(self, video_id: uuid.UUID, url: str) -> VideoIndexUpdate:
+        update = VideoIndexUpdate(index_status="failed")
+        path = self.extractor.video_path(url)
+        if path is not None:
+            try:
+                index = await self.extractor.index(str(path))
+                sprite = await self._sprite(path, index) if index.duration else None
+                write_index_file(path, index, sprite)
+                update = VideoIndexUpdate(
+                    index_status="ready",
+                    duration=index.duration,
+                    keyframes=index.keyframes,
+                    sprite=sprite,
+                )
+            except Exception:
+                logger.exception("Video indexing failed for video_id=%s", video_id)
+
+        return await self.save(video_id, update)
+
+    async def save(self, video_id: uuid.UUID, update: VideoIndexUpdate) -> VideoIndexUpdate:
+        async with self.repo_scope() as repo:
+            await repo.set_index(video_id, update)
+        logger.debug("Video indexed video_id=%s status=%s", video_id, update.index_status)
+        return update
+
+    async def _sprite(self, path, index) -> dict:
+        interval = max(self.sprite_interval, index.duration / MAX_SPRITE_TILES)
+        count = max(math.ceil(index.duration / interval), 1)
+        columns = min(self.sprite_columns, count)
+        rows = math.ceil(count / columns)
+        tile_width = self.sprite_tile_width
+        tile_height = tile_width * 9 // 16
+        if index.width and index.height:
+            # even height, as required by most encoders
+            tile_height = max(round(tile_width * index.height / index.width / 2) * 2, 2)
+
+        output = path.with_name(path.name + ".sprite.jpg")
+        await self.extractor.run(
+            build_sprite,
+            self.extractor.ffmpeg_bin,
+            str(path),
+            str(output),
+            interval,
+            columns,
+            rows,
+            tile_width,
+            tile_height,
+        )
+        return {
+            "url": f"/uploads/{output.relative_to(self.extractor.upload_dir.resolve())}",
+            "interval": interval,
+            "count": count,
+            "columns": columns,
+            "rows": rows,
+            "tile_width": tile_width,
+            "tile_height": tile_height,
+        }
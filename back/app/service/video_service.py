@@ -4,12 +4,14 @@ from pathlib import Path
 from app.adapters.sqlalchemy.video_repo import VideoRepo
 from app.core.config import settings
 from app.core.errors import NotFoundError
-from app.domains.video import CreateVideo, Video
+from app.domains.video import CreateVideo, Video, VideoDetail
+from app.service.video_indexer import VideoIndexer
 
 
 class VideoService():
-    def __init__(self, repo: VideoRepo):
+    def __init__(self, repo: VideoRepo, indexer: VideoIndexer | None = None):
         self.repo = repo
+        self.indexer = indexer
 
     async def upload(self, filename: str | None, content: bytes) -> Video:
         upload_dir = Path(settings.UPLOAD_DIR)
@@ -21,9 +23,13 @@ class VideoService():
         file_path.write_bytes(content)
 
         url = f"/uploads/{stored_name}"
-        return await self.repo.create(CreateVideo(url=url))
+        video = await self.repo.create(CreateVideo(url=url))
+        if self.indexer is not None:
+            # duration, keyframes and sprite are filled in in the background
+            self.indexer.schedule(video)
+        return video
 
-    async def get_one(self, video_id: uuid.UUID) -> Video:
+    async def get_one(self, video_id: uuid.UUID) -> VideoDetail:
         video = await self.repo.get_one_by_id(video_id)
         if video is None:
             raise NotFoundError("video", "id", video_id)
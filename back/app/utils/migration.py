@@ -1,30 +1,82 @@
-from alembic import command
-from alembic.config import Config
-from alembic.runtime.migration import MigrationContext
-from alembic.script import ScriptDirectory
+import asyncio
+import time
+from functools import lru_cache
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine
 
+from app.core.config import settings
 from app.core.logger import logger
 
-# alembic_cfg = Config("back/alembic.ini")
-alembic_cfg = Config("alembic.ini")       
-script = ScriptDirectory.from_config(alembic_cfg)
+# any constant works, it only has to be the same for every worker
+MIGRATION_LOCK_ID = 7_345_001
 
 
-async def upgrade(async_engine: AsyncEngine):
-    async with async_engine.begin() as conn:
+@lru_cache(maxsize=1)
+def get_alembic_config():
+    from alembic.config import Config
+
+    # alembic_cfg = Config("back/alembic.ini")
+    return Config("alembic.ini")
+
+
+@lru_cache(maxsize=1)
+def get_head_revisions() -> frozenset[str]:
+    from alembic.script import ScriptDirectory
+
+    script = ScriptDirectory.from_config(get_alembic_config())
+    return frozenset(script.get_heads())
+
+
+def _current_revisions(sync_conn) -> frozenset[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    context = MigrationContext.configure(sync_conn)
+    return frozenset(context.get_current_heads())
 
-        def check_revision(sync_conn):
-            context = MigrationContext.configure(sync_conn)
-            return context.get_current_revision()
 
-        current_rev = await conn.run_sync(check_revision)
-        head_rev = script.get_current_head()
+def _run_upgrade():
+    from alembic import command
 
-        if current_rev != head_rev:
+    command.upgrade(get_alembic_config(), "heads")
+
+
+async def upgrade(async_engine: AsyncEngine):
+    if not settings.DB_MIGRATE_ON_STARTUP:
+        logger.info("Skipping migration check (DB_MIGRATE_ON_STARTUP is off)")
+        return
+
+    started = time.perf_counter()
+    head_revs = get_head_revisions()
+
+    async with async_engine.connect() as conn:
+        current_revs = await conn.run_sync(_current_revisions)
+        if current_revs == head_revs:
             logger.info(
-                f"Current revision: {current_rev}, upgrading to head {head_rev}"
+                "DB already up-to-date (checked in %.1f ms)",
+                (time.perf_counter() - started) * 1000,
+            )
+            return
+
+        # only one worker migrates, the rest wait and re-check
+        await conn.execute(
+            text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID}
+        )
+        try:
+            await conn.rollback()
+            current_revs = await conn.run_sync(_current_revisions)
+            if current_revs != head_revs:
+                logger.info(
+                    f"Current revision: {sorted(current_revs)}, "
+                    f"upgrading to heads {sorted(head_revs)}"
+                )
+                await asyncio.to_thread(_run_upgrade)
+        finally:
+            await conn.execute(
+                text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID}
             )
-            command.upgrade(alembic_cfg, "head")
-        else:
-            logger.info("DB already up-to-date")
+            await conn.commit()
+
+    logger.info(
+        "Migration check finished in %.1f ms", (time.perf_counter() - started) * 1000
+    )
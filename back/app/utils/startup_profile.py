@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    """
+    Parse the stderr of `python -X importtime` into per-module timings.
+    """
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        timings.append(
+            ImportTiming(
+                module=parts[2].strip(),
+                self_us=int(parts[0]),
+                cumulative_us=int(parts[1]),
+            )
+        )
+    return timings
+
+
+def profile_imports(target: str = "main") -> tuple[list[ImportTiming], float]:
+    """
+    Import `target` in a fresh interpreter and return the import breakdown
+    together with the wall time of the whole process in seconds.
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=os.getcwd(),
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr), elapsed
+
+
+def format_report(timings: list[ImportTiming], wall: float, top: int = 30) -> str:
+    by_package: dict[str, int] = {}
+    for timing in timings:
+        package = timing.module.split(".")[0]
+        by_package[package] = by_package.get(package, 0) + timing.self_us
+
+    lines = [f"startup wall time: {wall * 1000:.1f} ms", ""]
+    lines.append(f"top {top} packages by self time:")
+    for package, self_us in sorted(by_package.items(), key=lambda x: -x[1])[:top]:
+        lines.append(f"  {self_us / 1000:9.1f} ms  {package}")
+
+    lines.append("")
+    lines.append(f"top {top} modules by cumulative time:")
+    for timing in sorted(timings, key=lambda x: -x.cumulative_us)[:top]:
+        lines.append(
+            f"  {timing.cumulative_us / 1000:9.1f} ms  "
+            f"(self {timing.self_us / 1000:7.1f} ms)  {timing.module}"
+        )
+    return "\n".join(lines)
+
+
+def run_profile(target: str = "main") -> int:
+    timings, wall = profile_imports(target)
+    print(format_report(timings, wall))
+    return 0
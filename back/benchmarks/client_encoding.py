@@ -0,0 +1,112 @@
+"""
+Bytes per second sent to one dashboard for every client stream encoding.
+
+Run from the `back` directory:
+
+    python benchmarks/client_encoding.py --rate 10 --duration 60
+
+Samples come from the load generator (benchmarks/ws_load.py) and go through
+the same Subscription filter and DeltaEncoder as ClientStream. Each format
+is measured raw and behind permessage-deflate, simulated with a raw deflate
+stream that keeps its window between messages (context takeover) and a
+sync flush per message, as uvicorn's websockets implementation does.
+"""
+import argparse
+import json
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ws_load import SampleGenerator  # noqa: E402
+
+from app.service.client_stream import Subscription  # noqa: E402
+from app.service.delta_encoder import DeltaDecoder, DeltaEncoder  # noqa: E402
+
+
+class Deflate:
+    def __init__(self):
+        self.compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+
+    def size(self, text: str) -> int:
+        data = self.compressor.compress(text.encode()) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+        # the trailing 00 00 ff ff is stripped on the wire
+        return len(data) - 4
+
+
+def dumps(message: dict) -> str:
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+def run(args, subscription: Subscription, encoding: str) -> dict:
+    generator = SampleGenerator(args.seed, args.emotion_period)
+    encoder = DeltaEncoder(args.keyframe_interval, subscription.precision) if encoding == "delta" else None
+    decoder = DeltaDecoder()
+    deflate = Deflate()
+    raw = compressed = 0
+
+    frames = int(args.duration * args.rate)
+    for i in range(frames):
+        elapsed = i / args.rate
+        spike = args.spike_interval and i % int(args.spike_interval * args.rate) == 0
+        sample = subscription.filter(generator.build(elapsed, bool(spike)))
+        if encoder is not None:
+            frame = encoder.encode(sample)
+            # keep the benchmark honest about the format being lossless
+            decoded = decoder.decode(frame)
+            if subscription.precision is None and decoded != sample:
+                raise AssertionError("delta frame does not decode to the sample")
+        else:
+            frame = {"type": "eeg_sample", "data": sample}
+        text = dumps(frame)
+        raw += len(text)
+        compressed += deflate.size(text)
+
+    return {
+        "raw_bytes_per_second": raw / args.duration,
+        "deflate_bytes_per_second": compressed / args.duration,
+        "raw_bytes_per_frame": raw / frames,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rate", type=float, default=10.0, help="samples/s per device")
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--spike-interval", type=float, default=5.0)
+    parser.add_argument("--emotion-period", type=float, default=20.0)
+    parser.add_argument("--keyframe-interval", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="append the report as one json line")
+    args = parser.parse_args()
+
+    cases = {
+        "json": (Subscription(), "json"),
+        "json_filtered": (
+            Subscription(channels=frozenset({"O1", "O2"}), metrics=frozenset({"mind"})),
+            "json",
+        ),
+        "delta": (Subscription(encoding="delta"), "delta"),
+        "delta_precision_3": (Subscription(encoding="delta", precision=3), "delta"),
+    }
+    report = {}
+    baseline = None
+    print(f"{'case':20s} {'raw B/s':>12s} {'deflate B/s':>12s} {'B/frame':>10s}")
+    for name, (subscription, encoding) in cases.items():
+        result = run(args, subscription, encoding)
+        baseline = baseline or result["raw_bytes_per_second"]
+        result["vs_json_raw"] = result["deflate_bytes_per_second"] / baseline
+        report[name] = result
+        print(
+            f"{name:20s} {result['raw_bytes_per_second']:12.0f} "
+            f"{result['deflate_bytes_per_second']:12.0f} {result['raw_bytes_per_frame']:10.0f}"
+        )
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"rate": args.rate, **report}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
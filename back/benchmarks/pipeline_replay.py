@@ -0,0 +1,119 @@
+"""
+Throughput of EEGPipeline replaying a recorded device session.
+
+Run from the `back` directory:
+
+    python benchmarks/pipeline_replay.py recordings/<user>-<time>.jsonl --clients 2 --loops 20
+
+Replays the recording at max speed (the same path as POST /v1/replay
+with speed 0) into a pipeline with fake dashboard clients that accept
+every message, so the numbers are the cost of the server side only:
+fan-out, spike detection and cohort statistics. Without a recording a
+synthetic one is generated.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.service.cohort_aggregator import CohortAggregator  # noqa: E402
+from app.service.connection_manager import ConnectionManager  # noqa: E402
+from app.service.eeg_pipeline import EEGPipeline  # noqa: E402
+from app.service.engagement_tracker import EngagementTracker  # noqa: E402
+from app.service.session_recorder import read_recording  # noqa: E402
+from app.service.session_replay import SessionReplay  # noqa: E402
+
+USER_ID = "00000000-0000-0000-0000-00000000be9c"
+
+
+class FakeClient:
+    def __init__(self):
+        self.messages = 0
+
+    async def send_json(self, data):
+        self.messages += 1
+
+    async def send_text(self, data):
+        self.messages += 1
+
+
+def synthetic(count: int, rate: float, rng: random.Random) -> list[tuple[float, dict]]:
+    samples = []
+    for i in range(count):
+        t = i / rate
+        attention = 50 + 30 * math.sin(t / 3) + rng.uniform(-10, 10)
+        relaxation = 50 + 20 * math.cos(t / 5) + rng.uniform(-10, 10)
+        channels = {
+            name: {
+                "mind": {"instant_attention": attention, "instant_relaxation": relaxation},
+                "spectrum": {band: rng.random() for band in ("delta", "theta", "alpha", "beta", "gamma")},
+            }
+            for name in ("O1", "O2", "T3", "T4")
+        }
+        samples.append((t, {"channels": channels, "timestamp": time.time() + t}))
+    return samples
+
+
+async def run(args, samples) -> dict:
+    manager = ConnectionManager()
+    clients = [FakeClient() for _ in range(args.clients)]
+    for client in clients:
+        await manager.connect_client(USER_ID, client)
+    tracker = EngagementTracker()
+    tracker.start_video(USER_ID)
+    cohort = CohortAggregator() if args.cohort else None
+    if cohort is not None:
+        cohort.join("bench", USER_ID)
+    pipeline = EEGPipeline(manager, tracker, cohort)
+
+    replay = SessionReplay(USER_ID, args.recording or "synthetic", samples, 0, False)
+    started = time.perf_counter()
+    for _ in range(args.loops):
+        await replay.run(None, pipeline)
+    elapsed = time.perf_counter() - started
+    if cohort is not None:
+        cohort.leave(USER_ID)
+    return {
+        "samples": replay.sent,
+        "elapsed": elapsed,
+        "rate": replay.sent / elapsed,
+        "client_messages": sum(client.messages for client in clients),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("recording", nargs="?", help="jsonl recording, synthetic when omitted")
+    parser.add_argument("--samples", type=int, default=5000, help="synthetic samples")
+    parser.add_argument("--sample-rate", type=float, default=10.0, help="synthetic samples per second")
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--loops", type=int, default=10)
+    parser.add_argument("--cohort", action="store_true", help="also record cohort statistics")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="append the report as one json line")
+    args = parser.parse_args()
+
+    if args.recording:
+        with open(args.recording, encoding="utf-8") as f:
+            samples = read_recording(f)
+    else:
+        samples = synthetic(args.samples, args.sample_rate, random.Random(args.seed))
+
+    report = asyncio.run(run(args, samples))
+    print(
+        f"{report['samples']} samples in {report['elapsed']:.2f}s: {report['rate']:.0f} samples/s, "
+        f"{report['client_messages']} client messages"
+    )
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), **report}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Spike-to-frame matching accuracy of EngagementTracker under latency.
+
+Run from the `back` directory:
+
+    python benchmarks/spike_matching.py --spikes 5000 --latency 0.3 --jitter 0.5
+
+Simulates one user: spikes arrive as a Poisson process with occasional
+bursts, every request_screenshot reaches the dashboard after a lognormal
+network delay plus a capture/upload time, and some answers are lost. The
+video_frame answers arrive out of order whenever the delays overlap.
+
+Each strategy reports the share of frames attached to the spike they
+were taken for, wrong attachments, unmatched frames and the peak number
+of pending spikes:
+
+* fifo       - the previous behaviour, oldest pending spike, unbounded
+* spike_id   - the dashboard echoes spike_id
+* timestamp  - the dashboard echoes the sample timestamp (current front)
+* rtt        - only the first answer echoes spike_id, which measures the
+               round trip; the rest are matched by that estimate
+"""
+import argparse
+import heapq
+import json
+import os
+import random
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.service.engagement_tracker import EngagementTracker  # noqa: E402
+
+USER_ID = "bench"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def mind_sample(concentration: float, relaxation: float, timestamp: float) -> dict:
+    mind = {"instant_attention": concentration, "instant_relaxation": relaxation}
+    return {"channels": {"O1": {"mind": mind}}, "timestamp": timestamp}
+
+
+def schedule(args, rng: random.Random) -> list[tuple[float, int, str, int]]:
+    """(time, order, kind, spike index) events for spikes and answers."""
+    events = []
+    t = 0.0
+    order = 0
+    for spike in range(args.spikes):
+        if rng.random() < args.burst_probability:
+            t += rng.uniform(0.02, 0.1)
+        else:
+            t += rng.expovariate(1 / args.spike_interval)
+        events.append((t, order, "spike", spike))
+        order += 1
+        if rng.random() < args.loss:
+            continue
+        delay = rng.lognormvariate(0, args.jitter) * args.latency + rng.uniform(0.05, 0.3)
+        events.append((t + delay, order, "frame", spike))
+        order += 1
+    heapq.heapify(events)
+    return [heapq.heappop(events) for _ in range(len(events))]
+
+
+def run_tracker(args, events, mode: str) -> dict:
+    clock = Clock()
+    tracker = EngagementTracker(
+        max_pending=args.max_pending,
+        pending_ttl=args.ttl,
+        match_tolerance=args.tolerance,
+        clock=clock,
+    )
+    tracker.start_video(USER_ID)
+    state = tracker.user_states[USER_ID]
+    spikes: dict[int, tuple[int, float]] = {}  # index -> (spike_id, sample_ts)
+    correct = wrong = unmatched = peak = 0
+
+    for t, _, kind, spike in events:
+        clock.now = t
+        if kind == "spike":
+            # a baseline and a sample 20% above it make exactly one spike
+            tracker.handle_sample(USER_ID, mind_sample(10, 0, t))
+            frame = tracker.handle_sample(USER_ID, mind_sample(12, spike, t))
+            spikes[spike] = (frame.spike_id, frame.sample_ts)
+            peak = max(peak, len(state.pending_frames))
+            continue
+
+        spike_id, sample_ts = spikes[spike]
+        # without any echo the tracker has no round trip to match by
+        echo_id = mode == "spike_id" or (mode == "rtt" and state.rtt is None)
+        stored = tracker.attach_video_frame(
+            USER_ID, "0", None, "",
+            spike_id=spike_id if echo_id else None,
+            timestamp=sample_ts if mode == "timestamp" else None,
+        )
+        if stored is None:
+            unmatched += 1
+        elif stored[0] == spike:
+            correct += 1
+        else:
+            wrong += 1
+
+    return {"correct": correct, "wrong": wrong, "unmatched": unmatched, "peak_pending": peak}
+
+
+def run_fifo(events) -> dict:
+    pending: deque[int] = deque()
+    correct = wrong = unmatched = peak = 0
+    for _, _, kind, spike in events:
+        if kind == "spike":
+            pending.append(spike)
+            peak = max(peak, len(pending))
+        elif not pending:
+            unmatched += 1
+        elif pending.popleft() == spike:
+            correct += 1
+        else:
+            wrong += 1
+    return {"correct": correct, "wrong": wrong, "unmatched": unmatched, "peak_pending": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--spikes", type=int, default=5000)
+    parser.add_argument("--spike-interval", type=float, default=2.0, help="mean seconds between spikes")
+    parser.add_argument("--burst-probability", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.3, help="median one-way delay, seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="lognormal sigma of the delay")
+    parser.add_argument("--loss", type=float, default=0.05, help="share of requests never answered")
+    parser.add_argument("--max-pending", type=int, default=32)
+    parser.add_argument("--ttl", type=float, default=10.0)
+    parser.add_argument("--tolerance", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="append the report as one json line")
+    args = parser.parse_args()
+
+    events = schedule(args, random.Random(args.seed))
+    frames = sum(1 for event in events if event[2] == "frame")
+    report = {"fifo": run_fifo(events)}
+    for mode in ("spike_id", "timestamp", "rtt"):
+        report[mode] = run_tracker(args, events, mode)
+
+    print(f"{'strategy':10s} {'correct':>9s} {'wrong':>9s} {'unmatched':>9s} {'peak':>6s}")
+    for name, result in report.items():
+        print(
+            f"{name:10s} {result['correct'] / frames:9.1%} {result['wrong'] / frames:9.1%} "
+            f"{result['unmatched'] / frames:9.1%} {result['peak_pending']:6d}"
+        )
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps({"args": vars(args), "frames": frames, **report}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Cold start and worker respawn benchmark for the backend.
+
+Run from the `back` directory (the app reads `.env` from there):
+
+    python benchmarks/startup.py --runs 10 --output startup.jsonl
+
+* cold    - fresh interpreter with an empty bytecode cache, the first start
+            of a new container image
+* respawn - fresh interpreter with a warm bytecode cache, what a uvicorn
+            worker pays when it is restarted
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+IMPORT_APP = "import main"
+
+
+def measure(extra_args: list[str]) -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, *extra_args, "-c", IMPORT_APP], check=True)
+    return time.perf_counter() - started
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "runs": len(samples),
+        "median_ms": statistics.median(ordered) * 1000,
+        "p90_ms": ordered[int(0.9 * (len(ordered) - 1))] * 1000,
+        "min_ms": ordered[0] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="append results as one json line")
+    args = parser.parse_args()
+
+    cold: list[float] = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cold.append(measure(["-X", f"pycache_prefix={cache_dir}"]))
+
+    measure([])  # warm the regular bytecode cache
+    respawn = [measure([]) for _ in range(args.runs)]
+
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "cold": summarize(cold),
+        "respawn": summarize(respawn),
+    }
+    for name in ("cold", "respawn"):
+        stats = result[name]
+        print(
+            f"{name:8s} median {stats['median_ms']:8.1f} ms   "
+            f"p90 {stats['p90_ms']:8.1f} ms   min {stats['min_ms']:8.1f} ms"
+        )
+
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
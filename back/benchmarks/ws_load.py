@@ -0,0 +1,347 @@
+"""
+Synthetic multi-device load generator for /ws/device and /ws/client.
+
+Simulates N paired headsets and M dashboard clients per headset against a
+running backend:
+
+    python benchmarks/ws_load.py --devices 50 --clients 2 --rate 10 \
+        --duration 60 --server-pid $(pgrep -f "main.py" | head -1)
+
+Every device registers a throwaway user, obtains a pair token and streams
+eeg_sample messages in the format the desktop client sends. The values follow
+the emotion patterns and channel mix of the desktop emulator, imported from
+Bit/neuro_impl/signal_generator.py (needs numpy), and a concentration spike is injected every `--spike-interval` seconds. Dashboard
+clients send video_start, answer request_screenshot with video_frame and
+record the device-to-client latency and the spike-to-engagement round trip.
+
+The report covers throughput, p50/p99 latencies and, when --server-pid is
+given, the server CPU usage and peak RSS read from /proc.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+
+import requests
+import websockets
+
+# the desktop app, its signal generator is free of Qt and neurosdk
+BIT_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "BrainBit", "neurosamples-main", "Bit"
+)
+sys.path.insert(0, os.path.normpath(BIT_DIR))
+
+from neuro_impl.signal_generator import EMOTION_CYCLE, EMOTION_PATTERNS, SignalGenerator  # noqa: E402
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class Stats:
+    def __init__(self):
+        self.samples_sent = 0
+        self.samples_received = 0
+        self.spikes_requested = 0
+        self.engagements_saved = 0
+        self.errors = 0
+        self.latencies: list[float] = []
+        self.round_trips: list[float] = []
+
+
+class SampleGenerator:
+    """Builds eeg_sample payloads following the emulator emotion cycle."""
+
+    def __init__(self, seed: int, emotion_period: float):
+        self.rng = random.Random(seed)
+        self.emotion_period = emotion_period
+        self.offset = self.rng.randrange(len(EMOTION_CYCLE))
+        # channel names and how much each channel picks up of every wave
+        signal = SignalGenerator(seed=seed)
+        self.channels = [
+            (name, dict(zip(signal.bands, map(float, mix))))
+            for name, mix in zip(signal.channel_names, signal.mix)
+        ]
+
+    def emotion(self, elapsed: float) -> str:
+        index = int(elapsed / self.emotion_period) + self.offset
+        return EMOTION_CYCLE[index % len(EMOTION_CYCLE)]
+
+    def build(self, elapsed: float, spike: bool) -> dict:
+        pattern = EMOTION_PATTERNS[self.emotion(elapsed)]
+        channels = {}
+        for channel, weights in self.channels:
+            power = {
+                wave: pattern[wave] * weights[wave] * self.rng.uniform(0.9, 1.1)
+                for wave in pattern
+            }
+            power["gamma"] = self.rng.uniform(1, 5)
+            total = sum(power.values())
+            spectral = {wave: value / total for wave, value in power.items()}
+
+            attention = 100 * power["beta"] / (power["alpha"] + power["beta"] + power["theta"])
+            relaxation = 100 * power["alpha"] / (power["alpha"] + power["beta"] + power["theta"])
+            if spike:
+                attention = min(attention * 1.5, 100)
+            channels[channel] = {
+                "mind": {
+                    "relative_attention": attention / 100,
+                    "relative_relaxation": relaxation / 100,
+                    "instant_attention": attention,
+                    "instant_relaxation": relaxation,
+                },
+                "spectral": spectral,
+            }
+        return {"channels": channels, "timestamp": time.time()}
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.stats = Stats()
+        self.http_url = args.url.rstrip("/")
+        self.ws_url = self.http_url.replace("http", "ws", 1)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.stop_at = 0.0
+
+    # setup
+
+    def register_user(self, index: int) -> str:
+        response = requests.post(
+            f"{self.http_url}/v1/auth/register",
+            json={
+                "email": f"load-{self.run_id}-{index}@example.com",
+                "password": "load-test",
+                "name": f"load {index}",
+                "role": "user",
+            },
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json()["token"]
+
+    def create_pair_token(self, access_token: str) -> str:
+        response = requests.post(
+            f"{self.http_url}/v1/pair-token/",
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def upload_video(self) -> str:
+        response = requests.post(
+            f"{self.http_url}/v1/videos",
+            files={"file": ("load.mp4", b"\x00" * 1024, "video/mp4")},
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def setup(self) -> tuple[str, list[tuple[str, str]]]:
+        video_id = self.upload_video()
+        users = []
+        for index in range(self.args.devices):
+            access_token = self.register_user(index)
+            users.append((access_token, self.create_pair_token(access_token)))
+        return video_id, users
+
+    # simulated peers
+
+    async def device(self, index: int, pair_token: str, ready: asyncio.Event):
+        generator = SampleGenerator(self.args.seed + index, self.args.emotion_period)
+        interval = 1 / self.args.rate
+        async with websockets.connect(f"{self.ws_url}/ws/device", max_size=None) as ws:
+            await ws.send(json.dumps({"type": "pair", "pair_token": pair_token}))
+            reply = json.loads(await ws.recv())
+            if reply.get("type") != "paired":
+                raise RuntimeError(f"device {index} failed to pair: {reply}")
+            await ready.wait()
+
+            started = time.monotonic()
+            next_spike = started + self.args.spike_interval
+            for tick in itertools.count(1):
+                now = time.monotonic()
+                if now >= self.stop_at:
+                    break
+                spike = now >= next_spike
+                if spike:
+                    next_spike += self.args.spike_interval
+                sample = generator.build(now - started, spike)
+                await ws.send(json.dumps({"type": "eeg_sample", "data": sample}))
+                self.stats.samples_sent += 1
+                # deadline pacing, so slow sends do not lower the rate
+                await asyncio.sleep(max(started + tick * interval - time.monotonic(), 0))
+
+    async def client(self, access_token: str, video_id: str, connected: asyncio.Event):
+        url = f"{self.ws_url}/ws/client?token={access_token}"
+        async with websockets.connect(url, max_size=None) as ws:
+            await ws.recv()  # connected
+            await ws.send(json.dumps({"type": "video_start"}))
+            connected.set()
+            requested_at: list[float] = []
+            started = time.monotonic()
+            while True:
+                timeout = self.stop_at - time.monotonic() + self.args.drain
+                if timeout <= 0:
+                    break
+                try:
+                    message = json.loads(await asyncio.wait_for(ws.recv(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                msg_type = message.get("type")
+                if msg_type == "eeg_sample":
+                    self.stats.samples_received += 1
+                    sent_at = message.get("data", {}).get("timestamp")
+                    if sent_at:
+                        self.stats.latencies.append(time.time() - sent_at)
+                elif msg_type == "request_screenshot":
+                    self.stats.spikes_requested += 1
+                    requested_at.append(time.monotonic())
+                    await ws.send(json.dumps({
+                        "type": "video_frame",
+                        "timecode": f"{time.monotonic() - started:.2f}",
+                        "video_id": video_id,
+                        "screenshot_url": "/uploads/load-test.jpg",
+                        # echoed back like the dashboard does
+                        "spike_id": message.get("spike_id"),
+                        "timestamp": message.get("timestamp"),
+                    }))
+                elif msg_type == "engagement_saved":
+                    self.stats.engagements_saved += 1
+                    if requested_at:
+                        self.stats.round_trips.append(time.monotonic() - requested_at.pop(0))
+                elif msg_type == "error":
+                    self.stats.errors += 1
+
+    async def run(self, video_id: str, users: list[tuple[str, str]]) -> float:
+        ready = asyncio.Event()
+        self.stop_at = time.monotonic() + 3600  # replaced once everyone connected
+        tasks = []
+        connected_events = []
+        for index, (access_token, pair_token) in enumerate(users):
+            tasks.append(asyncio.create_task(self.device(index, pair_token, ready)))
+            for _ in range(self.args.clients):
+                event = asyncio.Event()
+                connected_events.append(event)
+                tasks.append(asyncio.create_task(self.client(access_token, video_id, event)))
+
+        await asyncio.gather(*(event.wait() for event in connected_events))
+        started = time.monotonic()
+        self.stop_at = started + self.args.duration
+        ready.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                self.stats.errors += 1
+                print(f"peer failed: {result!r}")
+        return min(time.monotonic() - started, self.args.duration)
+
+
+class ProcessSampler:
+    """CPU time and RSS of the server process, read from /proc."""
+
+    def __init__(self, pid: int | None):
+        self.pid = pid
+        self.peak_rss_kb = 0
+        self.cpu_start = 0.0
+        self.wall_start = 0.0
+        self.clock_ticks = os.sysconf("SC_CLK_TCK") if pid else 1
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self.clock_ticks
+
+    def rss_kb(self) -> int:
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+        return 0
+
+    def start(self):
+        if self.pid:
+            self.cpu_start = self.cpu_seconds()
+            self.wall_start = time.monotonic()
+
+    async def poll(self, interval: float = 0.5):
+        while self.pid:
+            self.peak_rss_kb = max(self.peak_rss_kb, self.rss_kb())
+            await asyncio.sleep(interval)
+
+    def report(self) -> dict:
+        if not self.pid:
+            return {}
+        wall = time.monotonic() - self.wall_start
+        return {
+            "server_cpu_percent": 100 * (self.cpu_seconds() - self.cpu_start) / wall,
+            "server_peak_rss_mb": self.peak_rss_kb / 1024,
+        }
+
+
+async def main_async(args) -> dict:
+    test = LoadTest(args)
+    video_id, users = await asyncio.to_thread(test.setup)
+
+    sampler = ProcessSampler(args.server_pid)
+    sampler.start()
+    poller = asyncio.create_task(sampler.poll())
+    elapsed = await test.run(video_id, users)
+    poller.cancel()
+
+    stats = test.stats
+    return {
+        "devices": args.devices,
+        "clients_per_device": args.clients,
+        "rate_per_device": args.rate,
+        "duration_s": elapsed,
+        "samples_sent": stats.samples_sent,
+        "samples_received": stats.samples_received,
+        "send_throughput": stats.samples_sent / elapsed,
+        "delivery_throughput": stats.samples_received / elapsed,
+        "latency_p50_ms": percentile(stats.latencies, 0.5) * 1000,
+        "latency_p99_ms": percentile(stats.latencies, 0.99) * 1000,
+        "spikes_requested": stats.spikes_requested,
+        "engagements_saved": stats.engagements_saved,
+        "spike_round_trip_p50_ms": percentile(stats.round_trips, 0.5) * 1000,
+        "spike_round_trip_p99_ms": percentile(stats.round_trips, 0.99) * 1000,
+        "errors": stats.errors,
+        **sampler.report(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:3000")
+    parser.add_argument("--devices", type=int, default=10)
+    parser.add_argument("--clients", type=int, default=1, help="dashboards per device")
+    parser.add_argument("--rate", type=float, default=1.0, help="samples/s per device")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--spike-interval", type=float, default=5.0)
+    parser.add_argument("--emotion-period", type=float, default=20.0)
+    parser.add_argument("--drain", type=float, default=2.0, help="seconds to wait for late messages")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--server-pid", type=int)
+    parser.add_argument("--output", help="append the report as one json line")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    for key, value in report.items():
+        print(f"{key:28s} {value:.2f}" if isinstance(value, float) else f"{key:28s} {value}")
+    if args.output:
+        with open(args.output, "a") as f:
+            f.write(json.dumps(report) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,11 @@
+import sys
+
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    # must run before the app is imported so the profile covers it
+    from app.utils.startup_profile import run_profile
+
+    sys.exit(run_profile())
+
 import uvicorn
 
 from app.app import create_app
@@ -14,6 +22,7 @@ if __name__ == "__main__":
             host=settings.APP_HOST,
             port=settings.APP_PORT,
             reload=False,
+            ws_per_message_deflate=settings.WS_PER_MESSAGE_DEFLATE,
         )
     else:
         uvicorn.run(
@@ -22,4 +31,5 @@ if __name__ == "__main__":
             port=settings.APP_PORT,
             reload=True,
             log_level="debug",
+            ws_per_message_deflate=settings.WS_PER_MESSAGE_DEFLATE,
         )
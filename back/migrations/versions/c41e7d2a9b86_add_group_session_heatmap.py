@@ -0,0 +1,43 @@
+"""add group session heatmap
+
+Merges the audio and history branches.
+
+Revision ID: c41e7d2a9b86
+Revises: b2c8d9e4f5a1, dff3606b5389
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7d2a9b86'
+down_revision: Union[str, Sequence[str], None] = ('b2c8d9e4f5a1', 'dff3606b5389')
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('group_session_heatmap',
+    sa.Column('group_session_id', sa.UUID(), nullable=False),
+    sa.Column('bucket_start', sa.Integer(), nullable=False),
+    sa.Column('engagements', sa.Integer(), nullable=False),
+    sa.Column('concentration_sum', sa.Float(), nullable=False),
+    sa.Column('relaxation_sum', sa.Float(), nullable=False),
+    sa.Column('concentration_max', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['group_session_id'], ['group_sessions.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('group_session_id', 'bucket_start')
+    )
+    op.create_index(op.f('ix_group_sessions_video_id'), 'group_sessions', ['video_id'], unique=False)
+    op.create_index(op.f('ix_engagements_video_id'), 'engagements', ['video_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_engagements_video_id'), table_name='engagements')
+    op.drop_index(op.f('ix_group_sessions_video_id'), table_name='group_sessions')
+    op.drop_table('group_session_heatmap')
@@ -0,0 +1,35 @@
+"""add video index
+
+Revision ID: e7a3b5c19d42
+Revises: c41e7d2a9b86
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3b5c19d42'
+down_revision: Union[str, Sequence[str], None] = 'c41e7d2a9b86'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('videos', sa.Column('index_status', sa.String(length=16), server_default=sa.text("'pending'"), nullable=False))
+    op.add_column('videos', sa.Column('duration', sa.Float(), nullable=True))
+    op.add_column('videos', sa.Column('keyframes', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('videos', sa.Column('sprite', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('videos', 'sprite')
+    op.drop_column('videos', 'keyframes')
+    op.drop_column('videos', 'duration')
+    op.drop_column('videos', 'index_status')
@@ -0,0 +1,32 @@
+"""add engagement group session
+
+Revision ID: f2c8d4a61e37
+Revises: e7a3b5c19d42
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c8d4a61e37'
+down_revision: Union[str, Sequence[str], None] = 'e7a3b5c19d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('engagements', sa.Column('group_session_id', sa.UUID(), nullable=True))
+    op.create_index(op.f('ix_engagements_group_session_id'), 'engagements', ['group_session_id'], unique=False)
+    op.create_foreign_key('engagements_group_session_id_fkey', 'engagements', 'group_sessions', ['group_session_id'], ['id'], ondelete='SET NULL')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('engagements_group_session_id_fkey', 'engagements', type_='foreignkey')
+    op.drop_index(op.f('ix_engagements_group_session_id'), table_name='engagements')
+    op.drop_column('engagements', 'group_session_id')
@@ -302,6 +302,30 @@ function Analysis() {
     }
   }, [state]);
 
+  // Позиция воспроизведения, по ней сервер сам извлекает кадр при всплеске
+  useEffect(() => {
+    if (state !== "watching") return;
+    const video = videoPlayerRef.current?.getVideoElement();
+    const sendProgress = () => {
+      if (!video || wsRef.current?.readyState !== WebSocket.OPEN) return;
+      wsRef.current.send(
+        JSON.stringify({
+          type: "video_progress",
+          video_id: uploadedVideoIdRef.current || uploadedVideoId,
+          timecode: video.currentTime,
+          playing: !video.paused,
+        })
+      );
+    };
+    const events = ["play", "pause", "seeked"];
+    events.forEach((event) => video?.addEventListener(event, sendProgress));
+    const interval = setInterval(sendProgress, 5000);
+    return () => {
+      clearInterval(interval);
+      events.forEach((event) => video?.removeEventListener(event, sendProgress));
+    };
+  }, [state, uploadedVideoId]);
+
   // Периодическое автосохранение данных взгляда в localStorage
   // Это гарантирует сохранение данных даже если пользователь закроет страницу
   useEffect(() => {
@@ -1143,7 +1167,13 @@ function Analysis() {
     setState("watching");
 
     // Отправляем video_start
-    const videoStartMessage = { type: "video_start" };
+    const videoElement = videoPlayerRef.current?.getVideoElement();
+    const videoStartMessage = {
+      type: "video_start",
+      video_id: uploadedVideoIdRef.current || uploadedVideoId,
+      timecode: videoElement?.currentTime ?? 0,
+      playing: videoElement ? !videoElement.paused : true,
+    };
     try {
       if (wsRef.current && wsRef.current.readyState === WebSocket.OPEN) {
         wsRef.current.send(JSON.stringify(videoStartMessage));